@@ -0,0 +1,78 @@
+"""create background_jobs table
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("kind", sa.String(length=100), nullable=False),
+        sa.Column("key", sa.String(length=512), nullable=False),
+        sa.Column("coalesce_key", sa.String(length=255), nullable=True),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("priority", sa.SmallInteger(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("backoff_seconds", sa.Float(), nullable=False),
+        sa.Column(
+            "run_after",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("locked_by", sa.String(length=64), nullable=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            onupdate=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_background_jobs")),
+    )
+    op.create_index(
+        op.f("ix_background_jobs_key"), "background_jobs", ["key"], unique=False
+    )
+    op.create_index(
+        "ix_background_jobs_claim",
+        "background_jobs",
+        ["status", "priority", "run_after", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_background_jobs_coalesce_key",
+        "background_jobs",
+        ["coalesce_key"],
+        unique=False,
+        postgresql_where=sa.text("coalesce_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_background_jobs_coalesce_key", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_claim", table_name="background_jobs")
+    op.drop_index(op.f("ix_background_jobs_key"), table_name="background_jobs")
+    op.drop_table("background_jobs")
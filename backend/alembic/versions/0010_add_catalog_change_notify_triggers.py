@@ -0,0 +1,56 @@
+"""add catalog change notify triggers
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+CATALOG_TABLES = ("anime", "releases", "episodes")
+
+# Payload is "<table>:<id>"; episode changes report their release id since
+# episode lists are cached per release. An update that moves an episode to
+# another release notifies both releases.
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'episodes' THEN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM pg_notify('catalog_changes', 'episodes:' || OLD.release_id::text);
+        END IF;
+        IF TG_OP <> 'DELETE'
+           AND (TG_OP = 'INSERT' OR NEW.release_id IS DISTINCT FROM OLD.release_id) THEN
+            PERFORM pg_notify('catalog_changes', 'episodes:' || NEW.release_id::text);
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('catalog_changes', TG_TABLE_NAME || ':' || OLD.id::text);
+    ELSE
+        PERFORM pg_notify('catalog_changes', TG_TABLE_NAME || ':' || NEW.id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(NOTIFY_FUNCTION)
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_catalog_change "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION notify_catalog_change()"
+        )
+
+
+def downgrade() -> None:
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_catalog_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_catalog_change()")
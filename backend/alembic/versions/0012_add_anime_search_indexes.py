@@ -0,0 +1,50 @@
+"""add anime search indexes
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 16:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+# Must stay identical to SEARCH_DOCUMENT in app/crud/anime.py, otherwise the
+# planner does not use the index.
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(title, '') || ' ' || coalesce(title_original, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Trigram indexes answer ILIKE '%q%' and the word-similarity operator <%.
+    op.create_index(
+        "ix_anime_title_trgm",
+        "anime",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_anime_title_original_trgm",
+        "anime",
+        ["title_original"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title_original": "gin_trgm_ops"},
+    )
+    op.execute(f"CREATE INDEX ix_anime_search_tsv ON anime USING gin ({SEARCH_DOCUMENT})")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_anime_search_tsv", table_name="anime")
+    op.drop_index("ix_anime_title_original_trgm", table_name="anime")
+    op.drop_index("ix_anime_title_trgm", table_name="anime")
+    # pg_trgm is left installed; other objects may depend on it.
@@ -0,0 +1,36 @@
+"""create auth_rate_limits table
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 18:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "auth_rate_limits",
+        sa.Column("key", sa.String(length=160), nullable=False),
+        sa.Column("window_index", sa.BigInteger(), nullable=False),
+        sa.Column("current_count", sa.Integer(), nullable=False),
+        sa.Column("previous_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key", name=op.f("pk_auth_rate_limits")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("auth_rate_limits")
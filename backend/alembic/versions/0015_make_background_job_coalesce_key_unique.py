@@ -0,0 +1,49 @@
+"""make queued background job coalesce keys unique
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18 22:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Concurrent enqueues could leave several queued jobs for one key; keep
+    # the most recently written one, as coalescing would have.
+    op.execute(
+        """
+        DELETE FROM background_jobs AS stale
+        USING background_jobs AS newer
+        WHERE stale.coalesce_key = newer.coalesce_key
+          AND stale.status = 'queued'
+          AND newer.status = 'queued'
+          AND (stale.updated_at, stale.id) < (newer.updated_at, newer.id)
+        """
+    )
+    op.drop_index("ix_background_jobs_coalesce_key", table_name="background_jobs")
+    op.create_index(
+        "ix_background_jobs_coalesce_key",
+        "background_jobs",
+        ["coalesce_key"],
+        unique=True,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_background_jobs_coalesce_key", table_name="background_jobs")
+    op.create_index(
+        "ix_background_jobs_coalesce_key",
+        "background_jobs",
+        ["coalesce_key"],
+        unique=False,
+        postgresql_where=sa.text("coalesce_key IS NOT NULL"),
+    )
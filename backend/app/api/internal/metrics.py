@@ -0,0 +1,43 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from ...application.anime_suggest import anime_suggest_index
+from ...application.auth_rate_limit import auth_rate_limiter
+from ...application.catalog_cache import catalog_cache, catalog_listener
+from ...auth.principal import principal_cache
+from ...background import default_job_runner
+from ...crud.anime import anime_existence_cache
+from ...database import engine
+from ...security.password_hasher import password_hasher
+from ...security.token_inspection import verified_token_cache
+from ...use_cases.watch import watch_progress_buffer
+from ...utils.db_metrics import pool_status
+from ..proxy.cache import response_cache
+from ..proxy.client import upstream_client
+from ..proxy.executor import parse_executor
+from ..proxy.schedule_snapshots import schedule_snapshots
+from ..proxy.suggestion_index import suggestion_index
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/metrics")
+async def metrics() -> dict[str, Any]:
+    return {
+        "upstream": upstream_client.stats(),
+        "proxy_cache": response_cache.stats(),
+        "parser": parse_executor.stats(),
+        "schedule": schedule_snapshots.stats(),
+        "jobs": default_job_runner.stats(),
+        "watch_progress_buffer": watch_progress_buffer.stats(),
+        "anime_existence_cache": anime_existence_cache.stats(),
+        "catalog_cache": {**catalog_cache.stats(), "listener": catalog_listener.stats()},
+        "anime_suggest_index": anime_suggest_index.stats(),
+        "search_suggestions": suggestion_index.stats(),
+        "access_token_cache": verified_token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "db_pool": pool_status(engine),
+        "password_hasher": password_hasher.stats(),
+        "auth_rate_limit": auth_rate_limiter.stats(),
+    }
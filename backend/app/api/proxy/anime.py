@@ -5,7 +5,10 @@ from fastapi import APIRouter, HTTPException, status
 
 from app.parser import anime as anime_parser
 
+from .cache import ANIME_EPISODES_POLICY, ANIME_INFO_POLICY, response_cache
 from .common import SRC_AJAX_URL, SRC_BASE_URL, get_client
+from .executor import parse_executor
+from .suggestion_index import suggestion_index
 
 router = APIRouter(prefix="/anime", tags=["Anime"])
 
@@ -13,16 +16,16 @@ router = APIRouter(prefix="/anime", tags=["Anime"])
 async def _fetch_episodes(anime_id: str) -> dict[str, Any]:
     episode_key = anime_id.split("-")[-1]
     try:
-        async with await get_client() as client:
-            resp = await client.get(
-                f"{SRC_AJAX_URL}/v2/episode/list/{episode_key}",
-                headers={
-                    "X-Requested-With": "XMLHttpRequest",
-                    "Referer": f"{SRC_BASE_URL}/watch/{anime_id}",
-                },
-            )
-            resp.raise_for_status()
-            html = resp.json().get("html", "")
+        client = await get_client()
+        resp = await client.get(
+            f"{SRC_AJAX_URL}/v2/episode/list/{episode_key}",
+            headers={
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": f"{SRC_BASE_URL}/watch/{anime_id}",
+            },
+        )
+        resp.raise_for_status()
+        html = resp.json().get("html", "")
     except httpx.HTTPStatusError as exc:
         status_code = exc.response.status_code
         if 500 <= status_code < 600:
@@ -39,15 +42,14 @@ async def _fetch_episodes(anime_id: str) -> dict[str, Any]:
             detail="Upstream service unavailable",
         ) from exc
 
-    return anime_parser.parse_episodes_html(html)
+    return await parse_executor.run(anime_parser.parse_episodes_html, html)
 
 
-@router.get("/{anime_id}")
-async def anime_info(anime_id: str) -> dict[str, Any]:
+async def _fetch_anime_info(anime_id: str) -> dict[str, Any]:
     try:
-        async with await get_client() as client:
-            resp = await client.get(f"{SRC_BASE_URL}/{anime_id.lstrip('/')}")
-            resp.raise_for_status()
+        client = await get_client()
+        resp = await client.get(f"{SRC_BASE_URL}/{anime_id.lstrip('/')}")
+        resp.raise_for_status()
     except httpx.HTTPStatusError as exc:
         status_code = exc.response.status_code
         if 500 <= status_code < 600:
@@ -64,11 +66,28 @@ async def anime_info(anime_id: str) -> dict[str, Any]:
             detail="Upstream service unavailable",
         ) from exc
 
-    data = anime_parser.parse_anime_page(resp.text, anime_id)
+    data = await parse_executor.run(anime_parser.parse_anime_page, resp.text, anime_id)
+    # The parser falls back to the id when the page has no title.
+    if data["title"] != anime_id:
+        suggestion_index.record([{"id": anime_id, "name": data["title"], "poster": data["poster"]}])
+    return data
+
+
+@router.get("/{anime_id}")
+async def anime_info(anime_id: str) -> dict[str, Any]:
+    data = await response_cache.get_or_fetch(
+        f"anime:{anime_id}",
+        lambda: _fetch_anime_info(anime_id),
+        policy=ANIME_INFO_POLICY,
+    )
     return {"data": data}
 
 
 @router.get("/{anime_id}/episodes")
 async def anime_episodes(anime_id: str) -> dict[str, Any]:
-    data = await _fetch_episodes(anime_id)
+    data = await response_cache.get_or_fetch(
+        f"anime-episodes:{anime_id}",
+        lambda: _fetch_episodes(anime_id),
+        policy=ANIME_EPISODES_POLICY,
+    )
     return {"data": data}
@@ -0,0 +1,197 @@
+"""In-process response cache for upstream proxy endpoints.
+
+Entries live in an LRU bounded by their JSON-encoded size. Each route picks a
+``CachePolicy``: entries are served as-is while fresh, served stale while a
+single background refresh runs once ``ttl`` has passed, and dropped after
+``ttl + stale_ttl``. Concurrent misses for the same key share one upstream
+fetch. Expired entries stay in the LRU until replaced or evicted and are
+served as a last resort when the refetch fails because upstream is
+unavailable (5xx, network errors, open circuit breaker).
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from fastapi import HTTPException
+
+from app.config import settings
+
+Fetcher = Callable[[], Awaitable[Any]]
+
+logger = logging.getLogger("kitsu.proxy.cache")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float
+    stale_ttl: float = 0.0
+
+
+ANIME_INFO_POLICY = CachePolicy(ttl=6 * 60 * 60, stale_ttl=24 * 60 * 60)
+ANIME_EPISODES_POLICY = CachePolicy(ttl=60 * 60, stale_ttl=24 * 60 * 60)
+SCHEDULE_POLICY = CachePolicy(ttl=10 * 60, stale_ttl=60 * 60)
+SEARCH_SUGGEST_POLICY = CachePolicy(ttl=15 * 60, stale_ttl=60 * 60)
+SYNC_IDS_POLICY = CachePolicy(ttl=7 * 24 * 60 * 60, stale_ttl=7 * 24 * 60 * 60)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size: int
+    stored_at: float
+    policy: CachePolicy
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.stored_at < self.policy.ttl
+
+    def is_usable(self, now: float) -> bool:
+        return now - self.stored_at < self.policy.ttl + self.policy.stale_ttl
+
+
+def _estimate_size(value: Any) -> int:
+    return len(json.dumps(value, default=str, separators=(",", ":")).encode("utf-8"))
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_bytes: int = settings.proxy_cache_max_bytes,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "evictions": 0,
+            "stale_fallbacks": 0,
+        }
+
+    async def get_or_fetch(self, key: str, fetch: Fetcher, *, policy: CachePolicy) -> Any:
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.is_fresh(now):
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry.value
+            if entry.is_usable(now):
+                self._entries.move_to_end(key)
+                self._counters["stale_hits"] += 1
+                self._refresh_in_background(key, fetch, policy)
+                return entry.value
+
+        self._counters["misses"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_fetch(key, fetch, policy)
+        else:
+            self._counters["coalesced"] += 1
+        try:
+            # Shield the shared fetch so one cancelled caller does not cancel
+            # it for everybody else waiting on the same key.
+            return await asyncio.shield(task)
+        except Exception as exc:
+            if entry is None or not _is_upstream_unavailable(exc):
+                raise
+            self._counters["stale_fallbacks"] += 1
+            logger.warning("Serving expired entry for %s: upstream unavailable", key)
+            return entry.value
+
+    def set(self, key: str, value: Any, *, policy: CachePolicy) -> None:
+        size = _estimate_size(value)
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = _CacheEntry(
+            value=value, size=size, stored_at=self._clock(), policy=policy
+        )
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._counters["evictions"] += 1
+
+    def invalidate(self, key: str) -> None:
+        self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"]
+        served = self._counters["hits"] + self._counters["stale_hits"]
+        return {
+            **self._counters,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight),
+            "hit_ratio": served / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _start_fetch(self, key: str, fetch: Fetcher, policy: CachePolicy) -> asyncio.Task[Any]:
+        async def run() -> Any:
+            try:
+                value = await fetch()
+                self.set(key, value, policy=policy)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = task
+        return task
+
+    def _refresh_in_background(self, key: str, fetch: Fetcher, policy: CachePolicy) -> None:
+        if key in self._inflight:
+            return
+        self._counters["refreshes"] += 1
+        task = self._start_fetch(key, fetch, policy)
+
+        def log_failure(done: asyncio.Task[Any]) -> None:
+            if done.cancelled() or done.exception() is None:
+                return
+            self._counters["refresh_failures"] += 1
+            logger.warning(
+                "Background refresh failed for %s", key, exc_info=done.exception()
+            )
+
+        task.add_done_callback(log_failure)
+
+
+def _is_upstream_unavailable(exc: Exception) -> bool:
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _consume_exception(task: asyncio.Task[Any]) -> None:
+    # Callers re-raise the error themselves; this only silences the
+    # "exception was never retrieved" warning when every waiter went away.
+    if not task.cancelled():
+        task.exception()
+
+
+response_cache = ResponseCache()
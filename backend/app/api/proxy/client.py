@@ -0,0 +1,206 @@
+"""Long-lived upstream HTTP client shared by every proxy router.
+
+The client is created once in the application lifespan and reused for every
+upstream call, so connections to the scraped site stay warm (keep-alive and,
+when ``h2`` is installed, HTTP/2 multiplexing). Concurrency towards a single
+host is capped independently of the overall connection pool, and requests
+pass through per-endpoint circuit breakers and an adaptive concurrency limit
+(see ``resilience.py``).
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import httpx
+
+from app.config import settings
+
+from .resilience import ResilientTransport
+
+logger = logging.getLogger("kitsu.proxy")
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/131.0.0.0 Safari/537.36"
+    )
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees the per-host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        finally:
+            self._release()
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Wrap a transport and cap the number of in-flight requests per host."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int) -> None:
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: defaultdict[str, int] = defaultdict(int)
+        self._waiting: defaultdict[str, int] = defaultdict(int)
+
+    @property
+    def wrapped(self) -> httpx.AsyncBaseTransport:
+        return self._transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+
+        self._waiting[host] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[host] -= 1
+        self._in_flight[host] += 1
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self._in_flight[host] -= 1
+            semaphore.release()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        if isinstance(response.stream, httpx.ByteStream):
+            # Fully buffered in memory; no connection is held past this point.
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def host_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            host: {
+                "in_flight": self._in_flight[host],
+                "waiting": self._waiting[host],
+                "limit": self._max_per_host,
+            }
+            for host in self._semaphores
+        }
+
+
+class UpstreamClient:
+    """Owner of the shared ``httpx.AsyncClient`` used by the proxy layer."""
+
+    def __init__(
+        self,
+        *,
+        timeout: float = settings.upstream_timeout,
+        max_connections: int = settings.upstream_max_connections,
+        max_keepalive_connections: int = settings.upstream_max_keepalive_connections,
+        keepalive_expiry: float = settings.upstream_keepalive_expiry,
+        max_connections_per_host: int = settings.upstream_max_connections_per_host,
+        http2: bool = settings.upstream_http2,
+    ) -> None:
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.info("HTTP/2 requested for upstream client but 'h2' is not installed")
+        self._client: httpx.AsyncClient | None = None
+        self._transport: ResilientTransport | None = None
+
+    async def start(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._transport = ResilientTransport(
+                HostLimitedTransport(
+                    httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2),
+                    self.max_connections_per_host,
+                )
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def get(self) -> httpx.AsyncClient:
+        # Lifespan normally starts the client; fall back to lazy creation so
+        # scripts and tests that skip the lifespan still work.
+        return await self.start()
+
+    async def close(self) -> None:
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        self._transport = None
+
+    def stats(self) -> dict[str, Any]:
+        connections: list[Any] = []
+        host_limited: HostLimitedTransport | None = None
+        if self._transport is not None:
+            host_limited = self._transport.wrapped
+            pool = getattr(host_limited.wrapped, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "started": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+                "max_connections_per_host": self.max_connections_per_host,
+            },
+            "connections": {
+                "total": len(connections),
+                "active": len(connections) - idle,
+                "idle": idle,
+            },
+            "hosts": host_limited.host_stats() if host_limited is not None else {},
+            **(self._transport.stats() if self._transport is not None else {}),
+        }
+
+
+upstream_client = UpstreamClient()
@@ -1,14 +1,21 @@
+import asyncio
+import logging
 from typing import Any, Optional
 
 import httpx
 from fastapi import APIRouter, HTTPException, Query, status
 
 from app.parser import episodes as episodes_parser
+from app.parser.common import parse_sync_ids
 
+from .cache import SYNC_IDS_POLICY, response_cache
 from .common import SRC_AJAX_URL, SRC_BASE_URL, get_client
+from .executor import parse_executor
 
 router = APIRouter(prefix="/episode", tags=["Episodes"])
 
+logger = logging.getLogger("kitsu.proxy")
+
 
 @router.get("/servers")
 async def episode_servers(animeEpisodeId: str = Query(...)) -> dict[str, Any]:
@@ -17,17 +24,17 @@ async def episode_servers(animeEpisodeId: str = Query(...)) -> dict[str, Any]:
         episode_id = f"{episode_id}?ep={episode_id.split('-')[-1]}"
     ep_key = episode_id.split("?ep=")[1]
     try:
-        async with await get_client() as client:
-            resp = await client.get(
-                f"{SRC_AJAX_URL}/v2/episode/servers",
-                params={"episodeId": ep_key},
-                headers={
-                    "X-Requested-With": "XMLHttpRequest",
-                    "Referer": f"{SRC_BASE_URL}/watch/{episode_id}",
-                },
-            )
-            resp.raise_for_status()
-            html = resp.json().get("html", "")
+        client = await get_client()
+        resp = await client.get(
+            f"{SRC_AJAX_URL}/v2/episode/servers",
+            params={"episodeId": ep_key},
+            headers={
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": f"{SRC_BASE_URL}/watch/{episode_id}",
+            },
+        )
+        resp.raise_for_status()
+        html = resp.json().get("html", "")
     except httpx.HTTPStatusError as exc:
         status_code = exc.response.status_code
         if 500 <= status_code < 600:
@@ -45,55 +52,43 @@ async def episode_servers(animeEpisodeId: str = Query(...)) -> dict[str, Any]:
             detail="Upstream service unavailable",
         ) from exc
 
-    _, parsed = episodes_parser.parse_server_html(html, "sub", preferred=None)
+    _, parsed = await parse_executor.run(
+        episodes_parser.parse_server_html, html, "sub", None
+    )
     parsed["episodeId"] = episode_id
     return {"data": parsed}
 
 
-@router.get("/sources")
-async def episode_sources(
-    animeEpisodeId: str = Query(...),
-    server: Optional[str] = Query(None),
-    category: str = Query("sub"),
-) -> dict[str, Any]:
-    episode_id = animeEpisodeId
-    if "?ep=" not in episode_id:
-        episode_id = f"{episode_id}?ep={episode_id.split('-')[-1]}"
-    ep_key = episode_id.split("?ep=")[1]
-
+async def _fetch_source_link(
+    episode_id: str, ep_key: str, category: str, server: Optional[str]
+) -> Optional[str]:
     try:
-        async with await get_client() as client:
-            servers_resp = await client.get(
-                f"{SRC_AJAX_URL}/v2/episode/servers",
-                params={"episodeId": ep_key},
-                headers={
-                    "X-Requested-With": "XMLHttpRequest",
-                    "Referer": f"{SRC_BASE_URL}/watch/{episode_id}",
-                },
-            )
-            servers_resp.raise_for_status()
-            servers_html = servers_resp.json().get("html", "")
-
-            server_id, parsed_servers = episodes_parser.parse_server_html(
-                servers_html, category or "sub", preferred=server
-            )
-            if not server_id:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="No server found for requested episode",
-                )
-            source_resp = await client.get(
-                f"{SRC_AJAX_URL}/v2/episode/sources",
-                params={"id": server_id},
-            )
-            source_resp.raise_for_status()
-            source_link = source_resp.json().get("link")
+        client = await get_client()
+        servers_resp = await client.get(
+            f"{SRC_AJAX_URL}/v2/episode/servers",
+            params={"episodeId": ep_key},
+            headers={
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": f"{SRC_BASE_URL}/watch/{episode_id}",
+            },
+        )
+        servers_resp.raise_for_status()
+        servers_html = servers_resp.json().get("html", "")
 
-            watch_page = await client.get(
-                f"{SRC_BASE_URL}/watch/{episode_id.split('?')[0]}",
-                headers={"Referer": SRC_BASE_URL},
+        server_id, _ = await parse_executor.run(
+            episodes_parser.parse_server_html, servers_html, category, server
+        )
+        if not server_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No server found for requested episode",
             )
-            watch_page.raise_for_status()
+        source_resp = await client.get(
+            f"{SRC_AJAX_URL}/v2/episode/sources",
+            params={"id": server_id},
+        )
+        source_resp.raise_for_status()
+        return source_resp.json().get("link")
     except httpx.HTTPStatusError as exc:
         status_code = exc.response.status_code
         if 500 <= status_code < 600:
@@ -111,7 +106,52 @@ async def episode_sources(
             detail="Upstream service unavailable",
         ) from exc
 
+
+async def _fetch_sync_ids(anime_slug: str) -> dict[str, Optional[int]]:
+    client = await get_client()
+    watch_page = await client.get(
+        f"{SRC_BASE_URL}/watch/{anime_slug}",
+        headers={"Referer": SRC_BASE_URL},
+    )
+    watch_page.raise_for_status()
+    return parse_sync_ids(watch_page.text)
+
+
+async def _get_sync_ids(anime_slug: str) -> dict[str, Optional[int]]:
+    """AniList/MAL ids for an anime, fetched from its watch page once per slug.
+
+    The ids only enrich the player payload, so a failed lookup degrades to
+    empty ids instead of failing the source request.
+    """
+    try:
+        return await response_cache.get_or_fetch(
+            f"sync-ids:{anime_slug}",
+            lambda: _fetch_sync_ids(anime_slug),
+            policy=SYNC_IDS_POLICY,
+        )
+    except httpx.HTTPError as exc:
+        logger.warning("Sync id lookup failed for %s: %s", anime_slug, exc)
+        return {"anilistID": None, "malID": None}
+
+
+@router.get("/sources")
+async def episode_sources(
+    animeEpisodeId: str = Query(...),
+    server: Optional[str] = Query(None),
+    category: str = Query("sub"),
+) -> dict[str, Any]:
+    episode_id = animeEpisodeId
+    if "?ep=" not in episode_id:
+        episode_id = f"{episode_id}?ep={episode_id.split('-')[-1]}"
+    ep_key = episode_id.split("?ep=")[1]
+
+    # The servers -> sources chain and the sync-id lookup are independent.
+    source_link, sync_ids = await asyncio.gather(
+        _fetch_source_link(episode_id, ep_key, category or "sub", server),
+        _get_sync_ids(episode_id.split("?")[0]),
+    )
+
     payload = episodes_parser.build_sources_payload(
-        source_link, watch_page.text, referer=SRC_BASE_URL
+        source_link, None, referer=SRC_BASE_URL, sync_ids=sync_ids
     )
     return {"data": payload}
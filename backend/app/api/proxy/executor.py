@@ -0,0 +1,142 @@
+"""Executor that keeps CPU-bound HTML parsing off the event loop.
+
+``process`` mode (default) parses in a spawned process pool, ``thread`` uses
+a thread pool and ``inline`` runs the parser directly on the loop (useful for
+tests and single-core debugging). At most ``max_pending`` parses may be
+queued or running; further callers wait up to ``queue_timeout`` seconds for a
+slot and are then rejected with 503 instead of piling up. A worker that
+dies (OOM, a crash in lxml) breaks the whole process pool; the pool is then
+replaced and the affected callers get 503 too.
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.parser.worker import timed_call, warm_up
+from app.utils.metrics import Histogram
+
+T = TypeVar("T")
+
+PARSE_EXECUTOR_MODES = ("process", "thread", "inline")
+
+logger = logging.getLogger("kitsu.proxy.parse")
+
+
+class ParseExecutor:
+    def __init__(
+        self,
+        *,
+        mode: str = settings.parse_executor_mode,
+        max_workers: int = settings.parse_executor_workers,
+        max_pending: int = settings.parse_executor_max_pending,
+        queue_timeout: float = settings.parse_executor_queue_timeout,
+    ) -> None:
+        if mode not in PARSE_EXECUTOR_MODES:
+            raise ValueError(f"Unknown parse executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._pending = 0
+        self._rejected = 0
+        self._pool_restarts = 0
+        self._queue_wait = Histogram()
+        self._parse_time = Histogram()
+
+    def start(self) -> None:
+        if self._executor is not None or self.mode == "inline":
+            return
+        if self.mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="kitsu-parse"
+            )
+
+    def close(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.mode == "inline":
+            result, _, elapsed = timed_call(func, args)
+            self._queue_wait.observe(0.0)
+            self._parse_time.observe(elapsed)
+            return result
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            logger.warning("Parse queue is full (%s pending); rejecting request", self._pending)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Parser is overloaded, try again later",
+            ) from None
+
+        self._pending += 1
+        try:
+            self.start()
+            executor = self._executor
+            submitted_at = time.time()
+            loop = asyncio.get_running_loop()
+            result, started_at, elapsed = await loop.run_in_executor(
+                executor, timed_call, func, args
+            )
+        except BrokenProcessPool:
+            self._replace_broken_pool(executor)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Parser worker crashed, try again later",
+            ) from None
+        finally:
+            self._pending -= 1
+            self._slots.release()
+
+        self._queue_wait.observe(max(started_at - submitted_at, 0.0))
+        self._parse_time.observe(elapsed)
+        return result
+
+    def _replace_broken_pool(self, broken: Executor | None) -> None:
+        # Every caller of the broken pool lands here; only the first swaps it.
+        # Nothing is awaited between the check and the swap, so the loop
+        # serialises them.
+        if broken is None or self._executor is not broken:
+            return
+        logger.error("Parse worker died; restarting the process pool")
+        self.close()
+        self.start()
+        self._pool_restarts += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self._rejected,
+            "pool_restarts": self._pool_restarts,
+            "queue_wait_seconds": self._queue_wait.snapshot(),
+            "parse_seconds": self._parse_time.snapshot(),
+        }
+
+
+parse_executor = ParseExecutor()
@@ -1,15 +1,89 @@
+"""AniList list import.
+
+Entries are mapped to catalog titles through the (cached) search suggestion
+lookup. Identical titles are looked up once and at most ``IMPORT_CONCURRENCY``
+lookups run at a time. A failed lookup only drops its own entries; the rest of
+the import still completes. Results are available three ways:
+
+* ``POST /import/{provider}`` — the whole result as one JSON document, or as
+  NDJSON lines streamed while lookups complete when the client sends
+  ``Accept: application/x-ndjson``;
+* ``POST /import/{provider}/jobs`` — runs the import as a background job and
+  returns its id;
+* ``GET /import/jobs/{job_id}`` — progress and results of that job.
+"""
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from typing import Any
 
-import httpx
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.background import Job, JobPriority, JobStatus, default_job_runner
+from app.config import settings
 
 from .search import fetch_search_suggestions
 
 router = APIRouter(prefix="/import", tags=["Import"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MAX_TRACKED_IMPORTS = 100
 
-@router.post("/{provider}")
-async def import_provider(provider: str, payload: dict[str, Any]) -> dict[str, Any]:
+STATUS_MAP = {
+    "CURRENT": "watching",
+    "COMPLETED": "completed",
+    "PLANNING": "plan to watch",
+    "DROPPED": "dropped",
+    "PAUSED": "on hold",
+    "REPEATING": "watching",
+}
+
+
+@dataclass
+class ImportProgress:
+    job_id: str
+    total: int
+    status: JobStatus = JobStatus.QUEUED
+    processed: int = 0
+    animes: list[dict[str, Any]] = field(default_factory=list)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "total": self.total,
+            "processed": self.processed,
+            "imported": len(self.animes),
+            "failed": len(self.errors),
+            "animes": self.animes,
+            "errors": self.errors,
+        }
+
+
+_imports: OrderedDict[str, ImportProgress] = OrderedDict()
+
+
+def _group_by_title(anime_list: list[dict[str, Any]]) -> dict[str, list[str]]:
+    """Map each distinct English title to the statuses of its list entries."""
+    grouped: dict[str, list[str]] = {}
+    for item in anime_list:
+        entry_status = STATUS_MAP.get(item.get("status"), "watching")
+        for entry in item.get("entries") or []:
+            media = entry.get("media") or {}
+            title_obj = media.get("title") or {}
+            english_title = title_obj.get("english")
+            if not english_title:
+                continue
+            grouped.setdefault(english_title, []).append(entry_status)
+    return grouped
+
+
+def _validate_request(provider: str, payload: dict[str, Any]) -> dict[str, list[str]]:
     if provider != "anilist":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid provider"
@@ -20,59 +94,136 @@ async def import_provider(provider: str, payload: dict[str, Any]) -> dict[str, A
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="No anime list provided"
         )
+    return _group_by_title(anime_list)
 
-    status_map = {
-        "CURRENT": "watching",
-        "COMPLETED": "completed",
-        "PLANNING": "plan to watch",
-        "DROPPED": "dropped",
-        "PAUSED": "on hold",
-        "REPEATING": "watching",
-    }
 
-    mapped = []
-    for item in anime_list:
-        entries = item.get("entries") or []
-        for entry in entries:
-            media = entry.get("media") or {}
-            title_obj = media.get("title") or {}
-            english_title = title_obj.get("english")
-            if not english_title:
+async def _lookup(title: str, semaphore: asyncio.Semaphore) -> tuple[str, Any]:
+    async with semaphore:
+        try:
+            suggestions = await fetch_search_suggestions(title)
+        except HTTPException as exc:
+            return title, {"title": title, "detail": exc.detail}
+        except ValueError:
+            return title, {"title": title, "detail": "Failed to parse upstream response"}
+    return title, suggestions
+
+
+async def resolve_titles(
+    titles: dict[str, list[str]], *, concurrency: int = settings.import_concurrency
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield one ``anime``/``error`` event per list entry as lookups finish."""
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.ensure_future(_lookup(title, semaphore)) for title in titles]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            title, result = await next_done
+            entry_statuses = titles[title]
+            if "detail" in result:
+                yield {"type": "error", **result, "entries": len(entry_statuses)}
                 continue
-            try:
-                suggestions = await fetch_search_suggestions(english_title)
-            except httpx.HTTPStatusError as exc:
-                upstream_status = exc.response.status_code
-                if 500 <= upstream_status < 600:
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail="Upstream service failed",
-                    ) from exc
-                raise HTTPException(
-                    status_code=upstream_status,
-                    detail="Upstream request was rejected",
-                ) from exc
-            except httpx.HTTPError as exc:
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Failed to contact upstream service",
-                ) from exc
-            except ValueError as exc:
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Failed to parse upstream response",
-                ) from exc
-            suggestions_list = suggestions.get("suggestions") or []
+            suggestions_list = result.get("suggestions") or []
             if not suggestions_list:
+                yield {"type": "skipped", "title": title, "entries": len(entry_statuses)}
                 continue
             first = suggestions_list[0]
-            mapped.append(
-                {
+            for entry_status in entry_statuses:
+                yield {
+                    "type": "anime",
                     "id": first.get("id"),
                     "thumbnail": first.get("poster"),
                     "title": first.get("name"),
-                    "status": status_map.get(item.get("status"), "watching"),
+                    "status": entry_status,
                 }
-            )
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _anime_fields(event: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in event.items() if key != "type"}
+
+
+async def _run_import(progress: ImportProgress, titles: dict[str, list[str]]) -> None:
+    progress.status = JobStatus.RUNNING
+    try:
+        async for event in resolve_titles(titles):
+            if event["type"] == "anime":
+                progress.animes.append(_anime_fields(event))
+                progress.processed += 1
+            elif event["type"] == "error":
+                progress.errors.append({"title": event["title"], "detail": event["detail"]})
+                progress.processed += event["entries"]
+            else:
+                progress.processed += event["entries"]
+    except Exception:
+        progress.status = JobStatus.FAILED
+        raise
+    progress.status = JobStatus.SUCCEEDED
+
+
+def _track(progress: ImportProgress) -> None:
+    _imports[progress.job_id] = progress
+    while len(_imports) > MAX_TRACKED_IMPORTS:
+        _imports.popitem(last=False)
+
+
+async def _stream_ndjson(titles: dict[str, list[str]]) -> AsyncIterator[bytes]:
+    imported = failed = 0
+    async for event in resolve_titles(titles):
+        if event["type"] == "anime":
+            imported += 1
+        elif event["type"] == "error":
+            failed += event["entries"]
+        yield (json.dumps(event) + "\n").encode("utf-8")
+    summary = {
+        "type": "summary",
+        "total": sum(len(statuses) for statuses in titles.values()),
+        "imported": imported,
+        "failed": failed,
+    }
+    yield (json.dumps(summary) + "\n").encode("utf-8")
 
-    return {"animes": mapped}
+
+@router.post("/{provider}")
+async def import_provider(
+    provider: str, payload: dict[str, Any], request: Request
+) -> Any:
+    titles = _validate_request(provider, payload)
+
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(_stream_ndjson(titles), media_type=NDJSON_MEDIA_TYPE)
+
+    progress = ImportProgress(
+        job_id="", total=sum(len(statuses) for statuses in titles.values())
+    )
+    await _run_import(progress, titles)
+    return {"animes": progress.animes, "errors": progress.errors}
+
+
+@router.post("/{provider}/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def start_import_job(provider: str, payload: dict[str, Any]) -> dict[str, Any]:
+    titles = _validate_request(provider, payload)
+    progress = ImportProgress(
+        job_id=uuid.uuid4().hex,
+        total=sum(len(statuses) for statuses in titles.values()),
+    )
+    _track(progress)
+    await default_job_runner.enqueue(
+        Job(
+            key=f"import:{provider}:{progress.job_id}",
+            handler=lambda: _run_import(progress, titles),
+            max_attempts=1,
+            priority=JobPriority.LOW,
+        )
+    )
+    return {"job_id": progress.job_id, "status": progress.status.value}
+
+
+@router.get("/jobs/{job_id}")
+async def import_job_status(job_id: str) -> dict[str, Any]:
+    progress = _imports.get(job_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found"
+        )
+    return progress.as_dict()
@@ -0,0 +1,260 @@
+"""Circuit breakers and adaptive concurrency for upstream requests.
+
+Every upstream request is classified into an endpoint class (episode list,
+servers, sources, search suggest, schedule, pages). Each class has its own
+circuit breaker: after ``failure_threshold`` consecutive failures it opens and
+requests fail immediately for ``recovery_timeout`` seconds, then a single
+half-open probe decides whether to close it again.
+
+Outstanding requests are additionally capped by an AIMD limiter: the limit
+grows by one per "window" of fast successes and is halved on failures or on
+responses slower than ``latency_target``. Requests that cannot get a slot
+within ``queue_timeout`` are rejected instead of queueing behind a slow
+upstream.
+
+Both rejections are raised as ``httpx.TransportError`` subclasses, so the
+existing ``except httpx.HTTPError`` handling in the proxy routers turns them
+into 502 responses and the response cache can fall back to stale data.
+"""
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+from app.config import settings
+
+Clock = Callable[[], float]
+
+ENDPOINT_CLASSES = (
+    ("/ajax/v2/episode/list", "episode_list"),
+    ("/ajax/v2/episode/servers", "servers"),
+    ("/ajax/v2/episode/sources", "sources"),
+    ("/ajax/search/suggest", "search_suggest"),
+    ("/ajax/schedule", "schedule"),
+    ("/watch/", "watch_page"),
+)
+DEFAULT_ENDPOINT_CLASS = "page"
+
+
+def classify_endpoint(url: httpx.URL) -> str:
+    for prefix, name in ENDPOINT_CLASSES:
+        if url.path.startswith(prefix):
+            return name
+    return DEFAULT_ENDPOINT_CLASS
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without contacting upstream while a breaker is open."""
+
+
+class UpstreamOverloadedError(httpx.TransportError):
+    """Raised when no concurrency slot frees up within the queue timeout."""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = settings.upstream_breaker_failure_threshold,
+        recovery_timeout: float = settings.upstream_breaker_recovery_timeout,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._rejected = 0
+        self._opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self._rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._trip()
+
+    def release_probe(self) -> None:
+        """Forget a probe that ended without a verdict (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def _trip(self) -> None:
+        if self._state != self.OPEN:
+            self._opened += 1
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self._opened,
+            "rejected": self._rejected,
+        }
+
+
+class AdaptiveLimiter:
+    """AIMD limit on concurrently outstanding requests."""
+
+    def __init__(
+        self,
+        *,
+        max_limit: int = settings.upstream_max_connections_per_host,
+        min_limit: int = 1,
+        latency_target: float = settings.upstream_latency_target,
+        queue_timeout: float = settings.upstream_queue_timeout,
+    ) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.latency_target = latency_target
+        self.queue_timeout = queue_timeout
+        self._limit = float(max_limit)
+        self._in_flight = 0
+        self._condition: asyncio.Condition | None = None
+        self._rejected = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> bool:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._in_flight < self.limit),
+                    timeout=self.queue_timeout,
+                )
+            except asyncio.TimeoutError:
+                self._rejected += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    async def release(self, *, latency: float | None, failed: bool) -> None:
+        if failed or (latency is not None and latency > self.latency_target):
+            self._limit = max(float(self.min_limit), self._limit / 2)
+            self._decreases += 1
+        elif latency is not None:
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+        self._in_flight -= 1
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected,
+            "decreases": self._decreases,
+        }
+
+
+def _is_failure_status(status_code: int) -> bool:
+    return status_code >= 500 or status_code == 429
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Apply per-endpoint breakers and the adaptive limit around a transport."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        *,
+        limiter: AdaptiveLimiter | None = None,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self._transport = transport
+        self._limiter = limiter or AdaptiveLimiter()
+        self._breaker_factory = breaker_factory
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._clock = clock
+
+    @property
+    def wrapped(self) -> httpx.AsyncBaseTransport:
+        return self._transport
+
+    def breaker_for(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = self._breaker_factory()
+        return breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = classify_endpoint(request.url)
+        breaker = self.breaker_for(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit for upstream endpoint '{endpoint}' is open", request=request
+            )
+        if not await self._limiter.acquire():
+            breaker.release_probe()
+            raise UpstreamOverloadedError(
+                "Too many outstanding upstream requests", request=request
+            )
+
+        started = self._clock()
+        latency: float | None = None
+        failed = False
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            failed = True
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        else:
+            latency = self._clock() - started
+            failed = _is_failure_status(response.status_code)
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return response
+        finally:
+            await self._limiter.release(latency=latency, failed=failed)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "concurrency": self._limiter.stats(),
+            "breakers": {name: breaker.stats() for name, breaker in self._breakers.items()},
+        }
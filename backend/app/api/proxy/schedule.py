@@ -1,15 +1,18 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
-import httpx
 
-from app.parser import schedule as schedule_parser
-
-from .common import SRC_AJAX_URL, SRC_BASE_URL, get_client
+from .schedule_snapshots import MAX_TZ_OFFSET, MIN_TZ_OFFSET, schedule_snapshots
 
 router = APIRouter(tags=["Schedule"])
 
+# Upstream's own default zone (UTC+05:30), kept for clients that do not send
+# their offset.
+DEFAULT_TZ_OFFSET = -330
+
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y")
+
 
 @router.get("/home")
 async def home() -> dict[str, Any]:
@@ -17,38 +20,24 @@ async def home() -> dict[str, Any]:
     return {"data": {}}
 
 
+def _parse_date(value: str) -> date:
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date")
+
+
 @router.get("/schedule")
-async def schedule(date: Optional[str] = Query(None)) -> dict[str, Any]:
-    target_date = date or datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
-    try:
-        async with await get_client() as client:
-            resp = await client.get(
-                f"{SRC_AJAX_URL}/schedule/list",
-                params={"tzOffset": -330, "date": target_date},
-                headers={
-                    "Accept": "*/*",
-                    "Referer": SRC_BASE_URL,
-                    "X-Requested-With": "XMLHttpRequest",
-                },
-            )
-            resp.raise_for_status()
-            html = resp.json().get("html", "")
-    except httpx.HTTPStatusError as exc:
-        status_code = exc.response.status_code
-        if 500 <= status_code < 600:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail="Upstream schedule service failed",
-            ) from exc
-        raise HTTPException(
-            status_code=status_code,
-            detail="Upstream schedule request was rejected",
-        ) from exc
-    except httpx.HTTPError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="Failed to reach upstream schedule service",
-        ) from exc
-
-    data = schedule_parser.parse_schedule_html(html, target_date)
+async def schedule(
+    date: Optional[str] = Query(None),
+    tzOffset: int = Query(DEFAULT_TZ_OFFSET, ge=MIN_TZ_OFFSET, le=MAX_TZ_OFFSET),
+) -> dict[str, Any]:
+    if date:
+        local_day = _parse_date(date.strip())
+    else:
+        zone = timezone(-timedelta(minutes=tzOffset))
+        local_day = datetime.now(tz=zone).date()
+    data = await schedule_snapshots.for_local_day(local_day, tzOffset)
     return {"data": data}
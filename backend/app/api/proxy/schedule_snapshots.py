@@ -0,0 +1,220 @@
+"""Pre-parsed airing schedule snapshots.
+
+The upstream schedule list is always fetched in UTC (``tzOffset=0``) and
+parsed once into absolute airing timestamps, one snapshot per UTC day. A
+background refresher keeps the days around "today" warm; any client
+timezone is then answered by slicing the neighbouring UTC days, so extra
+timezones never cause extra upstream requests. Only the relative
+``secondsUntilAiring`` field is computed per request.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import httpx
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.parser import schedule as schedule_parser
+
+from .cache import SCHEDULE_POLICY, response_cache
+from .common import SRC_AJAX_URL, SRC_BASE_URL, get_client
+from .executor import parse_executor
+from .suggestion_index import suggestion_index
+
+logger = logging.getLogger("kitsu.proxy.schedule")
+
+# Local days served from snapshots, relative to the current UTC day. With
+# offsets of up to 14 hours a local day reaches into the neighbouring UTC day,
+# hence the extra day on each side.
+SNAPSHOT_WINDOW = (-1, 7)
+_UTC_WINDOW = (SNAPSHOT_WINDOW[0] - 1, SNAPSHOT_WINDOW[1] + 1)
+
+# Valid ``tzOffset`` values in minutes (UTC-12:00 .. UTC+14:00).
+MIN_TZ_OFFSET = -14 * 60
+MAX_TZ_OFFSET = 12 * 60
+
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    day: date
+    items: tuple[dict[str, Any], ...]
+    fetched_at: float
+
+
+async def _fetch_utc_day(day: date) -> tuple[dict[str, Any], ...]:
+    day_text = day.isoformat()
+    try:
+        client = await get_client()
+        resp = await client.get(
+            f"{SRC_AJAX_URL}/schedule/list",
+            params={"tzOffset": 0, "date": day_text},
+            headers={
+                "Accept": "*/*",
+                "Referer": SRC_BASE_URL,
+                "X-Requested-With": "XMLHttpRequest",
+            },
+        )
+        resp.raise_for_status()
+        html = resp.json().get("html", "")
+    except httpx.HTTPStatusError as exc:
+        status_code = exc.response.status_code
+        if 500 <= status_code < 600:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Upstream schedule service failed",
+            ) from exc
+        raise HTTPException(
+            status_code=status_code,
+            detail="Upstream schedule request was rejected",
+        ) from exc
+    except httpx.HTTPError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to reach upstream schedule service",
+        ) from exc
+
+    parsed = await parse_executor.run(
+        schedule_parser.parse_schedule_html, html, day_text, None, 0
+    )
+    suggestion_index.record(parsed["scheduledAnimes"])
+    return tuple(
+        {
+            "id": item["id"],
+            "name": item["name"],
+            "jname": item["jname"],
+            "airingTimestamp": item["airingTimestamp"],
+            "episode": item["episode"],
+        }
+        for item in parsed["scheduledAnimes"]
+        if item["airingTimestamp"]
+    )
+
+
+class ScheduleSnapshotStore:
+    def __init__(
+        self,
+        *,
+        refresh_interval: float = settings.schedule_refresh_interval,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._snapshots: dict[date, ScheduleSnapshot] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._refreshes = 0
+        self._refresh_failures = 0
+        self._last_refresh_at: float | None = None
+
+    def today(self) -> date:
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc).date()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def refresh(self) -> None:
+        """Re-fetch every UTC day of the window and drop days that left it."""
+        today = self.today()
+        days = [
+            today + timedelta(days=offset)
+            for offset in range(_UTC_WINDOW[0], _UTC_WINDOW[1] + 1)
+        ]
+        results = await asyncio.gather(
+            *(_fetch_utc_day(day) for day in days), return_exceptions=True
+        )
+        fetched_at = self._clock()
+        for day, result in zip(days, results):
+            if isinstance(result, BaseException):
+                self._refresh_failures += 1
+                logger.warning("Schedule refresh failed for %s: %s", day, result)
+                continue
+            self._snapshots[day] = ScheduleSnapshot(day=day, items=result, fetched_at=fetched_at)
+        for day in [day for day in self._snapshots if day not in days]:
+            del self._snapshots[day]
+        self._refreshes += 1
+        self._last_refresh_at = fetched_at
+
+    async def utc_day(self, day: date) -> tuple[dict[str, Any], ...]:
+        snapshot = self._snapshots.get(day)
+        if snapshot is not None:
+            return snapshot.items
+        # Outside the window, or the refresher has not filled it yet.
+        return await response_cache.get_or_fetch(
+            f"schedule:{day.isoformat()}",
+            lambda: _fetch_utc_day(day),
+            policy=SCHEDULE_POLICY,
+        )
+
+    async def for_local_day(self, local_day: date, tz_offset: int) -> dict[str, Any]:
+        if not date.min < local_day < date.max:
+            # Its neighbouring UTC day is not representable; nothing airs there.
+            return {"scheduledAnimes": []}
+        zone = timezone(-timedelta(minutes=tz_offset))
+        start = datetime.combine(local_day, datetime.min.time(), tzinfo=zone)
+        start_ms = int(start.timestamp() * 1000)
+        end_ms = start_ms + 24 * 60 * 60 * 1000
+        utc_days = sorted(
+            {
+                datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc).date(),
+                datetime.fromtimestamp((end_ms - 1) / 1000, tz=timezone.utc).date(),
+            }
+        )
+        day_items = await asyncio.gather(*(self.utc_day(day) for day in utc_days))
+
+        now = self._clock()
+        items = []
+        for item in sorted(
+            (item for chunk in day_items for item in chunk),
+            key=lambda item: item["airingTimestamp"],
+        ):
+            airing_ms = item["airingTimestamp"]
+            if not start_ms <= airing_ms < end_ms:
+                continue
+            local_time = datetime.fromtimestamp(airing_ms / 1000, tz=zone)
+            items.append(
+                {
+                    "id": item["id"],
+                    "time": local_time.strftime("%H:%M"),
+                    "name": item["name"],
+                    "jname": item["jname"],
+                    "airingTimestamp": airing_ms,
+                    "secondsUntilAiring": int(airing_ms / 1000 - now),
+                    "episode": item["episode"],
+                }
+            )
+        return {"scheduledAnimes": items}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "days": sorted(day.isoformat() for day in self._snapshots),
+            "refreshes": self._refreshes,
+            "refresh_failures": self._refresh_failures,
+            "last_refresh_at": self._last_refresh_at,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:  # noqa: BLE001
+                logger.exception("Schedule snapshot refresh crashed")
+            await asyncio.sleep(self.refresh_interval)
+
+
+schedule_snapshots = ScheduleSnapshotStore()
@@ -5,7 +5,10 @@ import httpx
 
 from app.parser import search as search_parser
 
+from .cache import SEARCH_SUGGEST_POLICY, response_cache
 from .common import SRC_AJAX_URL, SRC_BASE_URL, get_client
+from .executor import parse_executor
+from .suggestion_index import SUGGESTION_LIMIT, suggestion_index
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
@@ -16,20 +19,20 @@ async def search() -> dict[str, Any]:
     return {"data": []}
 
 
-async def fetch_search_suggestions(query: str) -> dict[str, Any]:
+async def _fetch_search_suggestions(query: str) -> dict[str, Any]:
     try:
-        async with await get_client() as client:
-            resp = await client.get(
-                f"{SRC_AJAX_URL}/search/suggest",
-                params={"keyword": query},
-                headers={
-                    "Accept": "*/*",
-                    "Referer": SRC_BASE_URL,
-                    "X-Requested-With": "XMLHttpRequest",
-                },
-            )
-            resp.raise_for_status()
-            html = resp.json().get("html", "")
+        client = await get_client()
+        resp = await client.get(
+            f"{SRC_AJAX_URL}/search/suggest",
+            params={"keyword": query},
+            headers={
+                "Accept": "*/*",
+                "Referer": SRC_BASE_URL,
+                "X-Requested-With": "XMLHttpRequest",
+            },
+        )
+        resp.raise_for_status()
+        html = resp.json().get("html", "")
     except httpx.HTTPStatusError as exc:
         status_code = exc.response.status_code
         if 500 <= status_code < 600:
@@ -45,7 +48,17 @@ async def fetch_search_suggestions(query: str) -> dict[str, Any]:
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Upstream service unavailable",
         ) from exc
-    return search_parser.parse_search_suggestions(html)
+    data = await parse_executor.run(search_parser.parse_search_suggestions, html)
+    suggestion_index.record(data["suggestions"])
+    return data
+
+
+async def fetch_search_suggestions(query: str) -> dict[str, Any]:
+    return await response_cache.get_or_fetch(
+        f"search-suggest:{query}",
+        lambda: _fetch_search_suggestions(query),
+        policy=SEARCH_SUGGEST_POLICY,
+    )
 
 
 @router.get("/suggestion")
@@ -54,5 +67,8 @@ async def search_suggestion(q: str = Query(...)) -> dict[str, Any]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid query"
         )
+    local = suggestion_index.lookup(q.strip(), SUGGESTION_LIMIT)
+    if local:
+        return {"data": {"suggestions": local}}
     data = await fetch_search_suggestions(q.strip())
     return {"data": data}
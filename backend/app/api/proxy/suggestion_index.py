@@ -0,0 +1,122 @@
+"""Local answers for ``/api/search/suggestion``.
+
+Every title the proxy scrapes (search suggestions, anime pages, schedule
+lists) is recorded in a ``PrefixIndex`` keyed by the upstream id, and the
+catalog's own in-memory anime index is consulted next to it; catalog
+entries are tagged ``source: "catalog"`` with the anime UUID in
+``catalog_id`` and no upstream ``id``. A keystroke is
+answered from these two by prefix first and then with one typo tolerated;
+only when both find nothing does the route call upstream, whose answer is
+recorded in turn. The scraped part keeps at most
+``SEARCH_SUGGEST_INDEX_MAX_ENTRIES`` titles, dropping the least recently seen.
+"""
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from app.application.anime_suggest import AnimeSuggestIndex, anime_suggest_index
+from app.config import settings
+from app.schemas.anime import AnimeListItem
+from app.utils.prefix_index import PrefixIndex, normalize
+
+# Upstream returns five suggestions per keystroke; local answers match that.
+SUGGESTION_LIMIT = 5
+
+_EMPTY = (None, "", [])
+
+
+def _catalog_suggestion(item: AnimeListItem) -> dict[str, Any]:
+    # ``id`` is reserved for upstream slugs that clients pass back to the
+    # ``/api/anime/{id}`` proxy routes; a local anime UUID means nothing there.
+    return {
+        "id": None,
+        "name": item.title,
+        "jname": None,
+        "poster": None,
+        "moreInfo": [str(value) for value in (item.year, item.status) if value],
+        "source": "catalog",
+        "catalog_id": str(item.id),
+    }
+
+
+class SuggestionIndex:
+    def __init__(
+        self,
+        max_entries: int = settings.search_suggest_index_max_entries,
+        *,
+        catalog: AnimeSuggestIndex = anime_suggest_index,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0")
+        self.max_entries = max_entries
+        self._catalog = catalog
+        self._index = PrefixIndex()
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._counters = {"hits": 0, "fuzzy_hits": 0, "misses": 0, "recorded": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def record(self, items: Iterable[dict[str, Any]]) -> None:
+        """Add scraped titles; fields missing from a newer sighting are kept."""
+        for item in items:
+            anime_id, name = item.get("id"), item.get("name")
+            if not anime_id or not name:
+                continue
+            known = self._index.get(anime_id) or {
+                "id": anime_id,
+                "name": name,
+                "jname": None,
+                "poster": None,
+                "moreInfo": [],
+            }
+            merged = {
+                **known,
+                **{key: value for key, value in item.items() if key in known and value not in _EMPTY},
+            }
+            self._index.replace(anime_id, (merged["name"], merged["jname"]), merged)
+            self._seen[anime_id] = None
+            self._seen.move_to_end(anime_id)
+            self._counters["recorded"] += 1
+        while len(self._seen) > self.max_entries:
+            oldest, _ = self._seen.popitem(last=False)
+            self._index.remove(oldest)
+            self._counters["evictions"] += 1
+
+    def lookup(self, query: str, limit: int = SUGGESTION_LIMIT) -> list[dict[str, Any]]:
+        """Local suggestions for ``query``; an empty list means upstream should be asked."""
+        suggestions = self._merge(
+            self._index.search(query, limit), self._catalog.search(query, limit), limit
+        )
+        if suggestions:
+            self._counters["hits"] += 1
+            return suggestions
+        suggestions = self._merge(
+            self._index.search_fuzzy(query, limit),
+            self._catalog.search_fuzzy(query, limit),
+            limit,
+        )
+        self._counters["fuzzy_hits" if suggestions else "misses"] += 1
+        return suggestions
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._index),
+            "max_entries": self.max_entries,
+            "catalog_loaded": self._catalog.loaded,
+            **self._counters,
+        }
+
+    @staticmethod
+    def _merge(
+        scraped: list[dict[str, Any]], catalog: list[AnimeListItem] | None, limit: int
+    ) -> list[dict[str, Any]]:
+        # Scraped entries carry upstream ids the player understands, so they
+        # win over a catalog entry with the same name.
+        merged: dict[str, dict[str, Any]] = {}
+        for suggestion in [*scraped, *map(_catalog_suggestion, catalog or [])]:
+            merged.setdefault(normalize(suggestion["name"]), suggestion)
+        return list(merged.values())[:limit]
+
+
+suggestion_index = SuggestionIndex()
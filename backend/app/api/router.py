@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from .internal import favorites as internal_favorites
 from .internal import health as internal_health
+from .internal import metrics as internal_metrics
 from .internal import watch as internal_watch
 from .proxy import anime as proxy_anime
 from .proxy import episodes as proxy_episodes
@@ -13,6 +14,7 @@ router = APIRouter(prefix="/api")
 
 _internal_routers = [
     internal_health.router,
+    internal_metrics.router,
     internal_favorites.router,
     internal_watch.router,
 ]
@@ -0,0 +1,143 @@
+"""Autocomplete over anime titles served from memory.
+
+The whole ``anime`` table (id, titles, year, status) is loaded into a
+``PrefixIndex`` at startup and reloaded every
+``ANIME_SUGGEST_REFRESH_INTERVAL`` seconds. In between, ``anime:<id>``
+notifications from the catalog change listener re-read just that row, so
+edits show up without waiting for the next reload. Until the first load
+succeeds ``search`` returns ``None`` and callers fall back to the database.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.anime import Anime
+from app.schemas.anime import AnimeListItem
+from app.utils.prefix_index import PrefixIndex
+
+logger = logging.getLogger("kitsu.anime_suggest")
+
+_COLUMNS = (Anime.id, Anime.title, Anime.title_original, Anime.year, Anime.status)
+
+
+def _item(row: Any) -> tuple[uuid.UUID, tuple[str | None, ...], AnimeListItem]:
+    value = AnimeListItem(id=row.id, title=row.title, year=row.year, status=row.status)
+    return row.id, (row.title, row.title_original), value
+
+
+class AnimeSuggestIndex:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        *,
+        refresh_interval: float = settings.anime_suggest_refresh_interval,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self._session_factory = session_factory
+        self._clock = clock
+        self._index = PrefixIndex()
+        self._loaded_at: float | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._updates: set[asyncio.Task[None]] = set()
+        self._counters = {"reloads": 0, "updates": 0, "failures": 0, "lookups": 0}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def search(self, query: str, limit: int) -> list[AnimeListItem] | None:
+        if not self.loaded:
+            return None
+        self._counters["lookups"] += 1
+        return self._index.search(query, limit)
+
+    def search_fuzzy(self, query: str, limit: int) -> list[AnimeListItem] | None:
+        if not self.loaded:
+            return None
+        self._counters["lookups"] += 1
+        return self._index.search_fuzzy(query, limit)
+
+    async def reload(self) -> None:
+        async with self._session_factory() as session:
+            result = await session.execute(select(*_COLUMNS))
+            rows = result.all()
+        self._index.rebuild(_item(row) for row in rows)
+        self._loaded_at = self._clock()
+        self._counters["reloads"] += 1
+
+    async def refresh(self, anime_id: uuid.UUID) -> None:
+        async with self._session_factory() as session:
+            result = await session.execute(select(*_COLUMNS).where(Anime.id == anime_id))
+            row = result.first()
+        if row is None:
+            self._index.remove(anime_id)
+        else:
+            self._index.replace(*_item(row))
+        self._counters["updates"] += 1
+
+    def handle(self, payload: str) -> None:
+        """Catalog change callback: re-read the anime named by ``anime:<id>``."""
+        table, _, entity_id = payload.partition(":")
+        if table != "anime" or not self.loaded:
+            return
+        try:
+            anime_id = uuid.UUID(entity_id)
+        except ValueError:
+            return
+        task = asyncio.create_task(self._refresh_logged(anime_id))
+        self._updates.add(task)
+        task.add_done_callback(self._updates.discard)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._task, *self._updates) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._updates.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "entries": len(self._index),
+            "age_seconds": (
+                None if self._loaded_at is None else self._clock() - self._loaded_at
+            ),
+            "refresh_interval_seconds": self.refresh_interval,
+            **self._counters,
+        }
+
+    async def _refresh_logged(self, anime_id: uuid.UUID) -> None:
+        try:
+            await self.refresh(anime_id)
+        except Exception as exc:  # noqa: BLE001
+            # The next periodic reload picks the change up.
+            self._counters["failures"] += 1
+            logger.warning("Suggestion update for anime %s failed: %s", anime_id, exc)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._counters["failures"] += 1
+                logger.warning("Anime suggestion index reload failed: %s", exc)
+            await asyncio.sleep(self.refresh_interval)
+
+
+anime_suggest_index = AnimeSuggestIndex()
@@ -1,7 +1,37 @@
+"""Soft rate limiting of failed login and refresh attempts.
+
+Each key holds a sliding-window counter: the number of failures in the
+current fixed window and in the previous one. The previous window is weighted
+by how much of it still overlaps the sliding window, so a key costs three
+integers however many attempts it sees.
+
+Keys idle for a whole window weigh nothing and are dropped by a sweeper that
+runs every ``AUTH_RATE_LIMIT_SWEEP_INTERVAL`` seconds (started in the app
+lifespan), so keys that never come back do not accumulate.
+
+Counters live in a ``RateLimitStore``. ``AUTH_RATE_LIMIT_BACKEND=memory``
+keeps them in the process, so with several workers every worker enforces its
+own limit. ``postgres`` keeps them in the ``auth_rate_limits`` table, so all
+workers and instances share one budget per key.
+"""
+import asyncio
 import hashlib
+import logging
 import time
-from collections import defaultdict
-from typing import DefaultDict, List
+from array import array
+from collections.abc import Callable
+from typing import Any, NamedTuple, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..crud.auth_rate_limit import (
+    delete_rate_limit,
+    delete_stale_rate_limits,
+    get_rate_limit_counts,
+    increment_rate_limit,
+)
+from ..database import AsyncSessionLocal
 
 AUTH_RATE_LIMIT_MAX_ATTEMPTS = 5
 AUTH_RATE_LIMIT_WINDOW_SECONDS = 60
@@ -9,42 +39,280 @@ RATE_LIMIT_MESSAGE = "Too many attempts, try again later"
 IDENTIFIER_HASH_LENGTH = 64
 IP_FALLBACK_LENGTH = 8
 
+SessionFactory = Callable[[], AsyncSession]
+
+logger = logging.getLogger("kitsu.auth_rate_limit")
+
 
 class RateLimitExceededError(Exception):
     """Raised when the rate limit is exceeded for a given key."""
 
 
+class WindowCounts(NamedTuple):
+    window: int
+    current: int
+    previous: int
+
+
+class RateLimitStore(Protocol):
+    async def get(self, key: str) -> WindowCounts | None: ...
+
+    async def increment(self, key: str, window: int) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def sweep(self, before_window: int) -> int: ...
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+def roll_window(counts: WindowCounts | None, window: int) -> WindowCounts:
+    """Counts as seen from ``window``; never moves back to an older window."""
+    if counts is None:
+        return WindowCounts(window, 0, 0)
+    if counts.window >= window:
+        return counts
+    if counts.window == window - 1:
+        return WindowCounts(window, 0, counts.current)
+    return WindowCounts(window, 0, 0)
+
+
+class MemoryRateLimitStore:
+    """Process-local store; the default and the stand-in for tests.
+
+    Counters live in parallel ``array`` columns indexed by slot, and keys map
+    to slots by a 16-byte digest, so a tracked key costs a dict entry and 16
+    bytes of counters instead of a list of floats. At most ``max_keys`` keys
+    are tracked: a new key past the cap takes the slot of the least recently
+    counted key among ``EVICTION_SAMPLE`` slots after a rotating hand.
+    """
+
+    backend = "memory"
+    EVICTION_SAMPLE = 16
+    SWEEP_CHUNK = 10_000
+
+    def __init__(self, max_keys: int = settings.auth_rate_limit_max_keys) -> None:
+        self.max_keys = max_keys
+        self._evicted = 0
+        self._swept = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self._slots: dict[bytes, int] = {}
+        self._keys: list[bytes | None] = []
+        self._windows = array("q")
+        self._current = array("I")
+        self._previous = array("I")
+        self._free: list[int] = []
+        self._hand = 0
+
+    async def get(self, key: str) -> WindowCounts | None:
+        slot = self._slots.get(_digest(key))
+        if slot is None:
+            return None
+        return WindowCounts(self._windows[slot], self._current[slot], self._previous[slot])
+
+    async def increment(self, key: str, window: int) -> None:
+        digest = _digest(key)
+        slot = self._slots.get(digest)
+        if slot is None:
+            slot = self._allocate(digest)
+            counts = WindowCounts(window, 0, 0)
+        else:
+            counts = roll_window(
+                WindowCounts(self._windows[slot], self._current[slot], self._previous[slot]),
+                window,
+            )
+        self._windows[slot] = counts.window
+        self._current[slot] = counts.current + 1
+        self._previous[slot] = counts.previous
+
+    async def delete(self, key: str) -> None:
+        slot = self._slots.pop(_digest(key), None)
+        if slot is not None:
+            self._release(slot)
+
+    async def sweep(self, before_window: int) -> int:
+        """Forget keys last counted before ``before_window``: their failures no
+        longer weigh anything. Yields to the loop every ``SWEEP_CHUNK`` slots."""
+        removed = 0
+        for start in range(0, len(self._keys), self.SWEEP_CHUNK):
+            for slot in range(start, min(start + self.SWEEP_CHUNK, len(self._keys))):
+                digest = self._keys[slot]
+                if digest is not None and self._windows[slot] < before_window:
+                    del self._slots[digest]
+                    self._release(slot)
+                    removed += 1
+            await asyncio.sleep(0)
+        self._swept += removed
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "keys": len(self._slots),
+            "max_keys": self.max_keys,
+            "slots": len(self._keys),
+            "evicted": self._evicted,
+            "swept": self._swept,
+        }
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _allocate(self, digest: bytes) -> int:
+        if len(self._slots) >= self.max_keys:
+            slot = self._evict()
+            self._keys[slot] = digest
+        elif self._free:
+            slot = self._free.pop()
+            self._keys[slot] = digest
+        else:
+            slot = len(self._keys)
+            self._keys.append(digest)
+            self._windows.append(0)
+            self._current.append(0)
+            self._previous.append(0)
+        self._slots[digest] = slot
+        return slot
+
+    def _evict(self) -> int:
+        victim = -1
+        for _ in range(min(self.EVICTION_SAMPLE, len(self._keys))):
+            slot = self._hand
+            self._hand = (self._hand + 1) % len(self._keys)
+            if self._keys[slot] is not None and (
+                victim < 0 or self._windows[slot] < self._windows[victim]
+            ):
+                victim = slot
+        # At the cap every slot is taken, so the sample always finds one.
+        del self._slots[self._keys[victim]]  # type: ignore[arg-type]
+        self._evicted += 1
+        return victim
+
+    def _release(self, slot: int) -> None:
+        self._keys[slot] = None
+        self._free.append(slot)
+
+
+class PostgresRateLimitStore:
+    """Counters in ``auth_rate_limits``, shared by every worker.
+
+    Each call runs in its own short transaction, independent of the request
+    session: the failure must be recorded even when the login rolls back.
+    """
+
+    backend = "postgres"
+
+    def __init__(self, session_factory: SessionFactory = AsyncSessionLocal) -> None:
+        self._session_factory = session_factory
+
+    async def get(self, key: str) -> WindowCounts | None:
+        async with self._session_factory() as session:
+            row = await get_rate_limit_counts(session, key)
+        return None if row is None else WindowCounts(*row)
+
+    async def increment(self, key: str, window: int) -> None:
+        async with self._session_factory() as session:
+            await increment_rate_limit(session, key, window)
+            await session.commit()
+
+    async def delete(self, key: str) -> None:
+        async with self._session_factory() as session:
+            await delete_rate_limit(session, key)
+            await session.commit()
+
+    async def sweep(self, before_window: int) -> int:
+        async with self._session_factory() as session:
+            removed = await delete_stale_rate_limits(session, before_window)
+            await session.commit()
+        return removed
+
+
 class SoftRateLimiter:
-    def __init__(self, max_attempts: int, window_seconds: int) -> None:
+    def __init__(
+        self,
+        max_attempts: int,
+        window_seconds: int,
+        store: RateLimitStore | None = None,
+        sweep_interval: float = settings.auth_rate_limit_sweep_interval,
+    ) -> None:
         self.max_attempts = max_attempts
         self.window_seconds = window_seconds
-        self._attempts: DefaultDict[str, List[float]] = defaultdict(list)
+        self.sweep_interval = sweep_interval
+        self.store: RateLimitStore = MemoryRateLimitStore() if store is None else store
+        self._limited = 0
+        self._sweep_failures = 0
+        self._task: asyncio.Task[None] | None = None
 
-    def _prune(self, key: str, now: float) -> List[float]:
-        cutoff = now - self.window_seconds
-        attempts = [ts for ts in self._attempts.get(key, []) if ts >= cutoff]
-        if attempts:
-            self._attempts[key] = attempts
-        else:
-            self._attempts.pop(key, None)
-        return attempts
+    def _window(self, now: float) -> int:
+        return int(now // self.window_seconds)
+
+    def _estimate(self, counts: WindowCounts | None, now: float) -> float:
+        window = self._window(now)
+        current = roll_window(counts, window)
+        elapsed = (now - window * self.window_seconds) / self.window_seconds
+        return current.current + current.previous * (1 - elapsed)
+
+    async def is_limited(self, key: str, now: float | None = None) -> bool:
+        current = time.time() if now is None else now
+        limited = self._estimate(await self.store.get(key), current) >= self.max_attempts
+        if limited:
+            self._limited += 1
+        return limited
 
-    def is_limited(self, key: str, now: float | None = None) -> bool:
-        current = now or time.time()
-        attempts = self._prune(key, current)
-        return len(attempts) >= self.max_attempts
+    async def record_failure(self, key: str, now: float | None = None) -> None:
+        current = time.time() if now is None else now
+        await self.store.increment(key, self._window(current))
 
-    def record_failure(self, key: str, now: float | None = None) -> None:
-        current = now or time.time()
-        attempts = self._prune(key, current)
-        attempts.append(current)
-        self._attempts[key] = attempts
+    async def reset(self, key: str) -> None:
+        await self.store.delete(key)
 
-    def reset(self, key: str) -> None:
-        self._attempts.pop(key, None)
+    async def sweep(self, now: float | None = None) -> int:
+        """Drop keys idle for a whole window; they no longer limit anything."""
+        current = time.time() if now is None else now
+        return await self.store.sweep(self._window(current) - 1)
 
     def clear(self) -> None:
-        self._attempts.clear()
+        """Forget every key of a process-local store (used by tests)."""
+        if isinstance(self.store, MemoryRateLimitStore):
+            self.store.clear()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "backend": getattr(self.store, "backend", type(self.store).__name__),
+            "max_attempts": self.max_attempts,
+            "window_seconds": self.window_seconds,
+            "limited": self._limited,
+            "sweep_interval_seconds": self.sweep_interval,
+            "sweep_failures": self._sweep_failures,
+        }
+        if isinstance(self.store, MemoryRateLimitStore):
+            stats.update(self.store.stats())
+        return stats
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._sweep_failures += 1
+                logger.warning("Auth rate limit sweep failed: %s", exc)
 
 
 def _make_key(scope: str, identifier: str, client_ip: str | None) -> str:
@@ -56,40 +324,49 @@ def _make_key(scope: str, identifier: str, client_ip: str | None) -> str:
     return f"{scope}:{ip_component}:{identifier_component}"
 
 
-def _ensure_not_limited(limiter: SoftRateLimiter, key: str) -> None:
-    if limiter.is_limited(key):
+async def _ensure_not_limited(limiter: SoftRateLimiter, key: str) -> None:
+    if await limiter.is_limited(key):
         raise RateLimitExceededError
 
 
+def _default_store() -> RateLimitStore:
+    if settings.auth_rate_limit_backend == "postgres":
+        return PostgresRateLimitStore()
+    return MemoryRateLimitStore()
+
+
 auth_rate_limiter = SoftRateLimiter(
     max_attempts=AUTH_RATE_LIMIT_MAX_ATTEMPTS,
     window_seconds=AUTH_RATE_LIMIT_WINDOW_SECONDS,
+    store=_default_store(),
 )
 
 
-def check_login_rate_limit(email: str, client_ip: str | None = None) -> str:
+async def check_login_rate_limit(email: str, client_ip: str | None = None) -> str:
     key = _make_key("login", email.lower(), client_ip)
-    _ensure_not_limited(auth_rate_limiter, key)
+    await _ensure_not_limited(auth_rate_limiter, key)
     return key
 
 
-def record_login_failure(key: str) -> None:
-    auth_rate_limiter.record_failure(key)
+async def record_login_failure(key: str) -> None:
+    await auth_rate_limiter.record_failure(key)
 
 
-def reset_login_limit(key: str) -> None:
-    auth_rate_limiter.reset(key)
+async def reset_login_limit(key: str) -> None:
+    await auth_rate_limiter.reset(key)
 
 
-def check_refresh_rate_limit(token_identifier: str, client_ip: str | None = None) -> str:
+async def check_refresh_rate_limit(
+    token_identifier: str, client_ip: str | None = None
+) -> str:
     key = _make_key("refresh", token_identifier, client_ip)
-    _ensure_not_limited(auth_rate_limiter, key)
+    await _ensure_not_limited(auth_rate_limiter, key)
     return key
 
 
-def record_refresh_failure(key: str) -> None:
-    auth_rate_limiter.record_failure(key)
+async def record_refresh_failure(key: str) -> None:
+    await auth_rate_limiter.record_failure(key)
 
 
-def reset_refresh_limit(key: str) -> None:
-    auth_rate_limiter.reset(key)
+async def reset_refresh_limit(key: str) -> None:
+    await auth_rate_limiter.reset(key)
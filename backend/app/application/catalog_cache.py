@@ -0,0 +1,282 @@
+"""In-process cache of serialized catalog responses.
+
+Anime, release and episode reads are cached as ready-to-send JSON bytes plus
+their response headers (e.g. the next-page cursor), so a hit skips both the
+database and Pydantic. Entries expire after a per-entity TTL and the cache is
+an LRU bounded by the total size of the stored bodies.
+
+Coherence across app instances comes from Postgres: triggers on ``anime``,
+``releases`` and ``episodes`` (migration 0010) ``NOTIFY`` the
+``catalog_changes`` channel with ``<table>:<id>``, and every instance runs a
+``CatalogChangeListener`` that drops the matching entries. While the
+listener is not connected the cache is bypassed, since changes could be
+missed.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import asyncpg
+
+from app.config import settings
+
+CATALOG_CHANNEL = "catalog_changes"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Loader = Callable[[], Awaitable[CachedResponse | None]]
+
+logger = logging.getLogger("kitsu.catalog_cache")
+
+
+@dataclass(frozen=True)
+class CatalogPolicy:
+    ttl: float
+
+
+ANIME_POLICY = CatalogPolicy(ttl=10 * 60)
+ANIME_LIST_POLICY = CatalogPolicy(ttl=60)
+RELEASE_POLICY = CatalogPolicy(ttl=10 * 60)
+EPISODES_POLICY = CatalogPolicy(ttl=5 * 60)
+
+
+@dataclass
+class _CatalogEntry:
+    response: CachedResponse
+    tags: tuple[str, ...]
+    stored_at: float
+    ttl: float
+
+
+class CatalogCache:
+    def __init__(
+        self,
+        max_bytes: int = settings.catalog_cache_max_bytes,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, _CatalogEntry] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._bytes = 0
+        # Bumped on every invalidation; a load that overlapped one is not
+        # stored because it may have read the old row.
+        self._generation = 0
+        self.active = False
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    async def get_or_load(
+        self,
+        key: str,
+        load: Loader,
+        *,
+        policy: CatalogPolicy,
+        tags: Iterable[str] = (),
+    ) -> CachedResponse | None:
+        """Return the cached response for ``key`` or call ``load``; ``None`` is not cached."""
+        if not self.active:
+            self._counters["bypassed"] += 1
+            return await load()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._clock() - entry.stored_at < entry.ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry.response
+            self._remove(key)
+
+        self._counters["misses"] += 1
+        generation = self._generation
+        response = await load()
+        if response is not None and self.active and generation == self._generation:
+            self._store(key, response, (key, *tags), policy.ttl)
+        return response
+
+    def invalidate(self, tag: str) -> int:
+        """Drop every entry stored under ``tag`` (each key is also its own tag)."""
+        self._generation += 1
+        keys = self._tags.pop(tag, set())
+        for key in list(keys):
+            self._remove(key)
+        self._counters["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._tags.clear()
+        self._bytes = 0
+
+    def set_active(self, active: bool) -> None:
+        self.active = active
+        self.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "active": self.active,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            **self._counters,
+        }
+
+    def _store(
+        self, key: str, response: CachedResponse, tags: tuple[str, ...], ttl: float
+    ) -> None:
+        size = len(response.body)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CatalogEntry(
+            response=response, tags=tags, stored_at=self._clock(), ttl=ttl
+        )
+        self._bytes += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._counters["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.response.body)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def tags_for_change(payload: str) -> list[str]:
+    """Map a ``<table>:<id>`` notification to the cache tags it invalidates."""
+    table, _, entity_id = payload.partition(":")
+    if table == "anime":
+        # Any anime change can reorder or alter list pages.
+        return [f"anime:{entity_id}", "anime-list"]
+    if table == "releases":
+        return [f"release:{entity_id}"]
+    if table == "episodes":
+        # Episode notifications carry the release id.
+        return [f"episodes:{entity_id}"]
+    return []
+
+
+class CatalogChangeListener:
+    """Keeps a dedicated connection on ``LISTEN catalog_changes``."""
+
+    def __init__(
+        self,
+        cache: CatalogCache,
+        dsn: str,
+        *,
+        retry_interval: float = 5.0,
+        ping_interval: float = 30.0,
+    ) -> None:
+        self.cache = cache
+        self.dsn = dsn
+        self.retry_interval = retry_interval
+        self.ping_interval = ping_interval
+        self._task: asyncio.Task[None] | None = None
+        self._subscribers: list[Callable[[str], None]] = []
+        self._notifications = 0
+        self._reconnects = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Also pass every ``<table>:<id>`` payload to ``callback``."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def handle(self, payload: str) -> None:
+        self._notifications += 1
+        for tag in tags_for_change(payload):
+            self.cache.invalidate(tag)
+        for callback in self._subscribers:
+            try:
+                callback(payload)
+            except Exception:  # noqa: BLE001
+                logger.exception("Catalog change subscriber failed")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "listening": self.cache.active,
+            "notifications": self._notifications,
+            "reconnects": self._reconnects,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _conn: lost.set())
+                await connection.add_listener(
+                    CATALOG_CHANNEL,
+                    lambda _conn, _pid, _channel, payload: self.handle(payload),
+                )
+                self.cache.set_active(True)
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=self.ping_interval)
+                    except asyncio.TimeoutError:
+                        # A silently dropped connection would also drop
+                        # notifications; a ping surfaces it.
+                        await asyncio.wait_for(
+                            connection.execute("SELECT 1"), timeout=self.ping_interval
+                        )
+                logger.warning("Catalog change listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Catalog change listener failed: %s", exc)
+            finally:
+                self.cache.set_active(False)
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            self._reconnects += 1
+            await asyncio.sleep(self.retry_interval)
+
+
+def listener_dsn(database_url: str) -> str:
+    """Plain ``postgresql://`` DSN for asyncpg from the SQLAlchemy URL."""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+catalog_cache = CatalogCache()
+catalog_listener = CatalogChangeListener(catalog_cache, listener_dsn(settings.database_url))
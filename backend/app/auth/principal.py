@@ -0,0 +1,79 @@
+"""Authenticated principals cached between requests.
+
+``get_current_user`` used to load the ``users`` row on every authenticated
+request. The fields it actually needs (id, role, active flag) are kept in a
+short-lived in-process cache keyed by ``(user_id, iat)``, so a new token
+always gets one fresh lookup. ``invalidate_principal`` must be called when
+a user is deactivated or changes role; other app instances see the change
+within ``PRINCIPAL_CACHE_TTL`` seconds.
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from ..config import settings
+from ..models.user import User
+from ..utils.lru_cache import TTLCache
+from . import rbac
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    role: rbac.Role
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> Principal:
+        return cls(id=user.id, role=rbac.resolve_role(user), is_active=user.is_active)
+
+
+class PrincipalCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int = settings.principal_cache_size,
+        ttl: float = settings.principal_cache_ttl,
+    ) -> None:
+        self._entries = TTLCache(max_entries=max_entries, ttl=ttl)
+        # Bumped per user on invalidation; entries stored under an older
+        # generation are ignored, whatever token they were cached for.
+        self._generations: dict[uuid.UUID, int] = {}
+
+    def get(self, user_id: uuid.UUID, issued_at: Any) -> Principal | None:
+        entry = self._entries.get((user_id, issued_at))
+        if entry is None:
+            return None
+        principal, generation = entry
+        if generation != self._generations.get(user_id, 0):
+            self._entries.discard((user_id, issued_at))
+            return None
+        return principal
+
+    def generation(self, user_id: uuid.UUID) -> int:
+        """Read before loading the user and pass to ``set``, so a load that
+        overlapped an invalidation is not served afterwards."""
+        return self._generations.get(user_id, 0)
+
+    def set(self, issued_at: Any, principal: Principal, generation: int) -> None:
+        self._entries.set((principal.id, issued_at), (principal, generation))
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._entries.stats(), "invalidated_users": len(self._generations)}
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    """Forget cached principals of ``user_id`` (deactivation, role change)."""
+    principal_cache.invalidate(user_id)
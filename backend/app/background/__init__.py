@@ -1,5 +1,32 @@
-from .runner import Job, JobRunner, JobStatus
+from app.config import settings
 
-default_job_runner = JobRunner()
+from .registry import register_job_handler
+from .runner import Job, JobPriority, JobRunner, JobStatus
 
-__all__ = ["Job", "JobRunner", "JobStatus", "default_job_runner"]
+_memory_runner = JobRunner(
+    workers=settings.job_runner_workers,
+    status_ttl=settings.job_status_ttl,
+    status_max_entries=settings.job_status_max_entries,
+)
+
+if settings.job_queue_backend == "postgres":
+    from .durable import DurableJobQueue
+
+    default_job_runner: JobRunner | DurableJobQueue = DurableJobQueue(
+        fallback=_memory_runner,
+        workers=settings.job_runner_workers,
+        batch_size=settings.job_queue_batch_size,
+        poll_interval=settings.job_queue_poll_interval,
+        visibility_timeout=settings.job_queue_visibility_timeout,
+    )
+else:
+    default_job_runner = _memory_runner
+
+__all__ = [
+    "Job",
+    "JobPriority",
+    "JobRunner",
+    "JobStatus",
+    "default_job_runner",
+    "register_job_handler",
+]
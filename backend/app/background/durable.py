@@ -0,0 +1,259 @@
+"""Postgres-backed job queue (``JOB_QUEUE_BACKEND=postgres``).
+
+Jobs that carry a registered ``kind`` and a JSON ``payload`` are written to the
+``background_jobs`` table instead of the in-process queue, so they survive
+restarts and deploys. Every app instance runs a few pollers that claim
+batches of runnable rows with ``FOR UPDATE SKIP LOCKED``; successful jobs are
+deleted, failed ones are rescheduled with linear backoff until
+``max_attempts`` and then kept with status ``failed``.
+
+Delivery is at-least-once: a job whose worker dies mid-run is reclaimed after
+``visibility_timeout`` seconds, so handlers must be idempotent. Jobs without a
+``kind`` (closures that cannot be persisted) go to the in-memory fallback
+runner.
+
+Jobs with a ``coalesce_key`` keep at most one queued row per key (a unique
+partial index; a new enqueue overwrites the queued payload, latest wins), and
+pollers only claim the oldest pending job of a key while none of its jobs is
+running, so jobs for one key never run concurrently or out of order.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.background_job import (
+    claim_jobs,
+    complete_job,
+    fail_job,
+    has_pending_job,
+    insert_job,
+    release_jobs,
+    reschedule_job,
+    upsert_coalesced_job,
+)
+from app.database import AsyncSessionLocal
+from app.utils.metrics import Histogram
+
+from .registry import get_job_handler
+from .runner import Job, JobRunner, JobStatus
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+class DurableJobQueue:
+    def __init__(
+        self,
+        *,
+        fallback: JobRunner,
+        session_factory: SessionFactory = AsyncSessionLocal,
+        workers: int = 1,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 300.0,
+        worker_id: str | None = None,
+    ) -> None:
+        self.fallback = fallback
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._session_factory = session_factory
+        self._tasks: list[asyncio.Task[None]] = []
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+        self._claimed: set[uuid.UUID] = set()
+        self._logger = logging.getLogger("kitsu.jobs.durable")
+        self._counters = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "claimed": 0,
+            "succeeded": 0,
+            "retried": 0,
+            "failed": 0,
+            "released": 0,
+            "finish_failures": 0,
+        }
+        self._run_time = Histogram()
+
+    def status_for(self, key: str) -> JobStatus | None:
+        # Persisted jobs are tracked in the table, not in process memory.
+        return self.fallback.status_for(key)
+
+    async def enqueue(self, job: Job) -> Job:
+        if job.kind is None or job.payload is None:
+            return await self.fallback.enqueue(job)
+
+        async with self._session_factory() as session:
+            try:
+                if job.coalesce_key is not None:
+                    coalesced = await upsert_coalesced_job(
+                        session,
+                        job.coalesce_key,
+                        kind=job.kind,
+                        key=job.key,
+                        payload=job.payload,
+                        priority=int(job.priority),
+                        max_attempts=job.max_attempts,
+                        backoff_seconds=job.backoff_seconds,
+                    )
+                    self._counters["coalesced" if coalesced else "enqueued"] += 1
+                elif not await has_pending_job(session, job.key):
+                    await insert_job(
+                        session,
+                        kind=job.kind,
+                        key=job.key,
+                        payload=job.payload,
+                        priority=int(job.priority),
+                        coalesce_key=job.coalesce_key,
+                        max_attempts=job.max_attempts,
+                        backoff_seconds=job.backoff_seconds,
+                    )
+                    self._counters["enqueued"] += 1
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def drain(self) -> None:
+        await self.fallback.drain()
+
+    def start(self) -> None:
+        self.fallback.start()
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._poll()))
+
+    async def stop(self, drain_timeout: float = 0.0) -> None:
+        """Stop claiming, let running jobs finish until the deadline, then cancel.
+
+        Claimed jobs that never started are handed back to the queue; a job
+        cancelled mid-run is reclaimed once its lease expires.
+        """
+        deadline = time.monotonic() + drain_timeout
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        tasks, self._tasks = self._tasks, []
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=drain_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._claimed:
+            claimed, self._claimed = list(self._claimed), set()
+            try:
+                await self._finish(release_jobs, claimed)
+                self._counters["released"] += len(claimed)
+            except Exception:  # noqa: BLE001
+                self._logger.exception("Failed to release %s claimed jobs", len(claimed))
+        await self.fallback.stop(max(deadline - time.monotonic(), 0.0))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "postgres",
+            "worker_id": self.worker_id,
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            **self._counters,
+            "run_seconds": self._run_time.snapshot(),
+            "memory": self.fallback.stats(),
+        }
+
+    async def _poll(self) -> None:
+        while not self._stopping:
+            try:
+                rows = await self._claim()
+            except Exception:  # noqa: BLE001
+                self._logger.exception("Failed to claim background jobs")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if not rows:
+                await self._wait_for_work()
+                continue
+            for row in rows:
+                if self._stopping:
+                    break
+                try:
+                    await self._execute(row)
+                except Exception:  # noqa: BLE001
+                    # The row stays "running" until its lease expires and is
+                    # claimed again; the poller must keep going meanwhile.
+                    self._counters["finish_failures"] += 1
+                    self._logger.exception("Failed to record outcome of job %s", row.key)
+
+    async def _wait_for_work(self) -> None:
+        assert self._wakeup is not None
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _claim(self) -> list[Any]:
+        async with self._session_factory() as session:
+            try:
+                rows = await claim_jobs(
+                    session, self.worker_id, self.batch_size, self.visibility_timeout
+                )
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        self._claimed.update(row.id for row in rows)
+        self._counters["claimed"] += len(rows)
+        return rows
+
+    async def _execute(self, row: Any) -> None:
+        self._claimed.discard(row.id)
+        handler = get_job_handler(row.kind)
+        started = time.monotonic()
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {row.kind!r}")
+            await handler(row.payload)
+        except Exception as exc:  # noqa: BLE001
+            error = repr(exc)[:2000]
+            self._logger.error(
+                "Job failed (key=%s attempt=%s/%s)",
+                row.key,
+                row.attempts,
+                row.max_attempts,
+                exc_info=exc,
+            )
+            if handler is not None and row.attempts < row.max_attempts:
+                await self._finish(
+                    reschedule_job, row.id, row.backoff_seconds * row.attempts, error
+                )
+                self._counters["retried"] += 1
+            else:
+                await self._finish(fail_job, row.id, error)
+                self._counters["failed"] += 1
+        else:
+            await self._finish(complete_job, row.id)
+            self._counters["succeeded"] += 1
+        finally:
+            self._run_time.observe(time.monotonic() - started)
+
+    async def _finish(self, operation: Callable[..., Any], *args: Any) -> None:
+        async with self._session_factory() as session:
+            try:
+                await operation(session, *args)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
@@ -0,0 +1,19 @@
+from typing import Any, Awaitable, Callable
+
+PayloadHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+_handlers: dict[str, PayloadHandler] = {}
+
+
+def register_job_handler(kind: str, handler: PayloadHandler) -> PayloadHandler:
+    """Register the handler that runs persisted jobs of ``kind``.
+
+    Durable jobs are stored as ``(kind, JSON payload)`` and resolved through
+    this registry when a worker (possibly in another process) claims them.
+    """
+    _handlers[kind] = handler
+    return handler
+
+
+def get_job_handler(kind: str) -> PayloadHandler | None:
+    return _handlers.get(kind)
@@ -1,18 +1,26 @@
 import asyncio
+import itertools
 import logging
+import time
+from collections import Counter
 from contextlib import suppress
-from dataclasses import dataclass
-from enum import Enum
-from typing import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable
+
+from app.utils.metrics import Histogram
+
+from .status_store import JobStatus, JobStatusStore
 
 JobHandler = Callable[[], Awaitable[None]]
 
 
-class JobStatus(str, Enum):
-    QUEUED = "queued"
-    RUNNING = "running"
-    SUCCEEDED = "succeeded"
-    FAILED = "failed"
+class JobPriority(IntEnum):
+    """Lower values run first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
 
 
 @dataclass
@@ -22,15 +30,51 @@ class Job:
     max_attempts: int = 3
     backoff_seconds: float = 1.0
     attempts: int = 0
+    priority: JobPriority = JobPriority.NORMAL
+    # Jobs sharing a coalesce key are "latest wins": a job that is still
+    # waiting is replaced by a newer one, and jobs with the same coalesce key
+    # never run concurrently.
+    coalesce_key: str | None = None
+    # Registered job kind and JSON payload; required for the durable queue.
+    kind: str | None = None
+    payload: dict[str, Any] | None = None
+
+
+@dataclass(order=True)
+class _QueueEntry:
+    priority: int
+    seq: int
+    job: Job = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    keys: list[str] = field(compare=False)
+    superseded: bool = field(default=False, compare=False)
 
 
 class JobRunner:
-    def __init__(self) -> None:
-        self._queue: asyncio.Queue[Job] = asyncio.Queue()
-        self._task: asyncio.Task[None] | None = None
-        self._statuses: dict[str, JobStatus] = {}
+    def __init__(
+        self,
+        workers: int = 1,
+        *,
+        status_ttl: float = 3600.0,
+        status_max_entries: int = 100_000,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("JobRunner needs at least one worker")
+        self.workers = workers
+        self._queue: asyncio.PriorityQueue[_QueueEntry] = asyncio.PriorityQueue()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._statuses = JobStatusStore(max_entries=status_max_entries, ttl=status_ttl)
         self._lock = asyncio.Lock()
         self._logger = logging.getLogger("kitsu.jobs")
+        self._seq = itertools.count()
+        self._pending: dict[str, _QueueEntry] = {}
+        self._deferred: dict[str, _QueueEntry] = {}
+        self._active_coalesce_keys: set[str] = set()
+        self._queued_by_priority: Counter[JobPriority] = Counter()
+        self._running = 0
+        self._coalesced = 0
+        self._queue_wait = Histogram()
+        self._run_time = Histogram()
 
     def status_for(self, key: str) -> JobStatus | None:
         return self._statuses.get(key)
@@ -38,41 +82,129 @@ class JobRunner:
     async def enqueue(self, job: Job) -> Job:
         async with self._lock:
             status = self._statuses.get(job.key)
+            # Queued/running jobs and jobs that finished within the status
+            # TTL are not enqueued again.
             if status in {JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.SUCCEEDED}:
                 return job
 
-            self._statuses[job.key] = JobStatus.QUEUED
-            await self._queue.put(job)
-            await self._ensure_worker()
+            entry = _QueueEntry(
+                priority=int(job.priority),
+                seq=next(self._seq),
+                job=job,
+                enqueued_at=time.monotonic(),
+                keys=[job.key],
+            )
+            coalesce_key = job.coalesce_key
+            if coalesce_key is not None:
+                previous = self._pending.get(coalesce_key)
+                if previous is not None:
+                    # The newer job carries the superseded keys so their
+                    # status follows the write that actually happens.
+                    previous.superseded = True
+                    self._queued_by_priority[previous.job.priority] -= 1
+                    entry.keys = previous.keys + entry.keys
+                    entry.enqueued_at = previous.enqueued_at
+                    self._coalesced += 1
+                self._pending[coalesce_key] = entry
+
+            self._set_status(entry.keys, JobStatus.QUEUED)
+            self._queued_by_priority[job.priority] += 1
+            if coalesce_key is not None and coalesce_key in self._active_coalesce_keys:
+                self._deferred[coalesce_key] = entry
+            else:
+                self._queue.put_nowait(entry)
+            self._ensure_workers()
 
         return job
 
     async def drain(self) -> None:
         await self._queue.join()
 
-    async def stop(self) -> None:
-        if self._task is None:
-            return
-        self._task.cancel()
-        with suppress(asyncio.CancelledError):
-            await self._task
-        self._task = None
+    def start(self) -> None:
+        self._ensure_workers()
 
-    async def _ensure_worker(self) -> None:
-        if self._task is None or self._task.done():
-            self._task = asyncio.create_task(self._worker())
+    async def stop(self, drain_timeout: float = 0.0) -> None:
+        if drain_timeout > 0 and self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                self._logger.warning(
+                    "Stopping with %s queued jobs after %.1fs drain",
+                    sum(self._queued_by_priority.values()),
+                    drain_timeout,
+                )
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": sum(self._queued_by_priority.values()),
+            "queued_by_priority": {
+                priority.name.lower(): self._queued_by_priority[priority]
+                for priority in JobPriority
+            },
+            "running": self._running,
+            "coalesced": self._coalesced,
+            "queue_wait_seconds": self._queue_wait.snapshot(),
+            "run_seconds": self._run_time.snapshot(),
+            "statuses": self._statuses.stats(),
+        }
+
+    def _ensure_workers(self) -> None:
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
 
     async def _worker(self) -> None:
         try:
             while True:
-                job = await self._queue.get()
-                await self._run_job(job)
-                self._queue.task_done()
+                entry = await self._queue.get()
+                try:
+                    await self._process(entry)
+                finally:
+                    self._queue.task_done()
         except asyncio.CancelledError:
             return
 
-    async def _run_job(self, job: Job) -> None:
-        self._statuses[job.key] = JobStatus.RUNNING
+    async def _process(self, entry: _QueueEntry) -> None:
+        if entry.superseded:
+            return
+        job = entry.job
+        coalesce_key = job.coalesce_key
+        if coalesce_key is not None:
+            if coalesce_key in self._active_coalesce_keys:
+                self._deferred[coalesce_key] = entry
+                return
+            if self._pending.get(coalesce_key) is entry:
+                del self._pending[coalesce_key]
+            self._active_coalesce_keys.add(coalesce_key)
+
+        self._queued_by_priority[job.priority] -= 1
+        self._queue_wait.observe(time.monotonic() - entry.enqueued_at)
+        self._running += 1
+        started = time.monotonic()
+        try:
+            await self._run_job(job, entry.keys)
+        finally:
+            self._running -= 1
+            self._run_time.observe(time.monotonic() - started)
+            if coalesce_key is not None:
+                self._active_coalesce_keys.discard(coalesce_key)
+                deferred = self._deferred.pop(coalesce_key, None)
+                if deferred is not None:
+                    self._queue.put_nowait(deferred)
+
+    def _set_status(self, keys: list[str], status: JobStatus) -> None:
+        for key in keys:
+            self._statuses.set(key, status)
+
+    async def _run_job(self, job: Job, keys: list[str]) -> None:
+        self._set_status(keys, JobStatus.RUNNING)
         while job.attempts < job.max_attempts:
             try:
                 await job.handler()
@@ -86,7 +218,7 @@ class JobRunner:
                     exc_info=exc,
                 )
                 if job.attempts >= job.max_attempts:
-                    self._statuses[job.key] = JobStatus.FAILED
+                    self._set_status(keys, JobStatus.FAILED)
                     return
                 delay = min(
                     job.backoff_seconds * job.attempts,
@@ -94,5 +226,5 @@ class JobRunner:
                 )
                 await asyncio.sleep(delay)
             else:
-                self._statuses[job.key] = JobStatus.SUCCEEDED
+                self._set_status(keys, JobStatus.SUCCEEDED)
                 return
@@ -0,0 +1,139 @@
+import hashlib
+import time
+from array import array
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+_STATUS_CODES = {status: code for code, status in enumerate(JobStatus, start=1)}
+_STATUSES = {code: status for status, code in _STATUS_CODES.items()}
+_FINISHED = {JobStatus.SUCCEEDED, JobStatus.FAILED}
+
+
+_EMPTY = 0
+
+
+def _digest(key: str) -> int:
+    # Job keys embed user/anime ids and progress values (100+ characters);
+    # a 64-bit digest is all the store needs to answer "seen recently?".
+    value = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest())
+    return value or 1
+
+
+class JobStatusStore:
+    """Bounded job status tracking.
+
+    Queued and running jobs are kept until they finish, so in-flight dedup is
+    exact. Finished jobs go into a fixed-size ring ordered by completion time:
+    they are forgotten after ``ttl`` seconds or when ``max_entries`` newer
+    completions push them out, whichever comes first. Keys are stored as
+    64-bit digests and the ring keeps digests, status codes and completion
+    times in flat arrays.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 100_000,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._in_flight: dict[int, int] = {}
+        self._index: dict[int, int] = {}
+        self._ring_keys = array("Q", bytes(8 * max_entries))
+        self._ring_codes = bytearray(max_entries)
+        self._ring_times = array("d", bytes(8 * max_entries))
+        self._head = 0
+        self._tail = 0
+        self._filled = 0
+        self._evicted = 0
+        self._expired = 0
+
+    def get(self, key: str) -> JobStatus | None:
+        digest = _digest(key)
+        code = self._in_flight.get(digest)
+        if code is not None:
+            return _STATUSES[code]
+        slot = self._index.get(digest)
+        if slot is None:
+            return None
+        if self._clock() - self._ring_times[slot] >= self.ttl:
+            return None
+        return _STATUSES[self._ring_codes[slot]]
+
+    def set(self, key: str, status: JobStatus) -> None:
+        digest = _digest(key)
+        if status not in _FINISHED:
+            self._forget_finished(digest)
+            self._in_flight[digest] = _STATUS_CODES[status]
+            return
+
+        self._in_flight.pop(digest, None)
+        self._forget_finished(digest)
+        now = self._clock()
+        self._expire(now)
+        if self._filled == self.max_entries:
+            if self._ring_keys[self._tail] != _EMPTY:
+                self._evicted += 1
+            self._drop_tail()
+        slot = self._head
+        self._ring_keys[slot] = digest
+        self._ring_codes[slot] = _STATUS_CODES[status]
+        self._ring_times[slot] = now
+        self._index[digest] = slot
+        self._head = (slot + 1) % self.max_entries
+        self._filled += 1
+
+    def __len__(self) -> int:
+        return len(self._in_flight) + len(self._index)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "finished": len(self._index),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "evicted": self._evicted,
+            "expired": self._expired,
+        }
+
+    def _forget_finished(self, digest: int) -> None:
+        # Leave a tombstone in the ring; the slot is reclaimed when the tail
+        # passes over it.
+        slot = self._index.pop(digest, None)
+        if slot is None:
+            return
+        self._ring_keys[slot] = _EMPTY
+        if slot == (self._head - 1) % self.max_entries:
+            self._head = slot
+            self._filled -= 1
+
+    def _expire(self, now: float) -> None:
+        while self._filled and (
+            self._ring_keys[self._tail] == _EMPTY
+            or now - self._ring_times[self._tail] >= self.ttl
+        ):
+            if self._ring_keys[self._tail] != _EMPTY:
+                self._expired += 1
+            self._drop_tail()
+
+    def _drop_tail(self) -> None:
+        digest = self._ring_keys[self._tail]
+        if digest != _EMPTY:
+            del self._index[digest]
+            self._ring_keys[self._tail] = _EMPTY
+        self._tail = (self._tail + 1) % self.max_entries
+        self._filled -= 1
@@ -0,0 +1,140 @@
+"""Write-behind buffer for high-frequency "latest value wins" writes.
+
+Rows are kept in memory by key (a newer row replaces the pending one) and
+handed to a flush callback in batches every ``interval`` seconds, or sooner
+once ``max_batch`` rows are pending. Rows of a failed flush are put back
+unless a newer row for the same key arrived meanwhile. ``stop()`` lets a
+flush in progress finish, then flushes whatever is still pending.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.utils.metrics import Histogram
+
+FlushCallback = Callable[[list[dict[str, Any]]], Awaitable[None]]
+
+
+class WriteBehindBuffer:
+    def __init__(
+        self,
+        flush: FlushCallback,
+        *,
+        interval: float = 2.0,
+        max_batch: int = 500,
+        name: str = "write-behind",
+    ) -> None:
+        if max_batch <= 0:
+            raise ValueError("max_batch must be greater than 0")
+        self.interval = interval
+        self.max_batch = max_batch
+        self.name = name
+        self._flush_callback = flush
+        self._pending: dict[Hashable, dict[str, Any]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+        self._lock = asyncio.Lock()
+        self._logger = logging.getLogger(f"kitsu.{name}")
+        self._counters = {
+            "added": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "flush_failures": 0,
+            "requeued": 0,
+        }
+        self._flush_time = Histogram()
+
+    def add(self, key: Hashable, row: dict[str, Any]) -> None:
+        if key in self._pending:
+            self._counters["coalesced"] += 1
+        self._pending[key] = row
+        self._counters["added"] += 1
+        if len(self._pending) >= self.max_batch and self._wakeup is not None:
+            self._wakeup.set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Cancelling mid-flush would lose the rows already taken out of
+            # ``_pending``; wake the loop and let it return between flushes.
+            self._stopping = True
+            assert self._wakeup is not None
+            self._wakeup.set()
+            try:
+                await self._task
+            finally:
+                self._task = None
+                self._stopping = False
+        try:
+            await self.flush()
+        except Exception:  # noqa: BLE001
+            self._logger.exception("Dropping %s rows on shutdown", len(self._pending))
+
+    async def flush(self) -> int:
+        """Write every pending row in batches of ``max_batch``; return rows written."""
+        async with self._lock:
+            items, self._pending = list(self._pending.items()), {}
+            written = 0
+            for start in range(0, len(items), self.max_batch):
+                chunk = items[start : start + self.max_batch]
+                started = time.monotonic()
+                try:
+                    await self._flush_callback([row for _, row in chunk])
+                except BaseException:
+                    # Cancellation too: the rows are no longer in ``_pending``.
+                    self._counters["flush_failures"] += 1
+                    self._requeue(items[start:])
+                    raise
+                finally:
+                    self._flush_time.observe(time.monotonic() - started)
+                self._counters["flushes"] += 1
+                self._counters["rows_written"] += len(chunk)
+                written += len(chunk)
+            return written
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "interval_seconds": self.interval,
+            "max_batch": self.max_batch,
+            **self._counters,
+            "flush_seconds": self._flush_time.snapshot(),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    def _requeue(self, items: list[tuple[Hashable, dict[str, Any]]]) -> None:
+        for key, row in items:
+            if key not in self._pending:
+                self._pending[key] = row
+                self._counters["requeued"] += 1
+
+    async def _flush_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            if not self._pending:
+                continue
+            try:
+                await self.flush()
+            except Exception:  # noqa: BLE001
+                self._logger.exception(
+                    "Flush failed; %s rows will be retried", len(self._pending)
+                )
@@ -9,6 +9,15 @@ from pydantic import BaseModel, Field
 load_dotenv()
 
 
+def _read_bool(name: str, default: bool) -> bool:
+    raw_value = os.getenv(name, str(default)).strip().lower()
+    if raw_value in {"1", "true", "yes", "on"}:
+        return True
+    if raw_value in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError(f"{name} must be a boolean value")
+
+
 class Settings(BaseModel):
     app_name: str = Field(default="Kitsu Backend")
     debug: bool = Field(default=False)
@@ -22,6 +31,48 @@ class Settings(BaseModel):
     access_token_expire_minutes: int = Field(default=30)
     refresh_token_expire_days: int = Field(default=14)
     algorithm: str = Field(default="HS256")
+    upstream_timeout: float = Field(default=10.0)
+    upstream_max_connections: int = Field(default=100)
+    upstream_max_keepalive_connections: int = Field(default=20)
+    upstream_keepalive_expiry: float = Field(default=30.0)
+    upstream_max_connections_per_host: int = Field(default=20)
+    upstream_http2: bool = Field(default=True)
+    upstream_breaker_failure_threshold: int = Field(default=5)
+    upstream_breaker_recovery_timeout: float = Field(default=30.0)
+    upstream_latency_target: float = Field(default=2.0)
+    upstream_queue_timeout: float = Field(default=1.0)
+    proxy_cache_max_bytes: int = Field(default=64 * 1024 * 1024)
+    parse_executor_mode: str = Field(default="process")
+    parse_executor_workers: int = Field(default=2)
+    parse_executor_max_pending: int = Field(default=64)
+    parse_executor_queue_timeout: float = Field(default=2.0)
+    import_concurrency: int = Field(default=8)
+    schedule_refresh_interval: float = Field(default=600.0)
+    job_runner_workers: int = Field(default=4)
+    job_status_ttl: float = Field(default=3600.0)
+    job_status_max_entries: int = Field(default=100_000)
+    job_queue_backend: str = Field(default="memory")
+    job_queue_batch_size: int = Field(default=10)
+    job_queue_poll_interval: float = Field(default=1.0)
+    job_queue_visibility_timeout: float = Field(default=300.0)
+    job_drain_timeout: float = Field(default=10.0)
+    watch_progress_flush_interval: float = Field(default=2.0)
+    watch_progress_flush_max_rows: int = Field(default=500)
+    anime_existence_cache_ttl: float = Field(default=600.0)
+    anime_existence_cache_size: int = Field(default=50_000)
+    catalog_cache_max_bytes: int = Field(default=16 * 1024 * 1024)
+    anime_suggest_refresh_interval: float = Field(default=300.0)
+    search_suggest_index_max_entries: int = Field(default=50_000)
+    principal_cache_ttl: float = Field(default=30.0)
+    principal_cache_size: int = Field(default=10_000)
+    password_hash_workers: int = Field(default=2)
+    password_hash_max_pending: int = Field(default=16)
+    password_hash_queue_timeout: float = Field(default=2.0)
+    password_legacy_fallback: bool = Field(default=True)
+    auth_rate_limit_backend: str = Field(default="memory")
+    auth_rate_limit_max_keys: int = Field(default=100_000)
+    auth_rate_limit_sweep_interval: float = Field(default=60.0)
+    access_token_cache_size: int = Field(default=10_000)
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -93,15 +144,340 @@ class Settings(BaseModel):
         if db_pool_recycle <= 0:
             raise ValueError("DB_POOL_RECYCLE must be greater than 0")
 
-        raw_db_pool_pre_ping = os.getenv(
-            "DB_POOL_PRE_PING", str(cls.model_fields["db_pool_pre_ping"].default)
+        db_pool_pre_ping = _read_bool(
+            "DB_POOL_PRE_PING", cls.model_fields["db_pool_pre_ping"].default
+        )
+
+        upstream_timeout = float(
+            os.getenv("UPSTREAM_TIMEOUT", cls.model_fields["upstream_timeout"].default)
+        )
+        if upstream_timeout <= 0:
+            raise ValueError("UPSTREAM_TIMEOUT must be greater than 0")
+
+        upstream_max_connections = int(
+            os.getenv(
+                "UPSTREAM_MAX_CONNECTIONS",
+                cls.model_fields["upstream_max_connections"].default,
+            )
+        )
+        if upstream_max_connections <= 0:
+            raise ValueError("UPSTREAM_MAX_CONNECTIONS must be greater than 0")
+
+        upstream_max_keepalive_connections = int(
+            os.getenv(
+                "UPSTREAM_MAX_KEEPALIVE_CONNECTIONS",
+                cls.model_fields["upstream_max_keepalive_connections"].default,
+            )
+        )
+        if upstream_max_keepalive_connections < 0:
+            raise ValueError(
+                "UPSTREAM_MAX_KEEPALIVE_CONNECTIONS must be greater than or equal to 0"
+            )
+
+        upstream_keepalive_expiry = float(
+            os.getenv(
+                "UPSTREAM_KEEPALIVE_EXPIRY",
+                cls.model_fields["upstream_keepalive_expiry"].default,
+            )
+        )
+        if upstream_keepalive_expiry <= 0:
+            raise ValueError("UPSTREAM_KEEPALIVE_EXPIRY must be greater than 0")
+
+        upstream_max_connections_per_host = int(
+            os.getenv(
+                "UPSTREAM_MAX_CONNECTIONS_PER_HOST",
+                cls.model_fields["upstream_max_connections_per_host"].default,
+            )
+        )
+        if upstream_max_connections_per_host <= 0:
+            raise ValueError("UPSTREAM_MAX_CONNECTIONS_PER_HOST must be greater than 0")
+
+        upstream_http2 = _read_bool(
+            "UPSTREAM_HTTP2", cls.model_fields["upstream_http2"].default
+        )
+
+        upstream_breaker_failure_threshold = int(
+            os.getenv(
+                "UPSTREAM_BREAKER_FAILURE_THRESHOLD",
+                cls.model_fields["upstream_breaker_failure_threshold"].default,
+            )
+        )
+        if upstream_breaker_failure_threshold <= 0:
+            raise ValueError("UPSTREAM_BREAKER_FAILURE_THRESHOLD must be greater than 0")
+
+        upstream_breaker_recovery_timeout = float(
+            os.getenv(
+                "UPSTREAM_BREAKER_RECOVERY_TIMEOUT",
+                cls.model_fields["upstream_breaker_recovery_timeout"].default,
+            )
+        )
+        if upstream_breaker_recovery_timeout <= 0:
+            raise ValueError("UPSTREAM_BREAKER_RECOVERY_TIMEOUT must be greater than 0")
+
+        upstream_latency_target = float(
+            os.getenv(
+                "UPSTREAM_LATENCY_TARGET",
+                cls.model_fields["upstream_latency_target"].default,
+            )
+        )
+        if upstream_latency_target <= 0:
+            raise ValueError("UPSTREAM_LATENCY_TARGET must be greater than 0")
+
+        upstream_queue_timeout = float(
+            os.getenv(
+                "UPSTREAM_QUEUE_TIMEOUT",
+                cls.model_fields["upstream_queue_timeout"].default,
+            )
+        )
+        if upstream_queue_timeout < 0:
+            raise ValueError("UPSTREAM_QUEUE_TIMEOUT must be greater than or equal to 0")
+
+        proxy_cache_max_bytes = int(
+            os.getenv(
+                "PROXY_CACHE_MAX_BYTES",
+                cls.model_fields["proxy_cache_max_bytes"].default,
+            )
+        )
+        if proxy_cache_max_bytes <= 0:
+            raise ValueError("PROXY_CACHE_MAX_BYTES must be greater than 0")
+
+        parse_executor_mode = os.getenv(
+            "PARSE_EXECUTOR_MODE", cls.model_fields["parse_executor_mode"].default
         ).strip().lower()
-        if raw_db_pool_pre_ping in {"1", "true", "yes", "on"}:
-            db_pool_pre_ping = True
-        elif raw_db_pool_pre_ping in {"0", "false", "no", "off"}:
-            db_pool_pre_ping = False
-        else:
-            raise ValueError("DB_POOL_PRE_PING must be a boolean value")
+        if parse_executor_mode not in {"process", "thread", "inline"}:
+            raise ValueError("PARSE_EXECUTOR_MODE must be one of process, thread, inline")
+
+        parse_executor_workers = int(
+            os.getenv(
+                "PARSE_EXECUTOR_WORKERS",
+                cls.model_fields["parse_executor_workers"].default,
+            )
+        )
+        if parse_executor_workers <= 0:
+            raise ValueError("PARSE_EXECUTOR_WORKERS must be greater than 0")
+
+        parse_executor_max_pending = int(
+            os.getenv(
+                "PARSE_EXECUTOR_MAX_PENDING",
+                cls.model_fields["parse_executor_max_pending"].default,
+            )
+        )
+        if parse_executor_max_pending <= 0:
+            raise ValueError("PARSE_EXECUTOR_MAX_PENDING must be greater than 0")
+
+        parse_executor_queue_timeout = float(
+            os.getenv(
+                "PARSE_EXECUTOR_QUEUE_TIMEOUT",
+                cls.model_fields["parse_executor_queue_timeout"].default,
+            )
+        )
+        if parse_executor_queue_timeout < 0:
+            raise ValueError("PARSE_EXECUTOR_QUEUE_TIMEOUT must be greater than or equal to 0")
+        import_concurrency = int(
+            os.getenv(
+                "IMPORT_CONCURRENCY",
+                cls.model_fields["import_concurrency"].default,
+            )
+        )
+        if import_concurrency <= 0:
+            raise ValueError("IMPORT_CONCURRENCY must be greater than 0")
+        schedule_refresh_interval = float(
+            os.getenv(
+                "SCHEDULE_REFRESH_INTERVAL",
+                cls.model_fields["schedule_refresh_interval"].default,
+            )
+        )
+        if schedule_refresh_interval <= 0:
+            raise ValueError("SCHEDULE_REFRESH_INTERVAL must be greater than 0")
+        job_runner_workers = int(
+            os.getenv(
+                "JOB_RUNNER_WORKERS",
+                cls.model_fields["job_runner_workers"].default,
+            )
+        )
+        if job_runner_workers <= 0:
+            raise ValueError("JOB_RUNNER_WORKERS must be greater than 0")
+        job_status_ttl = float(
+            os.getenv(
+                "JOB_STATUS_TTL",
+                cls.model_fields["job_status_ttl"].default,
+            )
+        )
+        if job_status_ttl <= 0:
+            raise ValueError("JOB_STATUS_TTL must be greater than 0")
+        job_status_max_entries = int(
+            os.getenv(
+                "JOB_STATUS_MAX_ENTRIES",
+                cls.model_fields["job_status_max_entries"].default,
+            )
+        )
+        if job_status_max_entries <= 0:
+            raise ValueError("JOB_STATUS_MAX_ENTRIES must be greater than 0")
+        job_queue_backend = os.getenv(
+            "JOB_QUEUE_BACKEND", cls.model_fields["job_queue_backend"].default
+        ).strip().lower()
+        if job_queue_backend not in {"memory", "postgres"}:
+            raise ValueError("JOB_QUEUE_BACKEND must be one of: memory, postgres")
+        job_queue_batch_size = int(
+            os.getenv(
+                "JOB_QUEUE_BATCH_SIZE",
+                cls.model_fields["job_queue_batch_size"].default,
+            )
+        )
+        if job_queue_batch_size <= 0:
+            raise ValueError("JOB_QUEUE_BATCH_SIZE must be greater than 0")
+        job_queue_poll_interval = float(
+            os.getenv(
+                "JOB_QUEUE_POLL_INTERVAL",
+                cls.model_fields["job_queue_poll_interval"].default,
+            )
+        )
+        if job_queue_poll_interval <= 0:
+            raise ValueError("JOB_QUEUE_POLL_INTERVAL must be greater than 0")
+        job_queue_visibility_timeout = float(
+            os.getenv(
+                "JOB_QUEUE_VISIBILITY_TIMEOUT",
+                cls.model_fields["job_queue_visibility_timeout"].default,
+            )
+        )
+        if job_queue_visibility_timeout <= 0:
+            raise ValueError("JOB_QUEUE_VISIBILITY_TIMEOUT must be greater than 0")
+        job_drain_timeout = float(
+            os.getenv(
+                "JOB_DRAIN_TIMEOUT",
+                cls.model_fields["job_drain_timeout"].default,
+            )
+        )
+        if job_drain_timeout < 0:
+            raise ValueError("JOB_DRAIN_TIMEOUT must be greater than or equal to 0")
+        watch_progress_flush_interval = float(
+            os.getenv(
+                "WATCH_PROGRESS_FLUSH_INTERVAL",
+                cls.model_fields["watch_progress_flush_interval"].default,
+            )
+        )
+        if watch_progress_flush_interval <= 0:
+            raise ValueError("WATCH_PROGRESS_FLUSH_INTERVAL must be greater than 0")
+        watch_progress_flush_max_rows = int(
+            os.getenv(
+                "WATCH_PROGRESS_FLUSH_MAX_ROWS",
+                cls.model_fields["watch_progress_flush_max_rows"].default,
+            )
+        )
+        if watch_progress_flush_max_rows <= 0:
+            raise ValueError("WATCH_PROGRESS_FLUSH_MAX_ROWS must be greater than 0")
+        anime_existence_cache_ttl = float(
+            os.getenv(
+                "ANIME_EXISTENCE_CACHE_TTL",
+                cls.model_fields["anime_existence_cache_ttl"].default,
+            )
+        )
+        if anime_existence_cache_ttl < 0:
+            raise ValueError("ANIME_EXISTENCE_CACHE_TTL must be greater than or equal to 0")
+        anime_existence_cache_size = int(
+            os.getenv(
+                "ANIME_EXISTENCE_CACHE_SIZE",
+                cls.model_fields["anime_existence_cache_size"].default,
+            )
+        )
+        if anime_existence_cache_size <= 0:
+            raise ValueError("ANIME_EXISTENCE_CACHE_SIZE must be greater than 0")
+        catalog_cache_max_bytes = int(
+            os.getenv(
+                "CATALOG_CACHE_MAX_BYTES",
+                cls.model_fields["catalog_cache_max_bytes"].default,
+            )
+        )
+        if catalog_cache_max_bytes < 0:
+            raise ValueError("CATALOG_CACHE_MAX_BYTES must be greater than or equal to 0")
+        anime_suggest_refresh_interval = float(
+            os.getenv(
+                "ANIME_SUGGEST_REFRESH_INTERVAL",
+                cls.model_fields["anime_suggest_refresh_interval"].default,
+            )
+        )
+        if anime_suggest_refresh_interval <= 0:
+            raise ValueError("ANIME_SUGGEST_REFRESH_INTERVAL must be greater than 0")
+        search_suggest_index_max_entries = int(
+            os.getenv(
+                "SEARCH_SUGGEST_INDEX_MAX_ENTRIES",
+                cls.model_fields["search_suggest_index_max_entries"].default,
+            )
+        )
+        if search_suggest_index_max_entries <= 0:
+            raise ValueError("SEARCH_SUGGEST_INDEX_MAX_ENTRIES must be greater than 0")
+        principal_cache_ttl = float(
+            os.getenv(
+                "PRINCIPAL_CACHE_TTL",
+                cls.model_fields["principal_cache_ttl"].default,
+            )
+        )
+        if principal_cache_ttl < 0:
+            raise ValueError("PRINCIPAL_CACHE_TTL must be greater than or equal to 0")
+        principal_cache_size = int(
+            os.getenv(
+                "PRINCIPAL_CACHE_SIZE",
+                cls.model_fields["principal_cache_size"].default,
+            )
+        )
+        if principal_cache_size <= 0:
+            raise ValueError("PRINCIPAL_CACHE_SIZE must be greater than 0")
+        password_hash_workers = int(
+            os.getenv(
+                "PASSWORD_HASH_WORKERS",
+                cls.model_fields["password_hash_workers"].default,
+            )
+        )
+        if password_hash_workers <= 0:
+            raise ValueError("PASSWORD_HASH_WORKERS must be greater than 0")
+        password_hash_max_pending = int(
+            os.getenv(
+                "PASSWORD_HASH_MAX_PENDING",
+                cls.model_fields["password_hash_max_pending"].default,
+            )
+        )
+        if password_hash_max_pending <= 0:
+            raise ValueError("PASSWORD_HASH_MAX_PENDING must be greater than 0")
+        password_hash_queue_timeout = float(
+            os.getenv(
+                "PASSWORD_HASH_QUEUE_TIMEOUT",
+                cls.model_fields["password_hash_queue_timeout"].default,
+            )
+        )
+        if password_hash_queue_timeout < 0:
+            raise ValueError("PASSWORD_HASH_QUEUE_TIMEOUT must be greater than or equal to 0")
+        password_legacy_fallback = _read_bool(
+            "PASSWORD_LEGACY_FALLBACK", cls.model_fields["password_legacy_fallback"].default
+        )
+        auth_rate_limit_backend = os.getenv(
+            "AUTH_RATE_LIMIT_BACKEND", cls.model_fields["auth_rate_limit_backend"].default
+        ).strip().lower()
+        if auth_rate_limit_backend not in {"memory", "postgres"}:
+            raise ValueError("AUTH_RATE_LIMIT_BACKEND must be one of: memory, postgres")
+        auth_rate_limit_max_keys = int(
+            os.getenv(
+                "AUTH_RATE_LIMIT_MAX_KEYS",
+                cls.model_fields["auth_rate_limit_max_keys"].default,
+            )
+        )
+        if auth_rate_limit_max_keys <= 0:
+            raise ValueError("AUTH_RATE_LIMIT_MAX_KEYS must be greater than 0")
+        auth_rate_limit_sweep_interval = float(
+            os.getenv(
+                "AUTH_RATE_LIMIT_SWEEP_INTERVAL",
+                cls.model_fields["auth_rate_limit_sweep_interval"].default,
+            )
+        )
+        if auth_rate_limit_sweep_interval <= 0:
+            raise ValueError("AUTH_RATE_LIMIT_SWEEP_INTERVAL must be greater than 0")
+        access_token_cache_size = int(
+            os.getenv(
+                "ACCESS_TOKEN_CACHE_SIZE",
+                cls.model_fields["access_token_cache_size"].default,
+            )
+        )
+        if access_token_cache_size <= 0:
+            raise ValueError("ACCESS_TOKEN_CACHE_SIZE must be greater than 0")
 
         return cls(
             app_name=os.getenv("APP_NAME", cls.model_fields["app_name"].default),
@@ -126,6 +502,48 @@ class Settings(BaseModel):
             db_max_overflow=db_max_overflow,
             db_pool_recycle=db_pool_recycle,
             db_pool_pre_ping=db_pool_pre_ping,
+            upstream_timeout=upstream_timeout,
+            upstream_max_connections=upstream_max_connections,
+            upstream_max_keepalive_connections=upstream_max_keepalive_connections,
+            upstream_keepalive_expiry=upstream_keepalive_expiry,
+            upstream_max_connections_per_host=upstream_max_connections_per_host,
+            upstream_http2=upstream_http2,
+            upstream_breaker_failure_threshold=upstream_breaker_failure_threshold,
+            upstream_breaker_recovery_timeout=upstream_breaker_recovery_timeout,
+            upstream_latency_target=upstream_latency_target,
+            upstream_queue_timeout=upstream_queue_timeout,
+            proxy_cache_max_bytes=proxy_cache_max_bytes,
+            parse_executor_mode=parse_executor_mode,
+            parse_executor_workers=parse_executor_workers,
+            parse_executor_max_pending=parse_executor_max_pending,
+            parse_executor_queue_timeout=parse_executor_queue_timeout,
+            import_concurrency=import_concurrency,
+            schedule_refresh_interval=schedule_refresh_interval,
+            job_runner_workers=job_runner_workers,
+            job_status_ttl=job_status_ttl,
+            job_status_max_entries=job_status_max_entries,
+            job_queue_backend=job_queue_backend,
+            job_queue_batch_size=job_queue_batch_size,
+            job_queue_poll_interval=job_queue_poll_interval,
+            job_queue_visibility_timeout=job_queue_visibility_timeout,
+            job_drain_timeout=job_drain_timeout,
+            watch_progress_flush_interval=watch_progress_flush_interval,
+            watch_progress_flush_max_rows=watch_progress_flush_max_rows,
+            anime_existence_cache_ttl=anime_existence_cache_ttl,
+            anime_existence_cache_size=anime_existence_cache_size,
+            catalog_cache_max_bytes=catalog_cache_max_bytes,
+            anime_suggest_refresh_interval=anime_suggest_refresh_interval,
+            search_suggest_index_max_entries=search_suggest_index_max_entries,
+            principal_cache_ttl=principal_cache_ttl,
+            principal_cache_size=principal_cache_size,
+            password_hash_workers=password_hash_workers,
+            password_hash_max_pending=password_hash_max_pending,
+            password_hash_queue_timeout=password_hash_queue_timeout,
+            password_legacy_fallback=password_legacy_fallback,
+            auth_rate_limit_backend=auth_rate_limit_backend,
+            auth_rate_limit_max_keys=auth_rate_limit_max_keys,
+            auth_rate_limit_sweep_interval=auth_rate_limit_sweep_interval,
+            access_token_cache_size=access_token_cache_size,
         )
 
 
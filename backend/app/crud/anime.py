@@ -1,19 +1,38 @@
 import uuid
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Float, Row, case, cast, func, literal, literal_column, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
+from ..config import settings
 from ..models.anime import Anime
+from ..utils.lru_cache import TTLCache
+from ..utils.pagination import apply_keyset
+
+# Anime rows are effectively never deleted, so a positive lookup can be reused
+# for a while. Unknown ids are not cached: an anime inserted by an import must
+# become visible right away.
+anime_existence_cache = TTLCache(
+    max_entries=settings.anime_existence_cache_size,
+    ttl=settings.anime_existence_cache_ttl,
+)
 
 
 async def get_anime_list(
-    session: AsyncSession, limit: int, offset: int
+    session: AsyncSession,
+    limit: int,
+    offset: int = 0,
+    after: tuple[Any, ...] | None = None,
 ) -> list[Anime]:
-    stmt = (
-        select(Anime)
-        .order_by(Anime.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+    """Newest first; ``after`` is a ``(created_at, id)`` key from the previous page."""
+    stmt = apply_keyset(
+        select(Anime),
+        (Anime.created_at, Anime.id),
+        limit=limit,
+        offset=offset,
+        after=after,
+        descending=True,
     )
     result = await session.execute(stmt)
     return list(result.scalars().all())
@@ -23,14 +42,98 @@ async def get_anime_by_id(session: AsyncSession, anime_id: uuid.UUID) -> Anime |
     return await session.get(Anime, anime_id)
 
 
-async def search_anime(db: AsyncSession, query: str, limit: int, offset: int) -> list[Anime]:
-    pattern = f"%{query}%"
+async def anime_exists(session: AsyncSession, anime_id: uuid.UUID) -> bool:
+    """Primary-key probe for the anime, answered from the cache when possible."""
+    if anime_existence_cache.get(anime_id):
+        return True
+    result = await session.execute(select(Anime.id).where(Anime.id == anime_id))
+    exists = result.first() is not None
+    if exists:
+        anime_existence_cache.set(anime_id, True)
+    return exists
+
+
+def forget_anime(anime_id: uuid.UUID) -> None:
+    """Drop a cached existence answer, e.g. after a foreign-key violation."""
+    anime_existence_cache.discard(anime_id)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Rendered literally: the planner only matches the ix_anime_search_tsv
+# expression index (migration 0012) against constants, not bound parameters.
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+SEARCH_DOCUMENT = literal_column(
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(anime.title, '') || ' ' || coalesce(anime.title_original, ''))"
+)
+
+
+def search_score(query: str) -> ColumnElement[float]:
+    """Relevance of a row for ``query``: trigram word similarity against either
+    title, full-text rank, and a bonus for titles starting with the query."""
+    title_original = func.coalesce(Anime.title_original, literal_column("''"))
+    similarity = func.greatest(
+        func.word_similarity(query, Anime.title),
+        func.word_similarity(query, title_original),
+    )
+    rank = func.ts_rank(SEARCH_DOCUMENT, func.plainto_tsquery(SEARCH_CONFIG, query))
+    prefix_bonus = case(
+        (Anime.title.ilike(_escape_like(query) + "%", escape="\\"), 0.5), else_=0.0
+    )
+    return cast(similarity + rank + prefix_bonus, Float)
+
+
+async def search_anime(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    offset: int = 0,
+    after: tuple[Any, ...] | None = None,
+) -> list[Row[tuple[Anime, float]]]:
+    """Relevance-ranked search over ``title`` and ``title_original``.
+
+    Rows match on a substring, on a full-text term, or on trigram word
+    similarity (typos) and come back as ``(Anime, score)`` ordered by score;
+    ``after`` is a ``(score, id)`` key from the previous page.
+    """
+    query = query.strip()
+    pattern = f"%{_escape_like(query)}%"
+    score = search_score(query)
+    matches = or_(
+        Anime.title.ilike(pattern, escape="\\"),
+        Anime.title_original.ilike(pattern, escape="\\"),
+        SEARCH_DOCUMENT.op("@@")(func.plainto_tsquery(SEARCH_CONFIG, query)),
+        literal(query).op("<%")(Anime.title),
+        literal(query).op("<%")(Anime.title_original),
+    )
+    stmt = apply_keyset(
+        select(Anime, score.label("score")).where(matches),
+        (score, Anime.id),
+        limit=limit,
+        offset=offset,
+        after=after,
+        descending=True,
+    )
+    result = await db.execute(stmt)
+    return list(result.all())
+
+
+async def suggest_anime(db: AsyncSession, query: str, limit: int) -> list[Anime]:
+    """Titles starting with ``query``; used while the in-memory index is not loaded."""
+    pattern = f"{_escape_like(query.strip())}%"
     stmt = (
         select(Anime)
-        .where(Anime.title.ilike(pattern))
-        .order_by(Anime.title.asc())
+        .where(
+            or_(
+                Anime.title.ilike(pattern, escape="\\"),
+                Anime.title_original.ilike(pattern, escape="\\"),
+            )
+        )
+        .order_by(Anime.title, Anime.id)
         .limit(limit)
-        .offset(offset)
     )
     result = await db.execute(stmt)
     return list(result.scalars().all())
@@ -0,0 +1,62 @@
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.auth_rate_limit import AuthRateLimit
+
+
+async def get_rate_limit_counts(
+    session: AsyncSession, key: str
+) -> tuple[int, int, int] | None:
+    """``(window_index, current_count, previous_count)`` of ``key``."""
+    stmt = select(
+        AuthRateLimit.window_index,
+        AuthRateLimit.current_count,
+        AuthRateLimit.previous_count,
+    ).where(AuthRateLimit.key == key)
+    result = await session.execute(stmt)
+    row = result.first()
+    return None if row is None else (row[0], row[1], row[2])
+
+
+async def increment_rate_limit(session: AsyncSession, key: str, window_index: int) -> None:
+    """Count one attempt in ``window_index``, rolling the stored windows forward.
+
+    A single upsert, so concurrent workers never lose an increment. The row
+    never moves back to an older window (clock skew between instances).
+    """
+    same_window = AuthRateLimit.window_index >= window_index
+    stmt = (
+        insert(AuthRateLimit)
+        .values(key=key, window_index=window_index, current_count=1, previous_count=0)
+        .on_conflict_do_update(
+            index_elements=[AuthRateLimit.key],
+            set_={
+                "previous_count": case(
+                    (same_window, AuthRateLimit.previous_count),
+                    (
+                        AuthRateLimit.window_index == window_index - 1,
+                        AuthRateLimit.current_count,
+                    ),
+                    else_=0,
+                ),
+                "current_count": case(
+                    (same_window, AuthRateLimit.current_count + 1), else_=1
+                ),
+                "window_index": func.greatest(AuthRateLimit.window_index, window_index),
+                "updated_at": func.now(),
+            },
+        )
+    )
+    await session.execute(stmt)
+
+
+async def delete_rate_limit(session: AsyncSession, key: str) -> None:
+    await session.execute(delete(AuthRateLimit).where(AuthRateLimit.key == key))
+
+
+async def delete_stale_rate_limits(session: AsyncSession, before_window: int) -> int:
+    result = await session.execute(
+        delete(AuthRateLimit).where(AuthRateLimit.window_index < before_window)
+    )
+    return result.rowcount or 0
@@ -0,0 +1,262 @@
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import (
+    and_,
+    delete,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from ..models.background_job import BackgroundJob
+
+QUEUED = "queued"
+RUNNING = "running"
+FAILED = "failed"
+
+
+async def upsert_coalesced_job(
+    session: AsyncSession,
+    coalesce_key: str,
+    *,
+    kind: str,
+    key: str,
+    payload: dict[str, Any],
+    priority: int,
+    max_attempts: int,
+    backoff_seconds: float,
+) -> bool:
+    """Queue the job, or overwrite the still-queued job with the same coalesce
+    key (latest wins). Returns whether an existing job was overwritten.
+
+    One ``INSERT ... ON CONFLICT`` on the unique ``(coalesce_key) WHERE
+    status = 'queued'`` index, so concurrent enqueues never leave two queued
+    jobs for one key.
+    """
+    stmt = insert(BackgroundJob).values(
+        id=uuid.uuid4(),
+        kind=kind,
+        key=key,
+        coalesce_key=coalesce_key,
+        payload=payload,
+        priority=priority,
+        status=QUEUED,
+        attempts=0,
+        max_attempts=max_attempts,
+        backoff_seconds=backoff_seconds,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BackgroundJob.coalesce_key],
+        # Literal, so Postgres can match it to the partial index predicate.
+        index_where=text("status = 'queued'"),
+        set_={
+            "kind": stmt.excluded.kind,
+            "key": stmt.excluded.key,
+            "payload": stmt.excluded.payload,
+            "priority": func.least(BackgroundJob.priority, stmt.excluded.priority),
+            "max_attempts": stmt.excluded.max_attempts,
+            "backoff_seconds": stmt.excluded.backoff_seconds,
+            # A new payload starts over: no inherited backoff or spent attempts.
+            "attempts": 0,
+            "run_after": func.least(BackgroundJob.run_after, func.now()),
+            "last_error": None,
+            "updated_at": func.now(),
+        },
+    ).returning(literal_column("xmax <> 0").label("coalesced"))
+    result = await session.execute(stmt)
+    return bool(result.scalar())
+
+
+async def has_pending_job(session: AsyncSession, key: str) -> bool:
+    stmt = select(
+        exists().where(
+            BackgroundJob.key == key, BackgroundJob.status.in_((QUEUED, RUNNING))
+        )
+    )
+    result = await session.execute(stmt)
+    return bool(result.scalar())
+
+
+async def insert_job(
+    session: AsyncSession,
+    *,
+    kind: str,
+    key: str,
+    payload: dict[str, Any],
+    priority: int,
+    coalesce_key: str | None,
+    max_attempts: int,
+    backoff_seconds: float,
+) -> BackgroundJob:
+    job = BackgroundJob(
+        id=uuid.uuid4(),
+        kind=kind,
+        key=key,
+        coalesce_key=coalesce_key,
+        payload=payload,
+        priority=priority,
+        status=QUEUED,
+        attempts=0,
+        max_attempts=max_attempts,
+        backoff_seconds=backoff_seconds,
+    )
+    session.add(job)
+    await session.flush()
+    return job
+
+
+def build_claim_statement(worker_id: str, batch_size: int, visibility_timeout: float):
+    """``UPDATE ... RETURNING`` that claims up to ``batch_size`` runnable jobs.
+
+    Rows are picked with ``FOR UPDATE SKIP LOCKED`` so concurrent workers in
+    other processes never claim the same job. Jobs whose worker died are
+    reclaimed after ``visibility_timeout`` seconds. Only the oldest pending
+    job of a coalesce key is claimable, and not while another job with the
+    key is running, so jobs for one key run one at a time and in order even
+    when several instances claim at once.
+    """
+    lease_expired = func.now() - timedelta(seconds=visibility_timeout)
+    running = aliased(BackgroundJob)
+    older = aliased(BackgroundJob)
+    candidates = (
+        select(BackgroundJob.id)
+        .where(
+            or_(
+                and_(
+                    BackgroundJob.status == QUEUED,
+                    BackgroundJob.run_after <= func.now(),
+                ),
+                and_(
+                    BackgroundJob.status == RUNNING,
+                    BackgroundJob.locked_at < lease_expired,
+                ),
+            ),
+            ~exists().where(
+                running.coalesce_key == BackgroundJob.coalesce_key,
+                running.id != BackgroundJob.id,
+                running.status == RUNNING,
+                running.locked_at >= lease_expired,
+            ),
+            ~exists().where(
+                older.coalesce_key == BackgroundJob.coalesce_key,
+                older.status.in_((QUEUED, RUNNING)),
+                tuple_(older.created_at, older.id)
+                < tuple_(BackgroundJob.created_at, BackgroundJob.id),
+            ),
+        )
+        .order_by(
+            BackgroundJob.priority, BackgroundJob.run_after, BackgroundJob.created_at
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(BackgroundJob)
+        .where(BackgroundJob.id.in_(candidates.scalar_subquery()))
+        .values(
+            status=RUNNING,
+            locked_by=worker_id,
+            locked_at=func.now(),
+            attempts=BackgroundJob.attempts + 1,
+            updated_at=func.now(),
+        )
+        .returning(
+            BackgroundJob.id,
+            BackgroundJob.kind,
+            BackgroundJob.key,
+            BackgroundJob.payload,
+            BackgroundJob.attempts,
+            BackgroundJob.max_attempts,
+            BackgroundJob.backoff_seconds,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def claim_jobs(
+    session: AsyncSession, worker_id: str, batch_size: int, visibility_timeout: float
+) -> list[Any]:
+    result = await session.execute(
+        build_claim_statement(worker_id, batch_size, visibility_timeout)
+    )
+    return list(result.all())
+
+
+async def complete_job(session: AsyncSession, job_id: uuid.UUID) -> None:
+    await session.execute(delete(BackgroundJob).where(BackgroundJob.id == job_id))
+
+
+def _superseded() -> Any:
+    """A newer job with the same coalesce key is already queued."""
+    queued = aliased(BackgroundJob)
+    return exists().where(
+        queued.coalesce_key == BackgroundJob.coalesce_key,
+        queued.id != BackgroundJob.id,
+        queued.status == QUEUED,
+    )
+
+
+async def reschedule_job(
+    session: AsyncSession, job_id: uuid.UUID, delay_seconds: float, error: str
+) -> None:
+    # Requeueing next to a newer job of the same key would break the unique
+    # index; the newer payload wins, so the retry is dropped instead.
+    await session.execute(
+        delete(BackgroundJob).where(BackgroundJob.id == job_id, _superseded())
+    )
+    await session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id)
+        .values(
+            status=QUEUED,
+            run_after=func.now() + timedelta(seconds=delay_seconds),
+            locked_by=None,
+            locked_at=None,
+            last_error=error,
+            updated_at=func.now(),
+        )
+    )
+
+
+async def fail_job(session: AsyncSession, job_id: uuid.UUID, error: str) -> None:
+    await session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id)
+        .values(
+            status=FAILED,
+            locked_by=None,
+            locked_at=None,
+            last_error=error,
+            updated_at=func.now(),
+        )
+    )
+
+
+async def release_jobs(session: AsyncSession, job_ids: list[uuid.UUID]) -> None:
+    """Put claimed jobs that were never started back into the queue."""
+    if not job_ids:
+        return
+    await session.execute(
+        delete(BackgroundJob).where(BackgroundJob.id.in_(job_ids), _superseded())
+    )
+    await session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id.in_(job_ids), BackgroundJob.status == RUNNING)
+        .values(
+            status=QUEUED,
+            attempts=BackgroundJob.attempts - 1,
+            locked_by=None,
+            locked_at=None,
+            updated_at=func.now(),
+        )
+    )
@@ -1,10 +1,13 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.favorite import Favorite
+from ..utils.pagination import apply_keyset
 
 
 async def get_favorite(
@@ -17,6 +20,39 @@ async def get_favorite(
     return result.scalar_one_or_none()
 
 
+async def favorite_exists(
+    session: AsyncSession, user_id: uuid.UUID, anime_id: uuid.UUID
+) -> bool:
+    stmt = select(Favorite.id).where(
+        Favorite.user_id == user_id, Favorite.anime_id == anime_id
+    )
+    result = await session.execute(stmt)
+    return result.first() is not None
+
+
+async def insert_favorite(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    anime_id: uuid.UUID,
+    favorite_id: uuid.UUID,
+    created_at: datetime,
+) -> bool:
+    """Insert the favorite unless it exists; return whether a row was added."""
+    stmt = (
+        insert(Favorite)
+        .values(
+            id=favorite_id,
+            user_id=user_id,
+            anime_id=anime_id,
+            created_at=created_at,
+        )
+        .on_conflict_do_nothing(index_elements=[Favorite.user_id, Favorite.anime_id])
+        .returning(Favorite.id)
+    )
+    result = await session.execute(stmt)
+    return result.first() is not None
+
+
 async def add_favorite(
     session: AsyncSession,
     user_id: uuid.UUID,
@@ -39,24 +75,27 @@ async def add_favorite(
 async def remove_favorite(
     session: AsyncSession, user_id: uuid.UUID, anime_id: uuid.UUID
 ) -> bool:
-    favorite = await get_favorite(session, user_id, anime_id)
-    if favorite is None:
-        return False
-
-    session.delete(favorite)
-    await session.flush()
-    return True
+    stmt = delete(Favorite).where(
+        Favorite.user_id == user_id, Favorite.anime_id == anime_id
+    )
+    result = await session.execute(stmt)
+    return result.rowcount > 0
 
 
 async def list_favorites(
-    session: AsyncSession, user_id: uuid.UUID, limit: int, offset: int
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    limit: int,
+    offset: int = 0,
+    after: tuple[Any, ...] | None = None,
 ) -> list[Favorite]:
-    stmt = (
-        select(Favorite)
-        .where(Favorite.user_id == user_id)
-        .order_by(Favorite.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+    stmt = apply_keyset(
+        select(Favorite).where(Favorite.user_id == user_id),
+        (Favorite.created_at, Favorite.id),
+        limit=limit,
+        offset=offset,
+        after=after,
+        descending=True,
     )
     result = await session.execute(stmt)
     return list(result.scalars().all())
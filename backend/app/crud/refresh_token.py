@@ -1,7 +1,8 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.refresh_token import RefreshToken
@@ -9,27 +10,48 @@ from ..models.refresh_token import RefreshToken
 
 async def create_or_rotate_refresh_token(
     session: AsyncSession, user_id: uuid.UUID, token_hash: str, expires_at: datetime
-) -> RefreshToken:
-    result = await session.execute(
-        select(RefreshToken).where(RefreshToken.user_id == user_id)
-    )
-    existing = result.scalars().first()
-    if existing:
-        existing.token_hash = token_hash
-        existing.expires_at = expires_at
-        existing.revoked = False
-        await session.flush()
-        return existing
-
-    refresh_token = RefreshToken(
+) -> None:
+    """Store the user's single refresh token, replacing any previous one."""
+    stmt = insert(RefreshToken).values(
+        id=uuid.uuid4(),
         user_id=user_id,
         token_hash=token_hash,
         expires_at=expires_at,
         revoked=False,
     )
-    session.add(refresh_token)
-    await session.flush()
-    return refresh_token
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RefreshToken.user_id],
+        set_={
+            "token_hash": stmt.excluded.token_hash,
+            "expires_at": stmt.excluded.expires_at,
+            "revoked": False,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def rotate_refresh_token(
+    session: AsyncSession, token_hash: str, new_token_hash: str, expires_at: datetime
+) -> uuid.UUID | None:
+    """Swap a live refresh token for a new one in a single statement.
+
+    Returns the owner, or ``None`` when ``token_hash`` is unknown, revoked or
+    expired. Concurrent refreshes with the same token serialize on the row
+    lock and only the first one matches.
+    """
+    stmt = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > func.now(),
+        )
+        .values(token_hash=new_token_hash, expires_at=expires_at)
+        .returning(RefreshToken.user_id)
+    )
+    result = await session.execute(stmt)
+    row = result.first()
+    return None if row is None else row[0]
 
 
 async def get_refresh_token_by_hash(
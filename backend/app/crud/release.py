@@ -1,19 +1,26 @@
 import uuid
+from typing import Any
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.release import Release
+from ..utils.pagination import apply_keyset
 
 
 async def get_releases(
-    session: AsyncSession, limit: int, offset: int
+    session: AsyncSession,
+    limit: int,
+    offset: int = 0,
+    after: tuple[Any, ...] | None = None,
 ) -> list[Release]:
-    stmt = (
-        select(Release)
-        .order_by(Release.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+    stmt = apply_keyset(
+        select(Release),
+        (Release.created_at, Release.id),
+        limit=limit,
+        offset=offset,
+        after=after,
+        descending=True,
     )
     result = await session.execute(stmt)
     return list(result.scalars().all())
@@ -1,7 +1,9 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.watch_progress import WatchProgress
@@ -17,6 +19,17 @@ async def get_watch_progress(
     return result.scalar_one_or_none()
 
 
+async def get_watch_progress_identity(
+    session: AsyncSession, user_id: uuid.UUID, anime_id: uuid.UUID
+) -> tuple[uuid.UUID, datetime] | None:
+    """Return ``(id, created_at)`` of the user's progress row for the anime."""
+    stmt = select(WatchProgress.id, WatchProgress.created_at).where(
+        WatchProgress.user_id == user_id, WatchProgress.anime_id == anime_id
+    )
+    row = (await session.execute(stmt)).first()
+    return (row.id, row.created_at) if row is not None else None
+
+
 async def create_watch_progress(
     session: AsyncSession,
     user_id: uuid.UUID,
@@ -62,6 +75,32 @@ async def update_watch_progress(
     return progress
 
 
+async def upsert_watch_progress_batch(
+    session: AsyncSession, rows: list[dict[str, Any]]
+) -> None:
+    """Insert or update many rows with one ``INSERT ... ON CONFLICT`` statement.
+
+    Rows must have distinct ``(user_id, anime_id)`` pairs. An existing row keeps
+    its ``id`` and ``created_at`` and is only overwritten by a newer
+    ``last_watched_at``.
+    """
+    if not rows:
+        return
+    stmt = insert(WatchProgress).values(rows)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WatchProgress.user_id, WatchProgress.anime_id],
+        set_={
+            "episode": excluded.episode,
+            "position_seconds": excluded.position_seconds,
+            "progress_percent": excluded.progress_percent,
+            "last_watched_at": excluded.last_watched_at,
+        },
+        where=WatchProgress.last_watched_at <= excluded.last_watched_at,
+    )
+    await session.execute(stmt)
+
+
 async def list_watch_progress(
     session: AsyncSession, user_id: uuid.UUID, limit: int
 ) -> list[WatchProgress]:
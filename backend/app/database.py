@@ -1,25 +1,60 @@
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from .config import settings
+from .utils.db_metrics import InstrumentedPool, instrument_pool
 
 
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    poolclass=InstrumentedPool,
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
     pool_recycle=settings.db_pool_recycle,
     pool_pre_ping=settings.db_pool_pre_ping,
 )
+instrument_pool(engine.sync_engine)
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
 
+
+class LazySession:
+    """Stands in for an ``AsyncSession`` that is only created on first use.
+
+    Requests that declare a session but never touch it (guests on optional
+    auth, cached reads, routes that only enqueue a job) create no session
+    at all; a created session still checks out a connection only for its
+    first statement.
+    """
+
+    def __init__(self, factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal) -> None:
+        self._factory = factory
+        self._session: AsyncSession | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        yield session
+    session = LazySession(AsyncSessionLocal)
+    try:
+        yield session  # type: ignore[misc]
+    finally:
+        await session.close()
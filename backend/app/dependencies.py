@@ -1,19 +1,25 @@
 import uuid
 from collections.abc import AsyncGenerator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .database import get_session
 from .auth import rbac
+from .auth.principal import Principal, principal_cache
 from .models.user import User
+from .utils.db_metrics import db_route
 from .security.token_inspection import ExpiredTokenError, InvalidTokenError, validate_access_token
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # Pool metrics are grouped by route template; every request runs in its
+    # own context, so the label does not leak into other requests.
+    route = request.scope.get("route")
+    db_route.set(f"{request.method} {getattr(route, 'path', 'unknown')}")
     async for session in get_session():
         yield session
 
@@ -21,7 +27,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
-):
+) -> Principal:
     if credentials is None or credentials.scheme.lower() != "bearer":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
@@ -54,25 +60,34 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
         ) from None
 
+    # A cache hit never touches ``db``, so the session checks out no connection.
+    issued_at = payload.get("iat")
+    principal = principal_cache.get(user_id, issued_at)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation(user_id)
     user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
 
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(issued_at, principal, generation)
+    return principal
 
 
 async def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User | None:
+) -> Principal | None:
     if credentials is None:
         return None
     return await get_current_user(credentials=credentials, db=db)
 
 
 async def get_current_role(
-    user: User | None = Depends(get_current_user_optional),
+    user: Principal | None = Depends(get_current_user_optional),
 ) -> rbac.Role:
     return rbac.resolve_role(user)
@@ -20,6 +20,7 @@ from sqlalchemy.exc import (
 from .background import default_job_runner
 from .config import settings
 from .database import engine
+from .security.password_hasher import password_hasher
 from .errors import (
     AppError,
     AuthError,
@@ -32,6 +33,12 @@ from .errors import (
     resolve_error_code,
 )
 from .api import router as api_router
+from .api.proxy.client import upstream_client
+from .api.proxy.executor import parse_executor
+from .api.proxy.schedule_snapshots import schedule_snapshots
+from .application.anime_suggest import anime_suggest_index
+from .application.auth_rate_limit import auth_rate_limiter
+from .application.catalog_cache import catalog_listener
 from .routers import (
     anime,
     auth,
@@ -41,7 +48,9 @@ from .routers import (
     search,
     watch,
 )
+from .use_cases.watch import watch_progress_buffer
 from .utils.health import check_database_connection
+from .utils.pagination import NEXT_CURSOR_HEADER
 from .utils.startup import run_optional_startup_tasks, run_required_startup_checks
 
 AVATAR_DIR = Path(__file__).resolve().parent.parent / "uploads" / "avatars"
@@ -77,10 +86,28 @@ async def lifespan(app: FastAPI):
 
     await run_required_startup_checks(engine)
     await run_optional_startup_tasks()
+    await upstream_client.start()
+    parse_executor.start()
+    password_hasher.start()
+    schedule_snapshots.start()
+    default_job_runner.start()
+    watch_progress_buffer.start()
+    catalog_listener.subscribe(anime_suggest_index.handle)
+    catalog_listener.start()
+    anime_suggest_index.start()
+    auth_rate_limiter.start()
 
     yield
 
-    await default_job_runner.stop()
+    await auth_rate_limiter.stop()
+    await anime_suggest_index.stop()
+    await catalog_listener.stop()
+    await schedule_snapshots.stop()
+    await watch_progress_buffer.stop()
+    await default_job_runner.stop(drain_timeout=settings.job_drain_timeout)
+    await upstream_client.close()
+    parse_executor.close()
+    password_hasher.close()
 
 
 app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
@@ -131,6 +158,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.add_middleware(OptionsPreflightMiddleware)
@@ -1,5 +1,7 @@
 from .base import Base
 from .anime import Anime
+from .auth_rate_limit import AuthRateLimit
+from .background_job import BackgroundJob
 from .episode import Episode
 from .favorite import Favorite
 from .release import Release
@@ -14,4 +16,6 @@ __all__ = [
     "Episode",
     "Favorite",
     "WatchProgress",
+    "BackgroundJob",
+    "AuthRateLimit",
 ]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy import DateTime, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,30 @@ from .base import Base
 
 class Anime(Base):
     __tablename__ = "anime"
+    __table_args__ = (
+        Index("ix_anime_created_at_id", "created_at", "id"),
+        # Search indexes (migration 0012), see crud.anime.search_anime.
+        Index(
+            "ix_anime_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_anime_title_original_trgm",
+            "title_original",
+            postgresql_using="gin",
+            postgresql_ops={"title_original": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_anime_search_tsv",
+            text(
+                "to_tsvector('simple'::regconfig, "
+                "coalesce(title, '') || ' ' || coalesce(title_original, ''))"
+            ),
+            postgresql_using="gin",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
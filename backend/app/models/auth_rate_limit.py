@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class AuthRateLimit(Base):
+    """Sliding-window counter of failed auth attempts, shared by all workers."""
+
+    __tablename__ = "auth_rate_limits"
+
+    key: Mapped[str] = mapped_column(String(160), primary_key=True)
+    window_index: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    current_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    previous_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,13 +1,12 @@
 from typing import Any
 
-from bs4 import BeautifulSoup
-
+from .backend import Document, ensure_document
 from .common import parse_sync_ids, safe_int
 
 
-def parse_anime_page(html: str, anime_id: str) -> dict[str, Any]:
-    ids = parse_sync_ids(html)
-    soup = BeautifulSoup(html, "html.parser")
+def parse_anime_page(html: str | Document, anime_id: str) -> dict[str, Any]:
+    soup = ensure_document(html)
+    ids = parse_sync_ids(soup)
     title_el = soup.select_one(".film-name.dynamic-name") or soup.select_one("title")
     poster_el = soup.select_one(".film-poster-img")
     description_el = soup.select_one(".film-description .text")
@@ -21,8 +20,8 @@ def parse_anime_page(html: str, anime_id: str) -> dict[str, Any]:
     }
 
 
-def parse_episodes_html(html: str) -> dict[str, Any]:
-    soup = BeautifulSoup(html, "html.parser")
+def parse_episodes_html(html: str | Document) -> dict[str, Any]:
+    soup = ensure_document(html)
     episodes = []
     for link in soup.select(".detail-infor-content .ss-list a"):
         episodes.append(
@@ -0,0 +1,60 @@
+"""HTML tree builder selection for the parser layer.
+
+Every parser builds its document through ``make_soup`` so the BeautifulSoup
+tree builder can be swapped in one place. ``lxml`` (libxml2, C) is the
+default; ``html.parser`` (pure Python) is kept as a fallback and is used
+automatically when lxml is not installed. Select explicitly with the
+``PARSER_BACKEND`` environment variable.
+
+Parsers accept either raw HTML or a ``Document`` returned by ``make_soup`` so
+callers that need several extractions from one page tokenize it only once.
+"""
+import logging
+import os
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger("kitsu.parser")
+
+LXML_BACKEND = "lxml"
+HTML_PARSER_BACKEND = "html.parser"
+PARSER_BACKENDS = (LXML_BACKEND, HTML_PARSER_BACKEND)
+DEFAULT_PARSER_BACKEND = LXML_BACKEND
+
+
+def lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_backend(name: str) -> str:
+    if name not in PARSER_BACKENDS:
+        raise ValueError(
+            f"PARSER_BACKEND must be one of {', '.join(PARSER_BACKENDS)}"
+        )
+    if name == LXML_BACKEND and not lxml_available():
+        logger.warning("lxml is not installed; falling back to %s", HTML_PARSER_BACKEND)
+        return HTML_PARSER_BACKEND
+    return name
+
+
+parser_backend = resolve_backend(
+    os.getenv("PARSER_BACKEND", DEFAULT_PARSER_BACKEND).strip().lower()
+)
+
+
+Document = BeautifulSoup
+
+
+def make_soup(html: str) -> Document:
+    return BeautifulSoup(html, parser_backend)
+
+
+def ensure_document(html: str | Document) -> Document:
+    """Reuse an already parsed document instead of tokenizing the page again."""
+    if isinstance(html, BeautifulSoup):
+        return html
+    return make_soup(html)
@@ -1,16 +1,44 @@
+import html as html_lib
 import json
+import re
 from typing import Optional
 
-from bs4 import BeautifulSoup
+from .backend import Document, ensure_document
 
+# Opening tag carrying id="syncData"; the lookbehind skips attributes such as
+# data-id="syncData".
+_SYNC_DATA_OPEN_RE = re.compile(
+    r"<([a-zA-Z][\w-]*)\b[^>]*?(?<![\w-])id\s*=\s*([\"']?)syncData\2(?=[\s/>])[^>]*>",
+    re.IGNORECASE,
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_RAW_TEXT_TAGS = {"script", "style"}
 
-def parse_sync_ids(html: str) -> dict[str, Optional[int]]:
-    soup = BeautifulSoup(html, "html.parser")
-    sync_el = soup.select_one("#syncData")
-    if not sync_el or not sync_el.text:
+
+def extract_sync_data_text(html: str) -> Optional[str]:
+    """Return the text of the ``#syncData`` element without building a DOM.
+
+    The page is scanned for the opening tag and its matching close tag only,
+    which is enough for the flat ``<script id="syncData">`` block upstream
+    pages embed.
+    """
+    match = _SYNC_DATA_OPEN_RE.search(html)
+    if match is None:
+        return None
+    tag = match.group(1).lower()
+    close_re = re.compile(rf"</{re.escape(tag)}\s*>", re.IGNORECASE)
+    close = close_re.search(html, match.end())
+    body = html[match.end() : close.start() if close else len(html)]
+    if tag in _RAW_TEXT_TAGS:
+        return body
+    return html_lib.unescape(_TAG_RE.sub("", body))
+
+
+def _sync_ids_from_text(text: Optional[str]) -> dict[str, Optional[int]]:
+    if not text:
         return {"anilistID": None, "malID": None}
     try:
-        data = json.loads(sync_el.text)
+        data = json.loads(text)
         return {
             "anilistID": data.get("anilist_id"),
             "malID": data.get("mal_id"),
@@ -19,6 +47,13 @@ def parse_sync_ids(html: str) -> dict[str, Optional[int]]:
         return {"anilistID": None, "malID": None}
 
 
+def parse_sync_ids(html: str | Document) -> dict[str, Optional[int]]:
+    if isinstance(html, str):
+        return _sync_ids_from_text(extract_sync_data_text(html))
+    sync_el = ensure_document(html).select_one("#syncData")
+    return _sync_ids_from_text(sync_el.text if sync_el else None)
+
+
 def safe_int(value: Optional[str]) -> Optional[int]:
     try:
         return int(value) if value is not None else None
@@ -1,14 +1,13 @@
 from typing import Any, Optional
 
-from bs4 import BeautifulSoup
-
+from .backend import Document, ensure_document
 from .common import parse_sync_ids, safe_int
 
 
 def parse_server_html(
-    html: str, category: str, preferred: Optional[str]
+    html: str | Document, category: str, preferred: Optional[str]
 ) -> tuple[Optional[int], dict[str, Any]]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = ensure_document(html)
     episode_no_el = soup.select_one(".server-notice strong")
     episode_text = episode_no_el.get_text(strip=True) if episode_no_el else ""
     parts = episode_text.split(" ") if episode_text else []
@@ -50,9 +49,13 @@ def parse_server_html(
 
 
 def build_sources_payload(
-    source_link: Optional[str], watch_page_html: str, referer: str
+    source_link: Optional[str],
+    watch_page_html: str | Document | None,
+    referer: str,
+    *,
+    sync_ids: Optional[dict[str, Optional[int]]] = None,
 ) -> dict[str, Any]:
-    ids = parse_sync_ids(watch_page_html)
+    ids = sync_ids if sync_ids is not None else parse_sync_ids(watch_page_html or "")
     return {
         "headers": {"Referer": referer},
         "tracks": [],
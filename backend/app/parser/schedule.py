@@ -1,17 +1,27 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-from bs4 import BeautifulSoup
-
+from .backend import Document, ensure_document
 from .common import safe_int
 
 
 def parse_schedule_html(
-    html: str, target_date: str, current_time: Optional[datetime] = None
+    html: str | Document,
+    target_date: str,
+    current_time: Optional[datetime] = None,
+    tz_offset: Optional[int] = None,
 ) -> dict[str, Any]:
-    soup = BeautifulSoup(html, "html.parser")
+    """Parse an upstream schedule list.
+
+    ``tz_offset`` is the ``tzOffset`` the list was requested with (minutes,
+    JavaScript ``getTimezoneOffset`` convention: UTC minus local time). When
+    given, airing times are interpreted in that zone; otherwise they are
+    treated as server-local times.
+    """
+    soup = ensure_document(html)
     items = []
-    now = current_time or datetime.now()
+    zone = timezone(-timedelta(minutes=tz_offset)) if tz_offset is not None else None
+    now = current_time or datetime.now(tz=zone)
     for el in soup.select("li"):
         time_el = el.select_one("a .time")
         anime_link = el.select_one("a")
@@ -24,6 +34,8 @@ def parse_schedule_html(
         if time_text:
             try:
                 airing_dt = datetime.fromisoformat(f"{target_date}T{time_text}:00")
+                if zone is not None:
+                    airing_dt = airing_dt.replace(tzinfo=zone)
                 airing_ts = int(airing_dt.timestamp() * 1000)
                 seconds_until = int(airing_dt.timestamp() - now.timestamp())
             except ValueError:
@@ -1,10 +1,10 @@
 from typing import Any
 
-from bs4 import BeautifulSoup
+from .backend import Document, ensure_document
 
 
-def parse_search_suggestions(html: str) -> dict[str, Any]:
-    soup = BeautifulSoup(html, "html.parser")
+def parse_search_suggestions(html: str | Document) -> dict[str, Any]:
+    soup = ensure_document(html)
     suggestions = []
     for item in soup.select(".nav-item"):
         link = item.get("href", "")
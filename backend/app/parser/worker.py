@@ -0,0 +1,20 @@
+"""Helpers executed inside parse executor workers.
+
+Kept free of application imports so spawned worker processes only load the
+parser package.
+"""
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+def timed_call(func: Callable[..., Any], args: tuple[Any, ...]) -> tuple[Any, float, float]:
+    """Run ``func`` and report when it started (wall clock) and how long it took."""
+    started_at = time.time()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, started_at, time.perf_counter() - start
+
+
+def warm_up() -> None:
+    from . import anime, episodes, schedule, search  # noqa: F401
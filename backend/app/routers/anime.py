@@ -1,29 +1,68 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..application.catalog_cache import (
+    ANIME_LIST_POLICY,
+    ANIME_POLICY,
+    CachedResponse,
+    catalog_cache,
+)
 from ..crud.anime import get_anime_by_id, get_anime_list
 from ..dependencies import get_db
 from ..schemas.anime import AnimeListItem, AnimeRead
+from ..utils.pagination import CREATED_AT_CURSOR, NEXT_CURSOR_HEADER
+from ..utils.responses import json_bytes_response
 
 router = APIRouter(prefix="/anime", tags=["anime"])
 
+_anime_list_adapter = TypeAdapter(list[AnimeListItem])
+
 
 @router.get("/", response_model=list[AnimeListItem])
 async def list_anime(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
-) -> list[AnimeListItem]:
-    return await get_anime_list(db, limit=limit, offset=offset)
+) -> Response:
+    after = CREATED_AT_CURSOR.parse(cursor, offset)
+
+    async def load() -> CachedResponse:
+        items = await get_anime_list(db, limit=limit, offset=offset, after=after)
+        body = _anime_list_adapter.dump_json(
+            _anime_list_adapter.validate_python(items, from_attributes=True)
+        )
+        next_cursor = CREATED_AT_CURSOR.next(items, limit)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return CachedResponse(body=body, headers=headers)
+
+    cached = await catalog_cache.get_or_load(
+        f"anime-list:{limit}:{offset}:{cursor or ''}",
+        load,
+        policy=ANIME_LIST_POLICY,
+        tags=("anime-list",),
+    )
+    return json_bytes_response(cached.body, headers=cached.headers)
 
 
 @router.get("/{anime_id}", response_model=AnimeRead)
-async def get_anime(anime_id: UUID, db: AsyncSession = Depends(get_db)) -> AnimeRead:
-    anime = await get_anime_by_id(db, anime_id)
-    if anime is None:
+async def get_anime(anime_id: UUID, db: AsyncSession = Depends(get_db)) -> Response:
+    async def load() -> CachedResponse | None:
+        anime = await get_anime_by_id(db, anime_id)
+        if anime is None:
+            return None
+        return CachedResponse(
+            AnimeRead.model_validate(anime).model_dump_json().encode("utf-8")
+        )
+
+    cached = await catalog_cache.get_or_load(
+        f"anime:{anime_id}", load, policy=ANIME_POLICY
+    )
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Anime not found"
         )
-    return anime
+    return json_bytes_response(cached.body)
@@ -1,24 +1,46 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..application.catalog_cache import EPISODES_POLICY, CachedResponse, catalog_cache
 from ..crud.episode import get_episodes_by_release
 from ..crud.release import get_release_by_id
 from ..dependencies import get_db
 from ..schemas.episode import EpisodeListItem
+from ..utils.responses import json_bytes_response
 
 router = APIRouter(prefix="/episodes", tags=["episodes"])
 
+_episode_list_adapter = TypeAdapter(list[EpisodeListItem])
+
 
 @router.get("/", response_model=list[EpisodeListItem])
 async def list_episodes(
     release_id: UUID = Query(...),
     db: AsyncSession = Depends(get_db),
-) -> list[EpisodeListItem]:
-    release = await get_release_by_id(db, release_id)
-    if release is None:
+) -> Response:
+    async def load() -> CachedResponse | None:
+        release = await get_release_by_id(db, release_id)
+        if release is None:
+            return None
+        episodes = await get_episodes_by_release(db, release_id)
+        return CachedResponse(
+            _episode_list_adapter.dump_json(
+                _episode_list_adapter.validate_python(episodes, from_attributes=True)
+            )
+        )
+
+    # Tagged with the release too, so deleting the release drops the list.
+    cached = await catalog_cache.get_or_load(
+        f"episodes:{release_id}",
+        load,
+        policy=EPISODES_POLICY,
+        tags=(f"release:{release_id}",),
+    )
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Release not found"
         )
-    return await get_episodes_by_release(db, release_id)
+    return json_bytes_response(cached.body)
@@ -1,12 +1,13 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth.enforcement_matrix import require_enforced_permission
+from ..auth.principal import Principal
 from ..dependencies import get_current_user, get_db
-from ..models.user import User
 from ..schemas.favorite import FavoriteCreate, FavoriteRead
+from ..utils.pagination import CREATED_AT_CURSOR, NEXT_CURSOR_HEADER
 from ..use_cases.favorites import (
     add_favorite as add_favorite_use_case,
     get_favorites as get_favorites_use_case,
@@ -18,21 +19,28 @@ router = APIRouter(prefix="/favorites", tags=["favorites"])
 
 @router.get("/", response_model=list[FavoriteRead])
 async def get_favorites(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> list[FavoriteRead]:
-    return await get_favorites_use_case(
-        db, user_id=current_user.id, limit=limit, offset=offset
+    after = CREATED_AT_CURSOR.parse(cursor, offset)
+    favorites = await get_favorites_use_case(
+        db, user_id=current_user.id, limit=limit, offset=offset, after=after
     )
+    next_cursor = CREATED_AT_CURSOR.next(favorites, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return favorites
 
 
 @router.post("/", response_model=FavoriteRead, status_code=status.HTTP_201_CREATED)
 async def create_favorite(
     payload: FavoriteCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     _=Depends(require_enforced_permission("POST", "/favorites")),
 ) -> FavoriteRead:
     return await add_favorite_use_case(
@@ -44,7 +52,7 @@ async def create_favorite(
 async def delete_favorite(
     anime_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     _=Depends(require_enforced_permission("DELETE", "/favorites/{anime_id}")),
 ) -> None:
     await remove_favorite_use_case(db, user_id=current_user.id, anime_id=anime_id)
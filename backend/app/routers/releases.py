@@ -1,31 +1,51 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..application.catalog_cache import RELEASE_POLICY, CachedResponse, catalog_cache
 from ..crud.release import get_release_by_id, get_releases
 from ..dependencies import get_db
 from ..schemas.release import ReleaseListItem, ReleaseRead
+from ..utils.pagination import CREATED_AT_CURSOR, NEXT_CURSOR_HEADER
+from ..utils.responses import json_bytes_response
 
 router = APIRouter(prefix="/releases", tags=["releases"])
 
 
 @router.get("/", response_model=list[ReleaseListItem])
 async def list_releases(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
 ) -> list[ReleaseListItem]:
-    return await get_releases(db, limit=limit, offset=offset)
+    after = CREATED_AT_CURSOR.parse(cursor, offset)
+    releases = await get_releases(db, limit=limit, offset=offset, after=after)
+    next_cursor = CREATED_AT_CURSOR.next(releases, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return releases
 
 
 @router.get("/{release_id}", response_model=ReleaseRead)
 async def get_release(
     release_id: UUID, db: AsyncSession = Depends(get_db)
-) -> ReleaseRead:
-    release = await get_release_by_id(db, release_id)
-    if release is None:
+) -> Response:
+    async def load() -> CachedResponse | None:
+        release = await get_release_by_id(db, release_id)
+        if release is None:
+            return None
+        return CachedResponse(
+            ReleaseRead.model_validate(release).model_dump_json().encode("utf-8")
+        )
+
+    cached = await catalog_cache.get_or_load(
+        f"release:{release_id}", load, policy=RELEASE_POLICY
+    )
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Release not found"
         )
-    return release
+    return json_bytes_response(cached.body)
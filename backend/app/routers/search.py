@@ -1,18 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..crud.anime import search_anime
+from ..application.anime_suggest import anime_suggest_index
+from ..crud.anime import search_anime, suggest_anime
 from ..dependencies import get_db
 from ..schemas.anime import AnimeListItem
+from ..utils.pagination import NEXT_CURSOR_HEADER, SEARCH_CURSOR
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
 @router.get("/anime", response_model=list[AnimeListItem])
 async def search_anime_endpoint(
+    response: Response,
     q: str | None = Query(None, description="Search query"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
 ) -> list[AnimeListItem]:
     if q is None:
@@ -26,4 +30,27 @@ async def search_anime_endpoint(
             detail="Query parameter 'q' must be at least 2 characters long",
         )
 
-    return await search_anime(db, query=q, limit=limit, offset=offset)
+    after = SEARCH_CURSOR.parse(cursor, offset)
+    rows = await search_anime(db, query=q, limit=limit, offset=offset, after=after)
+    next_cursor = SEARCH_CURSOR.next(rows, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [row.Anime for row in rows]
+
+
+@router.get("/anime/suggest", response_model=list[AnimeListItem])
+async def suggest_anime_endpoint(
+    q: str | None = Query(None, description="Title prefix"),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_db),
+) -> list[AnimeListItem]:
+    if q is None or not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query parameter 'q' is required",
+        )
+
+    suggestions = anime_suggest_index.search(q, limit)
+    if suggestions is None:
+        return await suggest_anime(db, query=q, limit=limit)
+    return suggestions
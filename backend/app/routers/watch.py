@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth.enforcement_matrix import require_enforced_permission
+from ..auth.principal import Principal
 from ..dependencies import get_current_user, get_db
-from ..models.user import User
 from ..schemas.watch import WatchProgressRead, WatchProgressUpdate
 from ..use_cases.watch import get_continue_watching, update_progress
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/watch", tags=["watch"])
 async def upsert_progress(
     payload: WatchProgressUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     _=Depends(require_enforced_permission("POST", "/watch/progress")),
 ) -> WatchProgressRead:
     return await update_progress(
@@ -31,6 +31,6 @@ async def upsert_progress(
 async def continue_watching(
     limit: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> list[WatchProgressRead]:
     return await get_continue_watching(db, user_id=current_user.id, limit=limit)
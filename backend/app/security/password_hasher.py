@@ -0,0 +1,128 @@
+"""Bounded thread pool for bcrypt.
+
+A bcrypt round takes a few hundred milliseconds of CPU; run on the event
+loop it stalls every other request. Hashing and verification run on
+``PASSWORD_HASH_WORKERS`` threads instead (bcrypt releases the GIL). At most
+``PASSWORD_HASH_MAX_PENDING`` operations may be queued or running; further
+callers wait up to ``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds for a slot and
+are then rejected with 503, so a login storm queues here rather than on the
+loop.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from fastapi import status
+
+from ..config import settings
+from ..errors import AppError
+from ..utils.metrics import Histogram
+from ..utils.security import check_password, hash_password
+
+T = TypeVar("T")
+
+logger = logging.getLogger("kitsu.password_hasher")
+
+OVERLOADED_MESSAGE = "Authentication is busy, try again later"
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        *,
+        max_workers: int = settings.password_hash_workers,
+        max_pending: int = settings.password_hash_max_pending,
+        queue_timeout: float = settings.password_hash_queue_timeout,
+        legacy_fallback: bool = settings.password_legacy_fallback,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self.legacy_fallback = legacy_fallback
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._pending = 0
+        self._rejected = 0
+        self._rehashes = 0
+        self._queue_wait = Histogram()
+        self._hash_time = Histogram()
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="kitsu-bcrypt"
+            )
+
+    def close(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> tuple[bool, bool]:
+        """``(matches, needs_rehash)``, see ``check_password``."""
+        matches, needs_rehash = await self._run(
+            lambda: check_password(
+                password, hashed_password, legacy_fallback=self.legacy_fallback
+            )
+        )
+        if needs_rehash:
+            self._rehashes += 1
+        return matches, needs_rehash
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self._rejected,
+            "legacy_fallback": self.legacy_fallback,
+            "rehashes": self._rehashes,
+            "queue_wait_seconds": self._queue_wait.snapshot(),
+            "hash_seconds": self._hash_time.snapshot(),
+        }
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            logger.warning("Password hashing queue is full (%s pending)", self._pending)
+            raise AppError(
+                OVERLOADED_MESSAGE,
+                code="SERVICE_UNAVAILABLE",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            ) from None
+
+        self._pending += 1
+        try:
+            self.start()
+            submitted_at = time.monotonic()
+            loop = asyncio.get_running_loop()
+            result, started_at, finished_at = await loop.run_in_executor(
+                self._executor, _timed, func, args
+            )
+        finally:
+            self._pending -= 1
+            self._slots.release()
+
+        self._queue_wait.observe(max(started_at - submitted_at, 0.0))
+        self._hash_time.observe(finished_at - started_at)
+        return result
+
+
+def _timed(func: Callable[..., T], args: tuple[Any, ...]) -> tuple[T, float, float]:
+    started_at = time.monotonic()
+    result = func(*args)
+    return result, started_at, time.monotonic()
+
+
+password_hasher = PasswordHasher()
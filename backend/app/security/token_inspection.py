@@ -1,3 +1,16 @@
+"""Access and refresh token checks.
+
+A client sends the same access token with every request until it expires,
+so verified tokens are kept in a bounded LRU (``ACCESS_TOKEN_CACHE_SIZE``
+entries) keyed by the SHA-256 digest of the token, with the decoded claims
+and ``exp``. A repeat validation is a dict lookup instead of a decode and
+HMAC check. Only successfully verified tokens are cached; a cached token
+past its ``exp`` raises ``ExpiredTokenError`` exactly as PyJWT would.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime, timezone
 from typing import Any, Dict
 
@@ -15,7 +28,55 @@ class ExpiredTokenError(Exception):
     """Raised when a token has expired."""
 
 
-def _parse_token_payload(token: str) -> Dict[str, Any]:
+class VerifiedTokenCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int = settings.access_token_cache_size,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[Dict[str, Any], int | None]] = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        digest = hashlib.sha256(token.encode()).digest()
+        entry = self._entries.get(digest)
+        if entry is None:
+            self._counters["misses"] += 1
+            payload = _decode(token)
+            exp = payload.get("exp")
+            self._entries[digest] = (payload, None if exp is None else int(exp))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+            return dict(payload)
+
+        payload, exp = entry
+        # Same rule as PyJWT (no leeway): expired once ``exp <= now``.
+        if exp is not None and exp <= self._clock():
+            del self._entries[digest]
+            self._counters["expired"] += 1
+            raise ExpiredTokenError from jwt.ExpiredSignatureError("Signature has expired")
+        self._entries.move_to_end(digest)
+        self._counters["hits"] += 1
+        return dict(payload)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"] + self._counters["expired"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **self._counters,
+            "hit_rate": self._counters["hits"] / lookups if lookups else None,
+        }
+
+
+def _decode(token: str) -> Dict[str, Any]:
     try:
         return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except jwt.ExpiredSignatureError as exc:
@@ -24,6 +85,13 @@ def _parse_token_payload(token: str) -> Dict[str, Any]:
         raise InvalidTokenError from exc
 
 
+verified_token_cache = VerifiedTokenCache()
+
+
+def _parse_token_payload(token: str) -> Dict[str, Any]:
+    return verified_token_cache.decode(token)
+
+
 def validate_access_token(token: str) -> Dict[str, Any]:
     payload = _parse_token_payload(token)
 
@@ -10,7 +10,7 @@ from ...application.auth_rate_limit import (
 )
 from ...crud.user import get_user_by_email
 from ...errors import AppError, AuthError, PermissionError
-from ...utils.security import verify_password
+from ...security.password_hasher import password_hasher
 from .register_user import AuthTokens, issue_tokens
 
 
@@ -18,8 +18,14 @@ async def _authenticate_user(
     session: AsyncSession, email: str, password: str
 ) -> AuthTokens:
     user = await get_user_by_email(session, email)
-    if user is None or not verify_password(password, user.password_hash):
+    if user is None:
         raise AuthError()
+    matches, needs_rehash = await password_hasher.verify(password, user.password_hash)
+    if not matches:
+        raise AuthError()
+    if needs_rehash:
+        # Saved by the commit in issue_tokens; the next login verifies once.
+        user.password_hash = await password_hasher.hash(password)
     return await issue_tokens(session, user.id)
 
 
@@ -27,7 +33,7 @@ async def login_user(
     session: AsyncSession, email: str, password: str, *, client_ip: str | None = None
 ) -> AuthTokens:
     try:
-        key = check_login_rate_limit(email, client_ip)
+        key = await check_login_rate_limit(email, client_ip)
     except RateLimitExceededError:
         raise AppError(
             RATE_LIMIT_MESSAGE,
@@ -38,7 +44,7 @@ async def login_user(
     try:
         tokens = await _authenticate_user(session, email, password)
     except (AuthError, PermissionError):
-        record_login_failure(key)
+        await record_login_failure(key)
         await session.rollback()
         raise
     except AppError:
@@ -47,5 +53,5 @@ async def login_user(
     except Exception:
         await session.rollback()
         raise
-    reset_login_limit(key)
+    await reset_login_limit(key)
     return tokens
@@ -1,5 +1,3 @@
-from datetime import datetime, timezone
-
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,10 +8,15 @@ from ...application.auth_rate_limit import (
     record_refresh_failure,
     reset_refresh_limit,
 )
-from ...crud.refresh_token import get_refresh_token_by_hash
+from ...crud.refresh_token import get_refresh_token_by_hash, rotate_refresh_token
 from ...errors import AppError, AuthError, PermissionError
 from ...security.token_inspection import InvalidTokenError, validate_refresh_token
-from .register_user import AuthTokens, issue_tokens
+from ...utils.security import (
+    create_access_token,
+    create_refresh_token,
+    hash_refresh_token,
+)
+from .register_user import AuthTokens, refresh_token_expires_at
 
 
 REFRESH_TOKEN_IDENTIFIER_LENGTH = 16
@@ -22,14 +25,20 @@ REFRESH_TOKEN_IDENTIFIER_LENGTH = 16
 async def _validate_and_issue_tokens(
     session: AsyncSession, token_hash: str
 ) -> AuthTokens:
-    stored_token = await get_refresh_token_by_hash(session, token_hash, for_update=True)
-    if stored_token is None:
-        raise AuthError()
-    if stored_token.revoked:
-        raise PermissionError()
-    if stored_token.expires_at <= datetime.now(timezone.utc):
+    refresh_token = create_refresh_token()
+    user_id = await rotate_refresh_token(
+        session, token_hash, hash_refresh_token(refresh_token), refresh_token_expires_at()
+    )
+    if user_id is None:
+        # Only failed refreshes pay for a second query, to keep 403 for
+        # revoked tokens apart from 401 for unknown or expired ones.
+        stored_token = await get_refresh_token_by_hash(session, token_hash)
+        if stored_token is not None and stored_token.revoked:
+            raise PermissionError()
         raise AuthError()
-    return await issue_tokens(session, stored_token.user_id)
+    await session.commit()
+    access_token = create_access_token({"sub": str(user_id)})
+    return AuthTokens(access_token=access_token, refresh_token=refresh_token)
 
 
 async def refresh_session(
@@ -42,7 +51,7 @@ async def refresh_session(
 
     token_identifier = token_hash[:REFRESH_TOKEN_IDENTIFIER_LENGTH]
     try:
-        key = check_refresh_rate_limit(token_identifier, client_ip)
+        key = await check_refresh_rate_limit(token_identifier, client_ip)
     except RateLimitExceededError:
         raise AppError(
             RATE_LIMIT_MESSAGE,
@@ -53,7 +62,7 @@ async def refresh_session(
     try:
         tokens = await _validate_and_issue_tokens(session, token_hash)
     except (AuthError, PermissionError):
-        record_refresh_failure(key)
+        await record_refresh_failure(key)
         await session.rollback()
         raise
     except AppError:
@@ -62,5 +71,5 @@ async def refresh_session(
     except Exception:
         await session.rollback()
         raise
-    reset_refresh_limit(key)
+    await reset_refresh_limit(key)
     return tokens
@@ -9,10 +9,10 @@ from ...crud.refresh_token import create_or_rotate_refresh_token
 from ...crud.user import get_user_by_email
 from ...errors import AppError, ValidationError
 from ...models.user import User
+from ...security.password_hasher import password_hasher
 from ...utils.security import (
     create_access_token,
     create_refresh_token,
-    hash_password,
     hash_refresh_token,
 )
 
@@ -23,14 +23,17 @@ class AuthTokens:
     refresh_token: str
 
 
+def refresh_token_expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+
+
 async def issue_tokens(session: AsyncSession, user_id: uuid.UUID) -> AuthTokens:
     access_token = create_access_token({"sub": str(user_id)})
     refresh_token = create_refresh_token()
     token_hash = hash_refresh_token(refresh_token)
-    expires_at = datetime.now(timezone.utc) + timedelta(
-        days=settings.refresh_token_expire_days
+    await create_or_rotate_refresh_token(
+        session, user_id, token_hash, refresh_token_expires_at()
     )
-    await create_or_rotate_refresh_token(session, user_id, token_hash, expires_at)
     await session.commit()
     return AuthTokens(access_token=access_token, refresh_token=refresh_token)
 
@@ -41,7 +44,7 @@ async def register_user(session: AsyncSession, email: str, password: str) -> Aut
         if existing_user:
             raise ValidationError("Email already registered")
 
-        user = User(email=email, password_hash=hash_password(password))
+        user = User(email=email, password_hash=await password_hasher.hash(password))
         session.add(user)
         await session.flush()
         return await issue_tokens(session, user.id)
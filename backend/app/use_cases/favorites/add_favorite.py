@@ -1,11 +1,13 @@
 import uuid
 from datetime import datetime, timezone
+from typing import Any
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...background import Job, default_job_runner
-from ...crud.anime import get_anime_by_id
-from ...crud.favorite import add_favorite as crud_add_favorite, get_favorite
+from ...background import Job, JobPriority, default_job_runner, register_job_handler
+from ...crud.anime import anime_exists, forget_anime
+from ...crud.favorite import favorite_exists, insert_favorite
 from ...database import AsyncSessionLocal
 from ...errors import ConflictError, NotFoundError
 from ...schemas.favorite import FavoriteRead
@@ -18,21 +20,15 @@ async def _apply_add_favorite(
     favorite_id: uuid.UUID,
     created_at: datetime,
 ) -> None:
+    # The request already checked the anime; the foreign key covers the rare
+    # case of it being deleted since, and ON CONFLICT makes retries no-ops.
     try:
-        anime = await get_anime_by_id(session, anime_id)
-        if anime is None:
-            raise NotFoundError("Anime not found")
-
-        existing = await get_favorite(session, user_id, anime_id)
-        if existing is None:
-            await crud_add_favorite(
-                session,
-                user_id,
-                anime_id,
-                favorite_id=favorite_id,
-                created_at=created_at,
-            )
+        await insert_favorite(session, user_id, anime_id, favorite_id, created_at)
         await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        forget_anime(anime_id)
+        raise
     except Exception:
         await session.rollback()
         raise
@@ -48,24 +44,51 @@ async def persist_add_favorite(
         await _apply_add_favorite(job_session, user_id, anime_id, favorite_id, created_at)
 
 
+ADD_FAVORITE_JOB = "favorite.add"
+
+
+async def _run_add_favorite_job(payload: dict[str, Any]) -> None:
+    await persist_add_favorite(
+        uuid.UUID(payload["user_id"]),
+        uuid.UUID(payload["anime_id"]),
+        uuid.UUID(payload["favorite_id"]),
+        datetime.fromisoformat(payload["created_at"]),
+    )
+
+
+register_job_handler(ADD_FAVORITE_JOB, _run_add_favorite_job)
+
+
 async def add_favorite(
     session: AsyncSession, user_id: uuid.UUID, anime_id: uuid.UUID
 ) -> FavoriteRead:
-    anime = await get_anime_by_id(session, anime_id)
-    if anime is None:
+    if not await anime_exists(session, anime_id):
         raise NotFoundError("Anime not found")
 
-    existing = await get_favorite(session, user_id, anime_id)
-    if existing:
+    if await favorite_exists(session, user_id, anime_id):
         raise ConflictError("Favorite already exists")
 
     favorite_id = uuid.uuid4()
     created_at = datetime.now(timezone.utc)
     result = FavoriteRead(id=favorite_id, anime_id=anime_id, created_at=created_at)
 
+    payload = {
+        "user_id": str(user_id),
+        "anime_id": str(anime_id),
+        "favorite_id": str(favorite_id),
+        "created_at": created_at.isoformat(),
+    }
+
     async def handler() -> None:
-        await persist_add_favorite(user_id, anime_id, favorite_id, created_at)
+        await _run_add_favorite_job(payload)
 
-    job = Job(key=f"favorite:add:{user_id}:{anime_id}", handler=handler)
+    job = Job(
+        key=f"favorite:add:{user_id}:{anime_id}",
+        handler=handler,
+        priority=JobPriority.HIGH,
+        coalesce_key=f"favorite:{user_id}:{anime_id}",
+        kind=ADD_FAVORITE_JOB,
+        payload=payload,
+    )
     await default_job_runner.enqueue(job)
     return result
@@ -1,4 +1,5 @@
 import uuid
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,6 +8,12 @@ from ...models.favorite import Favorite
 
 
 async def get_favorites(
-    session: AsyncSession, user_id: uuid.UUID, limit: int, offset: int
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    limit: int,
+    offset: int = 0,
+    after: tuple[Any, ...] | None = None,
 ) -> list[Favorite]:
-    return await list_favorites(session, user_id=user_id, limit=limit, offset=offset)
+    return await list_favorites(
+        session, user_id=user_id, limit=limit, offset=offset, after=after
+    )
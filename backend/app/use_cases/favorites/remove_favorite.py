@@ -1,8 +1,9 @@
 import uuid
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...background import Job, default_job_runner
+from ...background import Job, JobPriority, default_job_runner, register_job_handler
 from ...crud.favorite import remove_favorite as crud_remove_favorite
 from ...database import AsyncSessionLocal
 
@@ -17,14 +18,32 @@ async def persist_remove_favorite(user_id: uuid.UUID, anime_id: uuid.UUID) -> No
             raise
 
 
+REMOVE_FAVORITE_JOB = "favorite.remove"
+
+
+async def _run_remove_favorite_job(payload: dict[str, Any]) -> None:
+    await persist_remove_favorite(
+        uuid.UUID(payload["user_id"]), uuid.UUID(payload["anime_id"])
+    )
+
+
+register_job_handler(REMOVE_FAVORITE_JOB, _run_remove_favorite_job)
+
+
 async def remove_favorite(
     session: AsyncSession, user_id: uuid.UUID, anime_id: uuid.UUID
 ) -> None:
+    payload = {"user_id": str(user_id), "anime_id": str(anime_id)}
+
     async def handler() -> None:
-        await persist_remove_favorite(user_id, anime_id)
+        await _run_remove_favorite_job(payload)
 
     job = Job(
         key=f"favorite:remove:{user_id}:{anime_id}",
         handler=handler,
+        priority=JobPriority.HIGH,
+        coalesce_key=f"favorite:{user_id}:{anime_id}",
+        kind=REMOVE_FAVORITE_JOB,
+        payload=payload,
     )
     await default_job_runner.enqueue(job)
@@ -1,4 +1,13 @@
 from .get_continue_watching import get_continue_watching
-from .update_progress import persist_update_progress, update_progress
+from .update_progress import (
+    persist_update_progress,
+    update_progress,
+    watch_progress_buffer,
+)
 
-__all__ = ["get_continue_watching", "update_progress", "persist_update_progress"]
+__all__ = [
+    "get_continue_watching",
+    "update_progress",
+    "persist_update_progress",
+    "watch_progress_buffer",
+]
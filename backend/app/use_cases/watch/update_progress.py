@@ -1,18 +1,29 @@
+import logging
 import uuid
 from datetime import datetime, timezone
+from typing import Any
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...background import Job, default_job_runner
-from ...crud.anime import get_anime_by_id
+from ...background import register_job_handler
+from ...background.write_behind import WriteBehindBuffer
+from ...config import settings
+from ...crud.anime import anime_exists, forget_anime
 from ...crud.watch_progress import (
-    create_watch_progress,
-    get_watch_progress,
-    update_watch_progress as crud_update_watch_progress,
+    get_watch_progress_identity,
+    upsert_watch_progress_batch,
 )
 from ...database import AsyncSessionLocal
 from ...errors import NotFoundError, ValidationError
 from ...schemas.watch import WatchProgressRead
+from ...utils.lru_cache import TTLCache
+
+logger = logging.getLogger("kitsu.watch_progress")
+
+# ``id`` and ``created_at`` of a progress row never change once it exists, so
+# heartbeats after the first one do not need to look them up again.
+_progress_identities = TTLCache(max_entries=20_000, ttl=60 * 60)
 
 
 def _validate_update_request(
@@ -28,8 +39,7 @@ def _validate_update_request(
         raise ValidationError("Position in seconds must be non-negative")
 
 
-async def _apply_watch_progress(
-    session: AsyncSession,
+def _progress_row(
     user_id: uuid.UUID,
     anime_id: uuid.UUID,
     episode: int,
@@ -39,39 +49,63 @@ async def _apply_watch_progress(
     progress_id: uuid.UUID,
     created_at: datetime,
     last_watched_at: datetime,
-) -> None:
-    try:
-        anime = await get_anime_by_id(session, anime_id)
-        if anime is None:
-            raise NotFoundError("Anime not found")
-
-        progress = await get_watch_progress(session, user_id, anime_id)
-        if progress:
-            await crud_update_watch_progress(
-                session,
-                progress,
-                episode,
-                position_seconds,
-                progress_percent,
-                last_watched_at=last_watched_at,
-            )
-        else:
-            await create_watch_progress(
-                session,
-                user_id,
-                anime_id,
-                episode,
-                position_seconds,
-                progress_percent,
-                progress_id=progress_id,
-                created_at=created_at,
-                last_watched_at=last_watched_at,
-            )
+) -> dict[str, Any]:
+    return {
+        "id": progress_id,
+        "user_id": user_id,
+        "anime_id": anime_id,
+        "episode": episode,
+        "position_seconds": position_seconds,
+        "progress_percent": progress_percent,
+        "created_at": created_at,
+        "last_watched_at": last_watched_at,
+    }
+
+
+async def _write_rows(rows: list[dict[str, Any]]) -> None:
+    async with AsyncSessionLocal() as session:
+        try:
+            await upsert_watch_progress_batch(session, rows)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def _drop_stale_row(row: dict[str, Any]) -> None:
+    forget_anime(row["anime_id"])
+    _progress_identities.discard((row["user_id"], row["anime_id"]))
+    logger.warning(
+        "Dropping watch progress for user=%s anime=%s",
+        row["user_id"],
+        row["anime_id"],
+    )
+
 
-        await session.commit()
-    except Exception:
-        await session.rollback()
-        raise
+async def flush_watch_progress(rows: list[dict[str, Any]]) -> None:
+    """Write a buffered batch; rows violating a constraint are dropped one by one."""
+    try:
+        await _write_rows(rows)
+    except IntegrityError:
+        if len(rows) == 1:
+            # Retrying would only fail again on every flush.
+            _drop_stale_row(rows[0])
+            return
+        # A user or anime was deleted after the update was accepted; write the
+        # rest of the batch row by row so one stale row does not block it.
+        for row in rows:
+            try:
+                await _write_rows([row])
+            except IntegrityError:
+                _drop_stale_row(row)
+
+
+watch_progress_buffer = WriteBehindBuffer(
+    flush_watch_progress,
+    interval=settings.watch_progress_flush_interval,
+    max_batch=settings.watch_progress_flush_max_rows,
+    name="watch-progress",
+)
 
 
 async def persist_update_progress(
@@ -85,18 +119,41 @@ async def persist_update_progress(
     created_at: datetime,
     last_watched_at: datetime,
 ) -> None:
-    async with AsyncSessionLocal() as job_session:
-        await _apply_watch_progress(
-            job_session,
-            user_id,
-            anime_id,
-            episode,
-            position_seconds,
-            progress_percent,
-            progress_id=progress_id,
-            created_at=created_at,
-            last_watched_at=last_watched_at,
-        )
+    await _write_rows(
+        [
+            _progress_row(
+                user_id,
+                anime_id,
+                episode,
+                position_seconds,
+                progress_percent,
+                progress_id=progress_id,
+                created_at=created_at,
+                last_watched_at=last_watched_at,
+            )
+        ]
+    )
+
+
+WATCH_PROGRESS_JOB = "watch_progress.update"
+
+
+async def _run_watch_progress_job(payload: dict[str, Any]) -> None:
+    await persist_update_progress(
+        uuid.UUID(payload["user_id"]),
+        uuid.UUID(payload["anime_id"]),
+        payload["episode"],
+        payload["position_seconds"],
+        payload["progress_percent"],
+        progress_id=uuid.UUID(payload["progress_id"]),
+        created_at=datetime.fromisoformat(payload["created_at"]),
+        last_watched_at=datetime.fromisoformat(payload["last_watched_at"]),
+    )
+
+
+# Updates now go through ``watch_progress_buffer``; the handler stays
+# registered so jobs already stored in the durable queue still run.
+register_job_handler(WATCH_PROGRESS_JOB, _run_watch_progress_job)
 
 
 async def update_progress(
@@ -109,14 +166,18 @@ async def update_progress(
 ) -> WatchProgressRead:
     _validate_update_request(episode, position_seconds, progress_percent)
 
-    anime = await get_anime_by_id(session, anime_id)
-    if anime is None:
+    if not await anime_exists(session, anime_id):
         raise NotFoundError("Anime not found")
 
-    existing_progress = await get_watch_progress(session, user_id, anime_id)
     now = datetime.now(timezone.utc)
-    progress_id = existing_progress.id if existing_progress else uuid.uuid4()
-    created_at = existing_progress.created_at if existing_progress else now
+    buffer_key = (user_id, anime_id)
+    identity = _progress_identities.get(buffer_key)
+    if identity is None:
+        identity = await get_watch_progress_identity(session, user_id, anime_id)
+        if identity is None:
+            identity = (uuid.uuid4(), now)
+        _progress_identities.set(buffer_key, identity)
+    progress_id, created_at = identity
 
     result = WatchProgressRead(
         id=progress_id,
@@ -128,8 +189,9 @@ async def update_progress(
         last_watched_at=now,
     )
 
-    async def handler() -> None:
-        await persist_update_progress(
+    watch_progress_buffer.add(
+        buffer_key,
+        _progress_row(
             user_id,
             anime_id,
             episode,
@@ -137,16 +199,7 @@ async def update_progress(
             progress_percent,
             progress_id=progress_id,
             created_at=created_at,
-            last_watched_at=result.last_watched_at,
-        )
-
-    job = Job(
-        key=(
-            f"watch-progress:{user_id}:{anime_id}:episode={episode}:"
-            f"position={position_seconds if position_seconds is not None else 'none'}:"
-            f"percent={progress_percent if progress_percent is not None else 'none'}"
+            last_watched_at=now,
         ),
-        handler=handler,
     )
-    await default_job_runner.enqueue(job)
     return result
@@ -0,0 +1,94 @@
+"""Connection pool instrumentation, attributed to the route holding the connection.
+
+``InstrumentedPool`` times how long each checkout waited for a connection
+(including opening a new one and the pre-ping); the pool ``checkout`` and
+``checkin`` events time how long the connection was then held. Both are
+recorded under the current ``db_route`` label, which ``get_db`` sets to
+``"<METHOD> <route path>"``; work outside requests is labelled
+``background``.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .metrics import Histogram
+
+db_route: ContextVar[str] = ContextVar("db_route", default="background")
+
+
+class _RouteStats:
+    def __init__(self) -> None:
+        self.wait = Histogram()
+        self.held = Histogram()
+        self.timeouts = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.wait.count - self.timeouts,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait.snapshot(),
+            "held_seconds": self.held.snapshot(),
+        }
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._routes: dict[str, _RouteStats] = {}
+
+    def route(self, label: str) -> _RouteStats:
+        stats = self._routes.get(label)
+        if stats is None:
+            stats = self._routes[label] = _RouteStats()
+        return stats
+
+    def stats(self) -> dict[str, Any]:
+        return {label: stats.snapshot() for label, stats in sorted(self._routes.items())}
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def connect(self) -> Any:
+        stats = pool_metrics.route(db_route.get())
+        started = time.monotonic()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            stats.timeouts += 1
+            raise
+        finally:
+            stats.wait.observe(time.monotonic() - started)
+
+
+def instrument_pool(target: Any) -> None:
+    """Record how long each checked-out connection of ``target`` (a pool or
+    a sync engine) is held."""
+
+    @event.listens_for(target, "checkout")
+    def _on_checkout(_dbapi_connection: Any, record: Any, _proxy: Any) -> None:
+        record.info["checked_out"] = (db_route.get(), time.monotonic())
+
+    @event.listens_for(target, "checkin")
+    def _on_checkin(_dbapi_connection: Any, record: Any) -> None:
+        checked_out = record.info.pop("checked_out", None)
+        if checked_out is not None:
+            label, started = checked_out
+            pool_metrics.route(label).held.observe(time.monotonic() - started)
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"routes": pool_metrics.stats()}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "routes": pool_metrics.stats(),
+    }
@@ -1,4 +1,27 @@
-from sqlalchemy import Select
+import base64
+import binascii
+import json
+import operator
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..errors import ValidationError
+
+# List responses stay plain JSON arrays; the cursor for the next page travels
+# in this header and is omitted on the last page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CursorTypes = Sequence[type]
+
+
+class InvalidCursorError(ValidationError):
+    message = "Invalid cursor"
 
 
 def apply_pagination(statement: Select, limit: int, offset: int) -> Select:
@@ -7,3 +30,97 @@ def apply_pagination(statement: Select, limit: int, offset: int) -> Select:
     """
     return statement.limit(limit).offset(offset)
 
+
+def apply_keyset(
+    statement: Select,
+    columns: Sequence[ColumnElement[Any]],
+    *,
+    limit: int,
+    offset: int = 0,
+    after: tuple[Any, ...] | None = None,
+    descending: bool = False,
+) -> Select:
+    """
+    Order by ``columns`` (the last one must be unique) and return one page.
+
+    With ``after`` the page starts right behind that key using a row
+    comparison, which an index on ``columns`` answers without scanning the
+    skipped rows. Without it ``offset`` is applied for compatibility.
+    """
+    if after is not None:
+        key = tuple_(*columns)
+        statement = statement.where(key < after if descending else key > after)
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    statement = statement.order_by(*ordering)
+    if after is None:
+        return apply_pagination(statement, limit, offset)
+    return statement.limit(limit)
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _load(value: Any, value_type: type) -> Any:
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    if value_type is uuid.UUID:
+        return uuid.UUID(value)
+    if value_type is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, value_type):
+        raise TypeError(f"expected {value_type.__name__}")
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([_dump(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, types: CursorTypes) -> tuple[Any, ...]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("unexpected cursor shape")
+        return tuple(_load(value, value_type) for value, value_type in zip(values, types))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError() from exc
+
+
+def next_cursor(rows: Sequence[Any], limit: int, attributes: Sequence[str]) -> str | None:
+    """Cursor pointing after the last row, or ``None`` when the page was not full.
+
+    Attributes may be dotted (``"Anime.id"``) for rows of several entities.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(operator.attrgetter(attribute)(last) for attribute in attributes))
+
+
+@dataclass(frozen=True)
+class CursorKey:
+    """Row attributes a list is ordered by, with the types to decode them."""
+
+    attributes: tuple[str, ...]
+    types: tuple[type, ...]
+
+    def parse(self, cursor: str | None, offset: int = 0) -> tuple[Any, ...] | None:
+        if cursor is None:
+            return None
+        if offset:
+            raise InvalidCursorError("cursor and offset cannot be combined")
+        return decode_cursor(cursor, self.types)
+
+    def next(self, rows: Sequence[Any], limit: int) -> str | None:
+        return next_cursor(rows, limit, self.attributes)
+
+
+CREATED_AT_CURSOR = CursorKey(("created_at", "id"), (datetime, uuid.UUID))
+SEARCH_CURSOR = CursorKey(("score", "Anime.id"), (float, uuid.UUID))
@@ -0,0 +1,167 @@
+import re
+import string
+from bisect import bisect_left
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Any
+
+_WORD = re.compile(r"\w+")
+
+# Characters tried for substitutions and insertions in fuzzy lookups.
+_FUZZY_ALPHABET = string.ascii_lowercase + string.digits + " "
+
+
+def normalize(text: str) -> str:
+    """Lower-case words separated by single spaces; punctuation is dropped."""
+    return " ".join(_WORD.findall(text.casefold()))
+
+
+def edits1(text: str) -> set[str]:
+    """Every string one deletion, transposition, substitution or insertion away."""
+    alphabet = set(_FUZZY_ALPHABET) | set(text)
+    splits = [(text[:index], text[index:]) for index in range(len(text) + 1)]
+    deletes = {left + right[1:] for left, right in splits if right}
+    transposes = {
+        left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1
+    }
+    replaces = {left + char + right[1:] for left, right in splits if right for char in alphabet}
+    inserts = {left + char + right for left, right in splits for char in alphabet}
+    return (deletes | transposes | replaces | inserts) - {text}
+
+
+class _SortedTerms:
+    """Parallel sorted arrays of terms and their keys, so ``bisect`` stays in C."""
+
+    def __init__(self, entries: Iterable[tuple[str, Hashable]] = ()) -> None:
+        ordered = sorted(entries, key=lambda entry: entry[0])
+        self.terms = [term for term, _ in ordered]
+        self.keys = [key for _, key in ordered]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add(self, term: str, key: Hashable) -> None:
+        position = bisect_left(self.terms, term)
+        self.terms.insert(position, term)
+        self.keys.insert(position, key)
+
+    def discard(self, term: str, key: Hashable) -> None:
+        position = bisect_left(self.terms, term)
+        while position < len(self.terms) and self.terms[position] == term:
+            if self.keys[position] == key:
+                del self.terms[position]
+                del self.keys[position]
+                return
+            position += 1
+
+    def starting_with(self, prefix: str) -> Iterator[Hashable]:
+        position = bisect_left(self.terms, prefix)
+        while position < len(self.terms) and self.terms[position].startswith(prefix):
+            yield self.keys[position]
+            position += 1
+
+
+class PrefixIndex:
+    """In-memory autocomplete over names, backed by sorted arrays and ``bisect``.
+
+    Each name is indexed as a whole and from the start of every later word, so
+    "titan" finds "Attack on Titan". Matches at the start of a name come
+    before matches inside it. Lookups cost ``O(log n + limit)``.
+    """
+
+    def __init__(self) -> None:
+        self._names = _SortedTerms()
+        self._words = _SortedTerms()
+        self._terms: dict[Hashable, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+        self._values: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def get(self, key: Hashable) -> Any | None:
+        return self._values.get(key)
+
+    def rebuild(self, items: Iterable[tuple[Hashable, Iterable[str | None], Any]]) -> None:
+        """Replace the whole index with ``(key, names, value)`` items."""
+        names: list[tuple[str, Hashable]] = []
+        words: list[tuple[str, Hashable]] = []
+        terms: dict[Hashable, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+        values: dict[Hashable, Any] = {}
+        for key, item_names, value in items:
+            whole, suffixes = self._split(item_names)
+            names.extend((term, key) for term in whole)
+            words.extend((term, key) for term in suffixes)
+            terms[key] = (whole, suffixes)
+            values[key] = value
+        self._names, self._words = _SortedTerms(names), _SortedTerms(words)
+        self._terms, self._values = terms, values
+
+    def replace(self, key: Hashable, names: Iterable[str | None], value: Any) -> None:
+        self.remove(key)
+        whole, suffixes = self._split(names)
+        for term in whole:
+            self._names.add(term, key)
+        for term in suffixes:
+            self._words.add(term, key)
+        self._terms[key] = (whole, suffixes)
+        self._values[key] = value
+
+    def remove(self, key: Hashable) -> None:
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        del self._values[key]
+        whole, suffixes = terms
+        for term in whole:
+            self._names.discard(term, key)
+        for term in suffixes:
+            self._words.discard(term, key)
+
+    def search(self, prefix: str, limit: int) -> list[Any]:
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+        found: dict[Hashable, None] = {}
+        for terms in (self._names, self._words):
+            for key in terms.starting_with(prefix):
+                if len(found) >= limit:
+                    break
+                found.setdefault(key)
+        return [self._values[key] for key in found]
+
+    def search_fuzzy(self, prefix: str, limit: int, *, min_length: int = 3) -> list[Any]:
+        """Prefix lookup tolerating one typo: every edit of ``prefix`` is looked up.
+
+        That is about ``75 * len(prefix)`` binary searches, a few milliseconds
+        over tens of thousands of names. Prefixes shorter than ``min_length``
+        are too ambiguous and return nothing.
+        """
+        prefix = normalize(prefix)
+        if len(prefix) < min_length or limit <= 0:
+            return []
+        found: dict[Hashable, None] = {}
+        # Longer candidates are more specific, so they are tried first.
+        candidates = sorted(edits1(prefix), key=lambda candidate: (-len(candidate), candidate))
+        for terms in (self._names, self._words):
+            for candidate in candidates:
+                if len(found) >= limit:
+                    break
+                for key in terms.starting_with(candidate):
+                    found.setdefault(key)
+                    if len(found) >= limit:
+                        break
+        return [self._values[key] for key in found]
+
+    @staticmethod
+    def _split(names: Iterable[str | None]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        whole: set[str] = set()
+        suffixes: set[str] = set()
+        for name in names:
+            words = normalize(name or "").split(" ")
+            if not words[0]:
+                continue
+            whole.add(" ".join(words))
+            suffixes.update(" ".join(words[index:]) for index in range(1, len(words)))
+        return tuple(sorted(whole)), tuple(sorted(suffixes - whole))
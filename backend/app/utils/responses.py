@@ -13,3 +13,15 @@ def no_content() -> Response:
 def message_response(message: str, code: int = status.HTTP_200_OK) -> dict[str, Any]:
     return {"message": message, "status": code}
 
+
+def json_bytes_response(
+    body: bytes,
+    code: int = status.HTTP_200_OK,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Send an already serialized JSON body without re-validating it.
+    """
+    return Response(
+        content=body, status_code=code, headers=headers, media_type="application/json"
+    )
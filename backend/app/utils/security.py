@@ -36,25 +36,40 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(normalized_password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def check_password(
+    plain_password: str, hashed_password: str, *, legacy_fallback: bool = True
+) -> tuple[bool, bool]:
+    """Return ``(matches, needs_rehash)``.
+
+    Hashes made before passwords were normalized hold the raw password; with
+    ``legacy_fallback`` those still match (a second bcrypt run) and are
+    reported as needing a rehash, as are hashes with outdated parameters.
+    """
     normalized_password = _normalize_password(plain_password)
     try:
         if pwd_context.verify(normalized_password, hashed_password):
-            return True
+            return True, pwd_context.needs_update(hashed_password)
     except ValueError:
         pass
+    if not legacy_fallback:
+        return False, False
     try:
-        return pwd_context.verify(plain_password, hashed_password)
+        matches = pwd_context.verify(plain_password, hashed_password)
     except ValueError:
-        return False
+        return False, False
+    return matches, matches
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return check_password(plain_password, hashed_password)[0]
 
 
 def create_access_token(payload: dict[str, Any]) -> str:
     to_encode = payload.copy()
-    expire = datetime.now(timezone.utc) + timedelta(
-        minutes=settings.access_token_expire_minutes
-    )
-    to_encode.update({"exp": expire})
+    issued_at = datetime.now(timezone.utc)
+    expire = issued_at + timedelta(minutes=settings.access_token_expire_minutes)
+    # ``iat`` also scopes the cached principal to this token.
+    to_encode.update({"iat": issued_at, "exp": expire})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
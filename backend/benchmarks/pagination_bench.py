@@ -0,0 +1,92 @@
+"""Offset vs. keyset pagination latency by page depth.
+
+Needs a database migrated to head (``alembic upgrade head``). Run from the
+``backend`` directory::
+
+    python benchmarks/pagination_bench.py [--rows 200000] [--limit 20] [--repeat 20]
+
+Rows are inserted into ``anime`` inside a transaction that is rolled back at
+the end, so the database is left as it was. For each depth the mean time to
+fetch one page through ``get_anime_list`` is printed for ``OFFSET`` and for
+a ``(created_at, id)`` cursor: the keyset column stays flat while the offset
+column grows with depth.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.crud.anime import get_anime_list  # noqa: E402
+from app.models.anime import Anime  # noqa: E402
+
+SEED_SQL = text(
+    "INSERT INTO anime (id, title, created_at) "
+    "SELECT gen_random_uuid(), 'Pagination bench ' || g, "
+    "now() - g * interval '1 second' FROM generate_series(1, :rows) AS g"
+)
+
+
+async def _mean_ms(session: AsyncSession, repeat: int, **kwargs: object) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await get_anime_list(session, **kwargs)
+        session.expunge_all()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+async def run(rows: int, limit: int, repeat: int) -> None:
+    engine = create_async_engine(settings.database_url)
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection)
+            try:
+                await session.execute(SEED_SQL, {"rows": rows})
+                await session.execute(text("ANALYZE anime"))
+                total = await session.scalar(select(func.count()).select_from(Anime))
+
+                depths = sorted(
+                    {0, 1_000, 10_000, 50_000, 100_000, total - limit} & set(range(total))
+                )
+                print(f"{total} rows, page size {limit}, {repeat} runs per cell")
+                print(f"{'depth':>10}{'offset ms':>14}{'keyset ms':>14}")
+                for depth in depths:
+                    after = None
+                    if depth:
+                        boundary = await session.execute(
+                            select(Anime.created_at, Anime.id)
+                            .order_by(Anime.created_at.desc(), Anime.id.desc())
+                            .offset(depth - 1)
+                            .limit(1)
+                        )
+                        after = tuple(boundary.one())
+                    offset_ms = await _mean_ms(session, repeat, limit=limit, offset=depth)
+                    keyset_ms = await _mean_ms(session, repeat, limit=limit, after=after)
+                    print(f"{depth:>10}{offset_ms:>14.2f}{keyset_ms:>14.2f}")
+            finally:
+                await session.close()
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Micro-benchmark for the HTML parser backends.
+
+Run from the ``backend`` directory::
+
+    python benchmarks/parser_bench.py [--repeat 20]
+
+Synthetic pages roughly the size of real upstream responses are parsed with
+every installed backend and the mean time per page type is printed.
+"""
+import argparse
+import os
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import datetime
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from app.parser import anime as anime_parser  # noqa: E402
+from app.parser import backend as parser_backend  # noqa: E402
+from app.parser import episodes as episodes_parser  # noqa: E402
+from app.parser import schedule as schedule_parser  # noqa: E402
+from app.parser import search as search_parser  # noqa: E402
+
+
+def _filler(blocks: int) -> str:
+    return "".join(
+        f'<div class="block-{i}"><a href="/item-{i}" title="Item {i}">'
+        f'<img class="lazy" data-src="/img/{i}.jpg"><span>Item {i}</span></a>'
+        f"<p>{'Lorem ipsum dolor sit amet. ' * 4}</p></div>"
+        for i in range(blocks)
+    )
+
+
+def anime_page() -> str:
+    return (
+        "<!DOCTYPE html><html><head><title>Show</title></head><body>"
+        '<script type="application/json" id="syncData">{"anilist_id": 1, "mal_id": 2}</script>'
+        f"{_filler(600)}"
+        '<h2 class="film-name dynamic-name">Show</h2>'
+        '<img class="film-poster-img" src="/poster.jpg">'
+        '<div class="film-description"><div class="text">Description</div></div>'
+        f"{_filler(600)}</body></html>"
+    )
+
+
+def episodes_list() -> str:
+    links = "".join(
+        f'<a href="/watch/show-1?ep={i}" data-number="{i}" class="ssl-item" title="Ep {i}"></a>'
+        for i in range(1, 1101)
+    )
+    return f'<div class="detail-infor-content"><div class="ss-list">{links}</div></div>'
+
+
+def servers_list() -> str:
+    items = "".join(
+        f'<div class="server-item" data-server-id="{i}">HD-{i}</div>' for i in range(6)
+    )
+    return (
+        '<div class="server-notice"><strong>Episode 12</strong></div>'
+        f'<div class="ps_-block servers-sub"><div class="ps__-list">{items}</div></div>'
+        f'<div class="ps_-block servers-dub"><div class="ps__-list">{items}</div></div>'
+    )
+
+
+def schedule_list() -> str:
+    return "<ul>" + "".join(
+        f'<li><a href="/show-{i}"><div class="time">{i % 24:02d}:30</div>'
+        f'<h3 class="film-name dynamic-name" data-jname="J{i}">Show {i}</h3>'
+        f'<div class="fd-play"><button>Episode {i}</button></div></a></li>'
+        for i in range(120)
+    ) + "</ul>"
+
+
+def search_suggestions() -> str:
+    return "".join(
+        f'<a class="nav-item" href="/show-{i}?ref=search">'
+        f'<img class="film-poster-img" data-src="/p/{i}.jpg">'
+        f'<h3 class="film-name" data-jname="J{i}">Show {i}</h3>'
+        f'<div class="film-infor"><span>2024</span><i></i>TV<i></i>24m</div></a>'
+        for i in range(5)
+    )
+
+
+def _cases() -> dict[str, Callable[[], object]]:
+    anime_html = anime_page()
+    episodes_html = episodes_list()
+    servers_html = servers_list()
+    schedule_html = schedule_list()
+    search_html = search_suggestions()
+    now = datetime.fromisoformat("2024-01-02T00:00:00")
+    return {
+        "anime page": lambda: anime_parser.parse_anime_page(anime_html, "show-1"),
+        "watch page (sources)": lambda: episodes_parser.build_sources_payload(
+            "https://s/1", anime_html, referer="r"
+        ),
+        "episode list": lambda: anime_parser.parse_episodes_html(episodes_html),
+        "servers": lambda: episodes_parser.parse_server_html(servers_html, "sub", None),
+        "schedule": lambda: schedule_parser.parse_schedule_html(
+            schedule_html, "2024-01-02", now
+        ),
+        "search suggest": lambda: search_parser.parse_search_suggestions(search_html),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = [
+        name
+        for name in parser_backend.PARSER_BACKENDS
+        if name != parser_backend.LXML_BACKEND or parser_backend.lxml_available()
+    ]
+    cases = _cases()
+    print(f"{'page type':<24}" + "".join(f"{name:>16}" for name in backends))
+    for label, case in cases.items():
+        timings = []
+        for name in backends:
+            parser_backend.parser_backend = name
+            seconds = timeit.timeit(case, number=args.repeat) / args.repeat
+            timings.append(f"{seconds * 1000:>13.2f} ms")
+        print(f"{label:<24}" + "".join(f"{timing:>16}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
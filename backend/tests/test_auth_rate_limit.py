@@ -4,6 +4,7 @@ from typing import Iterable
 from fastapi import FastAPI, status
 from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
 import pytest
 
 os.environ.setdefault("SECRET_KEY", "test")
@@ -18,6 +19,9 @@ from app.routers.auth import router  # noqa: E402
 from app.use_cases.auth.register_user import AuthTokens  # noqa: E402
 from app.application.auth_rate_limit import (  # noqa: E402
     AUTH_RATE_LIMIT_MAX_ATTEMPTS,
+    MemoryRateLimitStore,
+    PostgresRateLimitStore,
+    SoftRateLimiter,
     auth_rate_limiter,
 )
 
@@ -134,3 +138,97 @@ def test_refresh_rate_limit_exceeded(monkeypatch: pytest.MonkeyPatch) -> None:
 
     assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
     assert response.json()["code"] == "RATE_LIMITED"
+
+
+@pytest.mark.anyio
+async def test_sliding_window_weights_the_previous_window() -> None:
+    limiter = SoftRateLimiter(max_attempts=5, window_seconds=60)
+
+    for _ in range(5):
+        await limiter.record_failure("key", now=10)
+    assert await limiter.is_limited("key", now=30) is True
+    # 5 s into the next window the old failures weigh 55/60 each.
+    assert await limiter.is_limited("key", now=65) is False
+    await limiter.record_failure("key", now=65)
+    assert await limiter.is_limited("key", now=65) is True
+    assert await limiter.is_limited("key", now=125) is False
+    assert len(limiter.store) == 1  # type: ignore[arg-type]
+
+
+@pytest.mark.anyio
+async def test_limiters_sharing_a_store_share_the_budget() -> None:
+    store = MemoryRateLimitStore()
+    workers = [SoftRateLimiter(max_attempts=4, window_seconds=60, store=store) for _ in range(2)]
+
+    for index in range(4):
+        await workers[index % 2].record_failure("key", now=1)
+
+    assert await workers[0].is_limited("key", now=2) is True
+
+
+class RecordingSession:
+    def __init__(self, statements: list[str]) -> None:
+        self.statements = statements
+
+    async def __aenter__(self) -> "RecordingSession":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:  # type: ignore[no-untyped-def]
+        return None
+
+    async def execute(self, statement) -> None:  # type: ignore[no-untyped-def]
+        compiled = statement.compile(
+            dialect=PGDialect_asyncpg(), compile_kwargs={"literal_binds": True}
+        )
+        self.statements.append(str(compiled))
+
+    async def commit(self) -> None:
+        self.statements.append("COMMIT")
+
+
+@pytest.mark.anyio
+async def test_postgres_store_counts_in_one_upsert() -> None:
+    statements: list[str] = []
+    store = PostgresRateLimitStore(lambda: RecordingSession(statements))  # type: ignore[arg-type, return-value]
+
+    await store.increment("login:1.2.3.4:abc", 7)
+
+    upsert, commit = statements
+    assert upsert.startswith("INSERT INTO auth_rate_limits")
+    assert "ON CONFLICT (key) DO UPDATE" in upsert
+    assert "greatest(auth_rate_limits.window_index, 7)" in upsert
+    assert commit == "COMMIT"
+
+
+@pytest.mark.anyio
+async def test_memory_store_caps_keys_by_evicting_the_least_recent() -> None:
+    store = MemoryRateLimitStore(max_keys=3)
+
+    for window, key in enumerate(["a", "b", "c", "d"], start=1):
+        await store.increment(key, window)
+    counts = [await store.get(key) for key in ["a", "b", "c", "d"]]
+
+    assert counts[0] is None
+    assert [entry.window for entry in counts[1:]] == [2, 3, 4]  # type: ignore[union-attr]
+    assert store.stats() | {"max_keys": None} == {
+        "keys": 3,
+        "max_keys": None,
+        "slots": 3,
+        "evicted": 1,
+        "swept": 0,
+    }
+
+
+@pytest.mark.anyio
+async def test_sweep_drops_idle_keys_and_reuses_their_slots() -> None:
+    limiter = SoftRateLimiter(max_attempts=5, window_seconds=60)
+
+    await limiter.record_failure("idle", now=10)
+    await limiter.record_failure("recent", now=70)
+    removed = await limiter.sweep(now=130)
+    await limiter.record_failure("new", now=130)
+
+    assert removed == 1
+    assert limiter.stats()["keys"] == 2
+    assert limiter.stats()["slots"] == 2
+    assert await limiter.store.get("idle") is None
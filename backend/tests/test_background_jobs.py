@@ -4,7 +4,8 @@ import uuid
 
 import pytest
 
-from app.background.runner import Job, JobRunner, JobStatus
+from app.background.runner import Job, JobPriority, JobRunner, JobStatus
+from app.background.write_behind import WriteBehindBuffer
 from app.background import default_job_runner
 favorites_use_case = importlib.import_module("app.use_cases.favorites.add_favorite")
 watch_use_case = importlib.import_module("app.use_cases.watch.update_progress")
@@ -80,15 +81,15 @@ async def test_add_favorite_job_calls_use_case(monkeypatch: pytest.MonkeyPatch)
     async def fake_persist(user_id, anime_id, favorite_id, created_at) -> None:  # type: ignore[no-untyped-def]
         called["count"] += 1
 
-    async def fake_get_anime_by_id(_session, _anime_id):  # type: ignore[no-untyped-def]
-        return object()
+    async def fake_anime_exists(_session, _anime_id):  # type: ignore[no-untyped-def]
+        return True
 
-    async def fake_get_favorite(_session, _user_id, _anime_id):  # type: ignore[no-untyped-def]
-        return None
+    async def fake_favorite_exists(_session, _user_id, _anime_id):  # type: ignore[no-untyped-def]
+        return False
 
     monkeypatch.setattr(favorites_use_case, "persist_add_favorite", fake_persist)
-    monkeypatch.setattr(favorites_use_case, "get_anime_by_id", fake_get_anime_by_id)
-    monkeypatch.setattr(favorites_use_case, "get_favorite", fake_get_favorite)
+    monkeypatch.setattr(favorites_use_case, "anime_exists", fake_anime_exists)
+    monkeypatch.setattr(favorites_use_case, "favorite_exists", fake_favorite_exists)
     monkeypatch.setattr(favorites_use_case, "default_job_runner", runner)
     monkeypatch.setattr("app.background.default_job_runner", runner)
 
@@ -100,43 +101,118 @@ async def test_add_favorite_job_calls_use_case(monkeypatch: pytest.MonkeyPatch)
 
 
 @pytest.mark.anyio
-async def test_watch_progress_job_calls_use_case(monkeypatch: pytest.MonkeyPatch) -> None:
-    called = {"count": 0}
-    runner = JobRunner()
+async def test_watch_progress_update_is_buffered(monkeypatch: pytest.MonkeyPatch) -> None:
+    flushed: list[list[dict]] = []
+    lookups = {"count": 0}
 
-    async def fake_persist(
-        user_id,  # type: ignore[no-untyped-def]
-        anime_id,
-        episode,
-        position_seconds,
-        progress_percent,
-        *,
-        progress_id,
-        created_at,
-        last_watched_at,
-    ) -> None:
-        called["count"] += 1
+    async def fake_flush(rows):  # type: ignore[no-untyped-def]
+        flushed.append(rows)
 
-    async def fake_get_anime_by_id(_session, _anime_id):  # type: ignore[no-untyped-def]
-        return object()
+    async def fake_anime_exists(_session, _anime_id):  # type: ignore[no-untyped-def]
+        return True
 
-    async def fake_get_watch_progress(_session, _user_id, _anime_id):  # type: ignore[no-untyped-def]
+    async def fake_get_identity(_session, _user_id, _anime_id):  # type: ignore[no-untyped-def]
+        lookups["count"] += 1
         return None
 
-    monkeypatch.setattr(watch_use_case, "persist_update_progress", fake_persist)
-    monkeypatch.setattr(watch_use_case, "get_anime_by_id", fake_get_anime_by_id)
-    monkeypatch.setattr(watch_use_case, "get_watch_progress", fake_get_watch_progress)
-    monkeypatch.setattr(watch_use_case, "default_job_runner", runner)
-    monkeypatch.setattr("app.background.default_job_runner", runner)
+    buffer = WriteBehindBuffer(fake_flush)
+    monkeypatch.setattr(watch_use_case, "watch_progress_buffer", buffer)
+    monkeypatch.setattr(watch_use_case, "anime_exists", fake_anime_exists)
+    monkeypatch.setattr(watch_use_case, "get_watch_progress_identity", fake_get_identity)
 
-    await watch_use_case.update_progress(
-        _DummySession(),
-        uuid.uuid4(),
-        uuid.uuid4(),
-        episode=1,
-        position_seconds=10,
+    user_id, anime_id = uuid.uuid4(), uuid.uuid4()
+    first = await watch_use_case.update_progress(
+        _DummySession(), user_id, anime_id, episode=1, position_seconds=10
     )
+    second = await watch_use_case.update_progress(
+        _DummySession(), user_id, anime_id, episode=1, position_seconds=20
+    )
+    await buffer.stop()
+
+    assert second.id == first.id
+    assert lookups["count"] == 1
+    assert len(flushed) == 1
+    (row,) = flushed[0]
+    assert row["position_seconds"] == 20 and row["id"] == first.id
+
+
+@pytest.mark.anyio
+async def test_workers_run_jobs_concurrently() -> None:
+    runner = JobRunner(workers=3)
+    active = {"current": 0, "peak": 0}
+
+    async def handler() -> None:
+        active["current"] += 1
+        active["peak"] = max(active["peak"], active["current"])
+        await asyncio.sleep(0.01)
+        active["current"] -= 1
+
+    for index in range(6):
+        await runner.enqueue(Job(key=f"job-{index}", handler=handler, backoff_seconds=0))
     await asyncio.wait_for(runner.drain(), timeout=1)
     await runner.stop()
 
-    assert called["count"] == 1
+    assert active["peak"] == 3
+    assert runner.stats()["run_seconds"]["count"] == 6
+
+
+@pytest.mark.anyio
+async def test_high_priority_jobs_run_first() -> None:
+    runner = JobRunner()
+    order: list[str] = []
+    gate = asyncio.Event()
+
+    async def blocker() -> None:
+        await gate.wait()
+
+    def record(name: str):  # type: ignore[no-untyped-def]
+        async def handler() -> None:
+            order.append(name)
+
+        return handler
+
+    await runner.enqueue(Job(key="blocker", handler=blocker))
+    await asyncio.sleep(0)
+    await runner.enqueue(Job(key="low", handler=record("low"), priority=JobPriority.LOW))
+    await runner.enqueue(Job(key="normal", handler=record("normal")))
+    await runner.enqueue(Job(key="high", handler=record("high"), priority=JobPriority.HIGH))
+    assert runner.stats()["queued_by_priority"] == {"high": 1, "normal": 1, "low": 1}
+
+    gate.set()
+    await asyncio.wait_for(runner.drain(), timeout=1)
+    await runner.stop()
+
+    assert order == ["high", "normal", "low"]
+
+
+@pytest.mark.anyio
+async def test_coalesced_jobs_keep_only_the_latest_write() -> None:
+    runner = JobRunner(workers=2)
+    writes: list[int] = []
+    gate = asyncio.Event()
+
+    def write(value: int):  # type: ignore[no-untyped-def]
+        async def handler() -> None:
+            if value == 0:
+                await gate.wait()
+            writes.append(value)
+
+        return handler
+
+    for value in range(10):
+        await runner.enqueue(
+            Job(key=f"progress-{value}", handler=write(value), coalesce_key="user:anime")
+        )
+        await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.wait_for(runner.drain(), timeout=1)
+    await runner.stop()
+
+    # The first write was already running; the other nine collapse into one.
+    assert writes == [0, 9]
+    assert runner.stats()["coalesced"] == 8
+    assert all(
+        runner.status_for(f"progress-{value}") == JobStatus.SUCCEEDED
+        for value in range(10)
+    )
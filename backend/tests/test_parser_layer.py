@@ -1,10 +1,25 @@
 from datetime import datetime
 
+import pytest
+
 from app.parser import anime as anime_parser
+from app.parser import backend as parser_backend
 from app.parser import episodes as episodes_parser
 from app.parser import schedule as schedule_parser
 from app.parser import search as search_parser
 
+AVAILABLE_BACKENDS = [
+    name
+    for name in parser_backend.PARSER_BACKENDS
+    if name != parser_backend.LXML_BACKEND or parser_backend.lxml_available()
+]
+
+
+@pytest.fixture(autouse=True, params=AVAILABLE_BACKENDS)
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setattr(parser_backend, "parser_backend", request.param)
+    return request.param
+
 
 def test_parse_anime_page_returns_expected_fields() -> None:
     html = """
@@ -116,3 +131,91 @@ def test_parse_search_suggestions_skips_invalid_links() -> None:
     assert parsed[0]["id"] == "watch/show-1"
     assert parsed[0]["name"] == "Show 1"
     assert parsed[0]["poster"] == "poster.jpg"
+
+
+def test_backends_produce_identical_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    anime_html = """<!DOCTYPE html>
+    <html><head><title>Fallback Title</title></head><body>
+    <script type="application/json" id="syncData">{"anilist_id": 21, "mal_id": "21"}</script>
+    <h2 class="film-name dynamic-name" data-jname="Wan Pisu">One Piece &amp; Friends</h2>
+    <img class="film-poster-img" src="https://img/op.jpg">
+    <div class="film-description"><div class="text">  Pirates &mdash; adventure.<br>More  </div></div>
+    </body></html>
+    """
+    episodes_html = """
+    <div class="detail-infor-content"><div class="ss-list">
+      <a href="/watch/op-100?ep=1" data-number="1" class="ssl-item ep-item" title="Romance Dawn"></a>
+      <a href="/watch/op-100?ep=2" data-number="x" class="ssl-item ssl-item-filler" title="Filler"></a>
+    </div></div>
+    """
+    servers_html = """
+    <div class="server-notice"><strong>You are watching Episode 12</strong></div>
+    <div class="ps_-block servers-dub"><div class="ps__-list">
+      <div class="server-item" data-server-id="4"> HD-2 </div>
+    </div></div>
+    """
+    schedule_html = """
+    <li><a href="/op-100" class="tsl-link"><div class="time">09:15</div>
+      <div class="film-detail"><h3 class="film-name dynamic-name" data-jname="OP">One Piece</h3>
+      <div class="fd-play"><button type="button">Episode 1100</button></div></div></a></li>
+    <li><a href="/broken"></a></li>
+    """
+    search_html = """
+    <a class="nav-item" href="/op-100?ref=search">
+      <img class="film-poster-img" data-src="op.jpg">
+      <div class="srp-detail"><h3 class="film-name" data-jname="OP">One Piece</h3>
+      <div class="film-infor"><span>Oct 20, 1999</span><i class="dot"></i>TV<i class="dot"></i>24m</div></div>
+    </a>
+    <a class="nav-item nav-bottom" href="javascript:;">View all</a>
+    """
+    now = datetime.fromisoformat("2024-01-02T08:00:00")
+
+    def run_all() -> list:
+        return [
+            anime_parser.parse_anime_page(anime_html, "op-100"),
+            anime_parser.parse_episodes_html(episodes_html),
+            episodes_parser.parse_server_html(servers_html, "sub", preferred="hd-2"),
+            episodes_parser.build_sources_payload("https://s/1", anime_html, referer="r"),
+            schedule_parser.parse_schedule_html(schedule_html, "2024-01-02", now),
+            search_parser.parse_search_suggestions(search_html),
+        ]
+
+    outputs = []
+    for name in AVAILABLE_BACKENDS:
+        monkeypatch.setattr(parser_backend, "parser_backend", name)
+        outputs.append(run_all())
+
+    assert all(output == outputs[0] for output in outputs[1:])
+
+
+def test_parse_sync_ids_scans_without_dom() -> None:
+    from app.parser.common import extract_sync_data_text, parse_sync_ids
+
+    html = """
+    <div data-id="syncData">{"anilist_id": 1}</div>
+    <script type="application/json" id='syncData'>{"anilist_id": 5, "mal_id": 6}</script>
+    """
+    assert extract_sync_data_text(html) == '{"anilist_id": 5, "mal_id": 6}'
+    assert parse_sync_ids(html) == {"anilistID": 5, "malID": 6}
+    assert parse_sync_ids("<div>no sync data</div>") == {"anilistID": None, "malID": None}
+    assert parse_sync_ids('<div id="syncData">{not json</div>') == {
+        "anilistID": None,
+        "malID": None,
+    }
+
+
+def test_parsers_accept_a_pre_parsed_document() -> None:
+    html = """
+    <script id="syncData">{"anilist_id": 3, "mal_id": 4}</script>
+    <span class="film-name dynamic-name">Shared</span>
+    <div class="detail-infor-content"><div class="ss-list">
+      <a href="/watch/shared?ep=9" data-number="9" title="Ep 9"></a>
+    </div></div>
+    """
+    document = parser_backend.make_soup(html)
+
+    assert anime_parser.parse_anime_page(document, "shared") == anime_parser.parse_anime_page(
+        html, "shared"
+    )
+    assert anime_parser.parse_episodes_html(document)["totalEpisodes"] == 1
+    assert episodes_parser.build_sources_payload(None, document, referer="r")["malID"] == 4
@@ -11,9 +11,11 @@ os.environ.setdefault(
 )
 
 from app.config import settings  # noqa: E402
+from app.security import token_inspection  # noqa: E402
 from app.security.token_inspection import (  # noqa: E402
     ExpiredTokenError,
     InvalidTokenError,
+    VerifiedTokenCache,
     validate_access_token,
     validate_refresh_token,
 )
@@ -63,3 +65,87 @@ def test_validate_refresh_token_hashes_value():
 def test_validate_refresh_token_empty():
     with pytest.raises(InvalidTokenError):
         validate_refresh_token("")
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def counted_decodes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    decodes: list[str] = []
+    decode = token_inspection._decode
+
+    def counting_decode(token: str) -> dict:
+        decodes.append(token)
+        return decode(token)
+
+    monkeypatch.setattr(token_inspection, "_decode", counting_decode)
+    return decodes
+
+
+def test_verified_tokens_are_decoded_once(
+    monkeypatch: pytest.MonkeyPatch, counted_decodes: list[str]
+) -> None:
+    monkeypatch.setattr(token_inspection, "verified_token_cache", VerifiedTokenCache(max_entries=10))
+    exp = datetime.now(timezone.utc) + timedelta(minutes=5)
+    token = _make_access_token({"sub": "user-id", "exp": exp})
+
+    first = validate_access_token(token)
+    first["sub"] = "tampered"
+    second = validate_access_token(token)
+
+    assert second["sub"] == "user-id"
+    assert counted_decodes == [token]
+    stats = token_inspection.verified_token_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_cached_token_expires_with_the_same_error(counted_decodes: list[str]) -> None:
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    exp = now + timedelta(minutes=5)
+    token = _make_access_token({"sub": "user-id", "exp": exp})
+    clock = FakeClock(now.timestamp())
+    cache = VerifiedTokenCache(max_entries=10, clock=clock)
+
+    cache.decode(token)
+    clock.now = exp.timestamp() - 1
+    assert cache.decode(token)["sub"] == "user-id"
+    clock.now = exp.timestamp()
+
+    with pytest.raises(ExpiredTokenError) as exc:
+        cache.decode(token)
+
+    assert isinstance(exc.value.__cause__, jwt.ExpiredSignatureError)
+    assert counted_decodes == [token]
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalid_tokens_are_not_cached(counted_decodes: list[str]) -> None:
+    cache = VerifiedTokenCache(max_entries=10)
+
+    for _ in range(2):
+        with pytest.raises(InvalidTokenError):
+            cache.decode("not-a-token")
+
+    assert counted_decodes == ["not-a-token", "not-a-token"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_token_is_evicted(counted_decodes: list[str]) -> None:
+    cache = VerifiedTokenCache(max_entries=2)
+    tokens = [_make_access_token({"sub": f"user-{index}"}) for index in range(3)]
+
+    cache.decode(tokens[0])
+    cache.decode(tokens[1])
+    cache.decode(tokens[0])
+    cache.decode(tokens[2])
+    cache.decode(tokens[0])
+    cache.decode(tokens[1])
+
+    assert counted_decodes == [tokens[0], tokens[1], tokens[2], tokens[1]]
+    assert cache.stats()["evictions"] == 2